@@ -0,0 +1,205 @@
+"""두 페이지의 rerun 지연 시간/최대 메모리 측정 (streamlit.testing AppTest, 브라우저 없이).
+
+    python benchmarks/bench_apptest.py [--quick] [--update-baseline] [--tolerance 0.3]
+
+크기를 바꿔 가며 측정합니다.
+- periods: 메인 페이지 교시 수 7 → 30 (집중 모드를 끄고 모든 교시 위젯을 그림)
+- tasks:   주말 페이지 오전 일과 수 1 → 500 (저장소에 미리 넣어 둠)
+- dates:   메인 페이지에서 날짜를 1 → 365 개 차례로 바꿈
+
+각 경우의 rerun 지연 시간(중앙값/p95, ms)과 tracemalloc 최대 메모리(MB)를
+benchmarks/baseline_apptest.json 과 비교해 tolerance 이상 느려지거나 커지면
+REGRESSION 으로 표시하고 종료 코드 1 을 돌려줍니다. --update-baseline 이면
+이번 결과를 기준값으로 저장합니다. st_canvas 는 빈 결과를 돌려주는 가짜로
+바꿔 컴포넌트 없이 돌아가게 합니다.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from collections import namedtuple
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import streamlit_drawable_canvas  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from timetable.schedule import LUNCH_NAME  # noqa: E402
+from timetable.storage import open_storage  # noqa: E402
+
+BASELINE = os.path.join(ROOT, "benchmarks", "baseline_apptest.json")
+MAIN_PAGE = os.path.join(ROOT, "streamlit_app.py")
+WEEKEND_PAGE = os.path.join(ROOT, "pages", "weekend_schedule.py")
+DAY = date(2025, 3, 3)
+SATURDAY = date(2025, 3, 8)
+RERUNS = 5
+
+SIZES = {"periods": [7, 15, 30], "tasks": [1, 50, 500], "dates": [1, 30, 365]}
+QUICK_SIZES = {"periods": [7, 15], "tasks": [1, 50], "dates": [1, 30]}
+
+CanvasResult = namedtuple("CanvasResult", ["image_data", "json_data"])
+
+
+def _stub_canvas(*args, **kwargs):
+    return CanvasResult(None, None)
+
+
+def _periods(n):
+    periods = []
+    start = 8 * 60
+    for i in range(n):
+        name = LUNCH_NAME if i == 4 else f"{i + 1}교시"
+        begin, end = start + i * 30, start + i * 30 + 25
+        periods.append({"name": name, "time": f"{begin // 60:02d}:{begin % 60:02d} ~ {end // 60:02d}:{end % 60:02d}"})
+    return periods
+
+
+def _date_input(at):
+    return next(w for w in at.date_input if w.label == "날짜를 선택하세요")
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def _check(at):
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+
+def bench_periods(n):
+    at = AppTest.from_file(MAIN_PAGE, default_timeout=120)
+    at.session_state["periods"] = _periods(n)
+    at.session_state["focus_mode"] = False
+    at.run()
+    _date_input(at).set_value(DAY).run()
+    _check(at)
+    key = f"move_done_0_{DAY}"
+    times = []
+    for _ in range(RERUNS):
+        checkbox = at.checkbox(key=key)
+        times.append(_timed(lambda: checkbox.set_value(not checkbox.value).run()))
+        _check(at)
+    return times
+
+
+def bench_tasks(n, storage):
+    student = f"bench_tasks_{n}"
+    items = [
+        {"id": str(uuid.uuid4()), "title": f"일과 {i}", "place": "집", "time": f"{6 + i % 6:02d}:{(i % 4) * 15:02d}", "done": False}
+        for i in range(n)
+    ]
+    storage.save_entries(student, SATURDAY, {"weekend_m": items})
+    at = AppTest.from_file(WEEKEND_PAGE, default_timeout=600)
+    at.session_state["student"] = student
+    at.run()
+    _date_input(at).set_value(SATURDAY).run()
+    _check(at)
+    times = []
+    suffix = f"m_{items[0]['id']}_{SATURDAY.isoformat()}"
+    for i in range(RERUNS):
+        # 행 폼에 입력하고 저장 버튼으로 제출
+        at.text_input(key=f"title_{suffix}").set_value(f"일과 0-{i}")
+        times.append(_timed(lambda: at.button(key=f"save_{suffix}").click().run()))
+        _check(at)
+    return times
+
+
+def bench_dates(n):
+    at = AppTest.from_file(MAIN_PAGE, default_timeout=120)
+    at.run()
+    times = []
+    for i in range(n):
+        times.append(_timed(lambda: _date_input(at).set_value(DAY + timedelta(days=i)).run()))
+        _check(at)
+    return times
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    times = fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    times.sort()
+    return {
+        "median_ms": round(times[len(times) // 2], 2),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 2),
+        "peak_mb": round(peak / 2**20, 2),
+    }
+
+
+def compare(name, result, baseline, tolerance):
+    base = baseline.get(name)
+    if not base:
+        return "new", False
+    regressed = [
+        f"{metric} {base[metric]} → {result[metric]}"
+        for metric in ("median_ms", "peak_mb")
+        if result[metric] > base[metric] * (1 + tolerance)
+    ]
+    return ("REGRESSION: " + ", ".join(regressed), True) if regressed else ("ok", False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="작은 크기만 측정")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="허용 증가율 (기본 0.3 = 30%%)")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    streamlit_drawable_canvas.st_canvas = _stub_canvas
+
+    tmp = tempfile.mkdtemp(prefix="bench_apptest_")
+    os.environ["TIMETABLE_STORAGE"] = f"sqlite:///{os.path.join(tmp, 'bench.db')}"
+    os.environ["TIMETABLE_SIGNATURE_DIR"] = os.path.join(tmp, "signatures")
+    # 변경 기록/검색 색인/추이 파일도 임시 디렉터리에 (저장소 루트의 실제 파일에 쓰지 않음)
+    os.environ["TIMETABLE_JOURNAL"] = os.path.join(tmp, "journal.db")
+    os.environ["TIMETABLE_SEARCH"] = os.path.join(tmp, "search.db")
+    os.environ["TIMETABLE_METRICS"] = os.path.join(tmp, "metrics.db")
+    os.environ.pop("TIMETABLE_PROFILE", None)
+    os.chdir(ROOT)
+    storage = open_storage()
+
+    sizes = QUICK_SIZES if args.quick else SIZES
+    cases = (
+        [(f"periods={n}", bench_periods, (n,)) for n in sizes["periods"]]
+        + [(f"tasks={n}", bench_tasks, (n, storage)) for n in sizes["tasks"]]
+        + [(f"dates={n}", bench_dates, (n,)) for n in sizes["dates"]]
+    )
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    results = {}
+    failed = False
+    print(f"{'case':<14}{'median ms':>11}{'p95 ms':>10}{'peak MB':>10}  status")
+    for name, fn, fn_args in cases:
+        result = measure(fn, *fn_args)
+        results[name] = result
+        status, regressed = compare(name, result, baseline, args.tolerance)
+        failed = failed or regressed
+        print(f"{name:<14}{result['median_ms']:>11.2f}{result['p95_ms']:>10.2f}{result['peak_mb']:>10.2f}  {status}")
+
+    if args.update_baseline:
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **results}, f, ensure_ascii=False, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"기준값 저장: {os.path.relpath(BASELINE, ROOT)}")
+    elif failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
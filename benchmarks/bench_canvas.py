@@ -0,0 +1,106 @@
+"""서명 획 저장/표시 경로의 비용 측정 (200x120 캔버스).
+
+    python benchmarks/bench_canvas.py
+
+먼저 잠금 해제된 교시 하나가 rerun 마다 내는 비용을, 매번 획을 다시 만들어 저장하던
+방식(legacy)과 획 해시가 바뀐 경우에만 저장하는 방식(pipeline)으로 빈 캔버스,
+서명이 있는 캔버스, 직전과 같은 캔버스 세 경우에 비교합니다.
+
+이어서 update_streamlit=False 로 보낸 json_data 의 획을 서명으로 저장하는 제출 한 번
+(strokes_from_json -> put_strokes), 화면에 보여 줄 data URI(처음 / LRU 캐시),
+SVG 문자열, 보고서용 비트맵(rasterize_strokes) 비용과 저장 크기를 획 길이별로
+출력합니다.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable.canvas import (  # noqa: E402
+    changed_strokes,
+    encode_strokes,
+    canvas_fingerprint,
+    rasterize_strokes,
+    strokes_from_json,
+    strokes_svg,
+)
+from timetable.signatures import SignatureStore  # noqa: E402
+
+W, H = 200, 120
+NUMBER = 500
+
+
+def make_fabric_json(points_per_stroke=60):
+    # 두 획을 freedraw 처럼 Q 명령으로 이어 붙인 fabric.js 경로
+    def path(x0, y0, x1, y1):
+        cmds = [["M", x0 + 0.123, y0 + 0.456]]
+        for i in range(1, points_per_stroke):
+            t = i / points_per_stroke
+            cmds.append(["Q", x0 + (x1 - x0) * t, y0 + (y1 - y0) * t + 0.5, x0 + (x1 - x0) * t + 0.25, y0 + (y1 - y0) * t])
+        cmds.append(["L", x1, y1])
+        return {"type": "path", "stroke": "#222", "strokeWidth": 2, "path": cmds}
+
+    return {"version": "4.4.0", "objects": [path(70, 40, 120, 90), path(50, 60, 150, 60)]}
+
+
+def _us(fn):
+    return timeit.timeit(fn, number=NUMBER) / NUMBER * 1e6
+
+
+def legacy(store, json_data):
+    # 예전 방식: rerun 마다 획을 다시 만들고 압축/해시/저장
+    strokes = strokes_from_json(json_data)
+    return store.put_strokes(strokes) if strokes is not None else None
+
+
+def pipeline(store, json_data, last_digest=None):
+    digest, changed, strokes = changed_strokes(json_data, last_digest)
+    if changed and strokes is not None:
+        store.put_strokes(strokes)
+    return digest
+
+
+def bench_reruns(store):
+    print(f"{W}x{H} canvas, {NUMBER} reruns each (us per rerun)")
+    print(f"{'case':<18}{'legacy':>10}{'pipeline':>10}")
+    for name, data in (("blank", {"version": "4.4.0", "objects": []}), ("signed", make_fabric_json())):
+        t_legacy = _us(lambda: legacy(store, data))
+        print(f"{name:<18}{t_legacy:>10.1f}{_us(lambda: pipeline(store, data)):>10.1f}")
+        last = canvas_fingerprint(data)
+        print(f"{name + ' (unchanged)':<18}{t_legacy:>10.1f}{_us(lambda: pipeline(store, data, last)):>10.1f}")
+
+
+def main():
+    tmp = tempfile.mkdtemp()
+    try:
+        store = SignatureStore(os.path.join(tmp, "signatures"))
+        bench_reruns(store)
+        print(f"\nstrokes, {NUMBER} runs each (us per run)")
+        print(f"{'points/stroke':<14}{'submit':>10}{'uri':>10}{'uri(hit)':>10}{'svg':>10}{'raster':>10}{'bytes':>8}")
+        for points in (20, 60, 200):
+            fabric = make_fabric_json(points)
+            strokes = strokes_from_json(fabric)
+            digest = store.put_strokes(strokes)
+
+            def uri_cold():
+                store._uri_cache.clear()
+                store.data_uri(digest)
+
+            print(
+                f"{points:<14}"
+                f"{_us(lambda: store.put_strokes(strokes_from_json(fabric))):>10.1f}"
+                f"{_us(uri_cold):>10.1f}"
+                f"{_us(lambda: store.data_uri(digest)):>10.1f}"
+                f"{_us(lambda: strokes_svg(strokes)):>10.1f}"
+                f"{_us(lambda: rasterize_strokes(strokes)):>10.1f}"
+                f"{len(encode_strokes(strokes)):>8}"
+            )
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
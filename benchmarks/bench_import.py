@@ -0,0 +1,66 @@
+"""일괄 가져오기 처리량 측정.
+
+    python benchmarks/bench_import.py [행 수]
+
+임시 SQLite 저장소에 시간표 CSV/Parquet 파일(기본 100,000행)을 가져오며
+초당 처리 행 수를 출력합니다.
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable import bulk_io  # noqa: E402
+from timetable.storage import SQLiteStorage  # noqa: E402
+
+SUBJECTS = ["국어", "영어", "수학", "사회", "과학", "체육"]
+
+
+def make_csv(n_rows):
+    buf = io.StringIO()
+    buf.write(",".join(bulk_io.TIMETABLE_COLUMNS) + "\n")
+    start = date(2025, 3, 2)
+    for i in range(n_rows):
+        period = i % 6
+        day = start + timedelta(days=(i // 6) % 180)
+        student = f"학생{i // (6 * 180):04d}"
+        buf.write(
+            f"{student},2-{i % 10},{day},{period},{period + 1}교시,{SUBJECTS[period]},2-5,"
+            f"\"교과서, 필기도구\",{i % 2},{i % 3 == 0},0,0\n"
+        )
+    return buf.getvalue().encode()
+
+
+def run(label, data, fmt):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, "bench.db"))
+        started = time.perf_counter()
+        result = bulk_io.import_timetable(storage, io.BytesIO(data), fmt)
+        elapsed = time.perf_counter() - started
+        storage.close()
+    print(f"{label:<10}{result['rows']:>10}{elapsed:>10.2f}{result['rows'] / elapsed:>14,.0f}")
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    csv_data = make_csv(n_rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = SQLiteStorage(os.path.join(tmp, "src.db"))
+        bulk_io.import_timetable(src, io.BytesIO(csv_data), "csv")
+        out = io.BytesIO()
+        bulk_io.export_timetable(src, out, "parquet")
+        parquet_data = out.getvalue()
+        src.close()
+
+    print(f"{'format':<10}{'rows':>10}{'sec':>10}{'rows/sec':>14}")
+    run("csv", csv_data, "csv")
+    run("parquet", parquet_data, "parquet")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""변경 기록(journal) 쓰기 처리량과 하루 복원 시간 측정.
+
+    python benchmarks/bench_journal.py [--writers 8] [--events 200] [--history 100,1000,10000]
+
+1) 저장하는 스레드 writers 개가 각각 events 번씩 교시 기록을 남길 때의 처리량을,
+   이벤트마다 커밋(fsync)하는 경우와 그룹 커밋으로 비교합니다.
+2) 한 학생의 하루에 이벤트가 history 개 쌓였을 때 restore_day 시간을 잽니다.
+   스냅샷 덕분에 기록 길이와 상관없이 비슷해야 합니다.
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable.journal import PERIOD, Journal  # noqa: E402
+
+DATE = "2025-03-03"
+
+
+def _record(i):
+    return {"done": i % 2 == 0, "ready": True, "sign_locked": i % 3 != 0, "subject": "수학"}
+
+
+def bench_per_event(path, writers, events):
+    """비교용: 스레드마다 이벤트 하나씩 자기 트랜잭션으로 커밋"""
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=FULL")
+    conn.executescript(Journal.SCHEMA)
+    lock = threading.Lock()
+
+    def work(w):
+        for i in range(events):
+            with lock:
+                conn.execute(
+                    "INSERT INTO events (ts, actor, student, date, kind, key, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (time.time(), "bench", f"학생{w:02d}", DATE, PERIOD, str(i % 7), str(_record(i))),
+                )
+
+    elapsed = _run_threads(work, writers)
+    conn.close()
+    return elapsed
+
+
+def bench_group_commit(path, writers, events):
+    journal = Journal(path)
+
+    def work(w):
+        for i in range(events):
+            journal.append("bench", f"학생{w:02d}", DATE, PERIOD, {i % 7: _record(i)})
+
+    elapsed = _run_threads(work, writers)
+    journal.close()
+    return elapsed
+
+
+def _run_threads(work, writers):
+    threads = [threading.Thread(target=work, args=(w,)) for w in range(writers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def bench_restore(path, history, repeat=20):
+    journal = Journal(path)
+    for start in range(0, history, 500):
+        for i in range(start, min(start + 500, history)):
+            journal.append("bench", "학생00", DATE, PERIOD, {i % 7: _record(i)}, wait=False)
+        journal.flush()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        records, _ = journal.restore_day("학생00", DATE)
+    elapsed = (time.perf_counter() - started) / repeat
+    journal.close()
+    assert records[(history - 1) % 7] == _record(history - 1)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--history", default="100,1000,10000")
+    args = parser.parse_args()
+
+    total = args.writers * args.events
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"쓰기: 스레드 {args.writers}개 x 이벤트 {args.events}개")
+        for label, bench in (("이벤트마다 커밋", bench_per_event), ("그룹 커밋", bench_group_commit)):
+            elapsed = bench(os.path.join(tmp, f"{bench.__name__}.db"), args.writers, args.events)
+            print(f"  {label:<12}{elapsed:>8.2f}s{total / elapsed:>10.0f} events/s")
+
+        print("하루 복원 (restore_day)")
+        for history in (int(h) for h in args.history.split(",")):
+            elapsed = bench_restore(os.path.join(tmp, f"restore_{history}.db"), history)
+            print(f"  이벤트 {history:>7}개{elapsed * 1000:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
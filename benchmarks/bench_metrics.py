@@ -0,0 +1,109 @@
+"""학생별 추이(metrics) 갱신/조회 비용 측정.
+
+    python benchmarks/bench_metrics.py [--students 200] [--days 365] [--class-size 25]
+
+학생 students 명이 days 일 동안 날마다 6교시 + 점심 기록을 저장했다고 보고 임시
+저장소에 넣은 뒤 하루 행을 처음부터 만들고(rebuild), 교시 하나를 저장할 때마다 드는
+갱신 비용(오늘 / 한참 전 날짜)과 대시보드 한 반(class-size 명)의 추이 표 + 그래프
+계산 시간을 잽니다. 기록 기간이 길어져도 저장/조회 시간이 그대로인지 보는 용도입니다.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable.metrics import WINDOWS, MetricsStorage, MetricsStore, rolling_series, window_rates  # noqa: E402
+from timetable.schedule import LUNCH_NAME  # noqa: E402
+from timetable.storage import SQLiteStorage  # noqa: E402
+
+START = date(2024, 3, 4)
+LESSONS = 6
+
+
+def _record(rng, period):
+    if period == LESSONS:
+        return {"name": LUNCH_NAME, "eat": rng.random() < 0.9, "brush": rng.random() < 0.6}
+    return {
+        "name": f"{period + 1}교시",
+        "move_done": rng.random() < 0.95,
+        "ready": rng.random() < 0.9,
+        "done": rng.random() < 0.97,
+    }
+
+
+def seed(storage, n_students, n_days, rng):
+    rows = 0
+    for d in range(n_days):
+        day = (START + timedelta(days=d)).isoformat()
+        batch = [
+            (f"학생{s:04d}", day, period, _record(rng, period))
+            for s in range(n_students)
+            for period in range(LESSONS + 1)
+        ]
+        storage.save_period_rows(batch)
+        rows += len(batch)
+    return rows
+
+
+def _timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    return statistics.median(times), max(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--class-size", type=int, default=25)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, "bench.db"))
+        started = time.perf_counter()
+        rows = seed(storage, args.students, args.days, rng)
+        print(f"교시 기록 {rows}행 저장 {time.perf_counter() - started:.1f}s")
+
+        metrics = MetricsStore(os.path.join(tmp, "metrics.db"))
+        started = time.perf_counter()
+        metrics.rebuild(storage)
+        print(f"하루 행 만들기 {time.perf_counter() - started:.1f}s ({args.students * args.days}행)")
+
+        wrapped = MetricsStorage(storage, metrics)
+        last = START + timedelta(days=args.days - 1)
+        for label, day in (("오늘", last), ("첫날", START)):
+            def save(day=day):
+                record = _record(rng, 0)
+                record["done"] = not record["done"]
+                wrapped.save_periods("학생0000", day.isoformat(), {0: record})
+            med, worst = _timed(save, args.repeat)
+            print(f"교시 저장 + 갱신 ({label}): 중앙값 {med:.2f}ms, 최대 {worst:.2f}ms")
+
+        students = [f"학생{s:04d}" for s in range(args.class_size)]
+
+        def view():
+            days = metrics.load_days(students, last - timedelta(days=89), last)
+            for student in students:
+                metrics.current_streak(student, last)
+                for window in WINDOWS:
+                    window_rates(days[student], last, window)
+            rolling_series(days[students[0]], last - timedelta(days=89), last)
+        med, worst = _timed(view, args.repeat)
+        print(f"한 반 {args.class_size}명 추이 표 + 그래프 1개: 중앙값 {med:.2f}ms, 최대 {worst:.2f}ms")
+        metrics.close()
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
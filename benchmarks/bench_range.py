@@ -0,0 +1,98 @@
+"""주간/월간 보기 지연 시간 측정.
+
+    python benchmarks/bench_range.py [학생 수] [예산(ms)]
+
+임시 SQLite 저장소에 한 반(기본 30명)의 한 달치 교시 기록을 넣고, 반 월간
+완료율 달력(기간 질의 1회 + 집계 + HTML)과 한 학생의 주간 표를 만드는 시간을
+잽니다. 가장 느린 반복이 예산(기본 150ms)을 넘으면 종료 코드 1 을 돌려줍니다.
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable import range_views  # noqa: E402
+from timetable.render import month_heatmap_html, week_grid_html  # noqa: E402
+from timetable.schedule import LUNCH_NAME  # noqa: E402
+from timetable.storage import SQLiteStorage  # noqa: E402
+
+PERIODS = [{"name": name, "time": ""} for name in ["1교시", "2교시", "3교시", "4교시", LUNCH_NAME, "5교시", "6교시"]]
+SUBJECTS = ["국어", "영어", "수학", "사회", "과학", "체육"]
+YEAR, MONTH = 2025, 3
+REPEATS = 20
+
+
+def seed(storage, n_students):
+    first, last = range_views.month_bounds(YEAR, MONTH)
+    rows = []
+    day = first
+    while day <= last:
+        for s in range(n_students):
+            for idx, period in enumerate(PERIODS):
+                rows.append((f"학생{s:02d}", day.isoformat(), idx, {
+                    "name": period["name"],
+                    "subject": SUBJECTS[idx % len(SUBJECTS)],
+                    "done": (s + idx + day.day) % 3 != 0,
+                }))
+        day += timedelta(days=1)
+    storage.save_period_rows(rows)
+    for s in range(n_students):
+        storage.save_student(f"학생{s:02d}", "1반")
+    return len(rows)
+
+
+def month_view(storage):
+    # 렌더 캐시를 비워 매번 HTML 까지 새로 만듦
+    month_heatmap_html.cache_clear()
+    first, last = range_views.month_bounds(YEAR, MONTH)
+    rows = storage.load_period_range(first, last, class_name="1반")
+    completion = range_views.daily_completion(rows, students=storage.list_students("1반"))
+    return month_heatmap_html(range_views.month_heatmap_weeks(YEAR, MONTH, completion))
+
+
+def week_view(storage):
+    week_grid_html.cache_clear()
+    week = range_views.week_dates(date(YEAR, MONTH, 12))
+    rows = storage.load_period_range(week[0], week[-1], student="학생00")
+    return week_grid_html(
+        tuple(range_views.day_label(d) for d in week),
+        range_views.period_week_grid(rows, PERIODS, week),
+    )
+
+
+def measure(fn, storage):
+    times = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        fn(storage)
+        times.append((time.perf_counter() - started) * 1000)
+    times.sort()
+    return times[len(times) // 2], times[-1]
+
+
+def main():
+    n_students = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 150.0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, "bench.db"))
+        n_rows = seed(storage, n_students)
+        results = [("month", *measure(month_view, storage)), ("week", *measure(week_view, storage))]
+        storage.close()
+
+    print(f"{n_students}명, {n_rows}행, 예산 {budget_ms:.0f}ms")
+    print(f"{'view':<8}{'median ms':>12}{'max ms':>10}")
+    over = False
+    for label, median, worst in results:
+        print(f"{label:<8}{median:>12.2f}{worst:>10.2f}")
+        over = over or worst > budget_ms
+    if over:
+        print("예산 초과")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""보고서 일괄 생성 처리량 (보고서/초) 측정.
+
+    python benchmarks/bench_reports.py [--students 30] [--days 5] [--workers 0,4] [--formats pdf,png]
+
+임시 저장소에 한 반의 며칠치 교시 기록(교시마다 획 서명), 주말 일과, 코멘트를
+넣고, 하루 보고서를 zip 으로 만드는 데 걸린 시간을 작업 프로세스 수별로 잽니다.
+workers=0 은 프로세스 풀 없이 한 프로세스에서 차례로 그리는 경우입니다.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable import reports  # noqa: E402
+from timetable.canvas import strokes_from_json  # noqa: E402
+from timetable.schedule import LUNCH_NAME  # noqa: E402
+from timetable.signatures import SignatureStore  # noqa: E402
+from timetable.storage import SQLiteStorage  # noqa: E402
+
+PERIODS = ["1교시", "2교시", "3교시", "4교시", LUNCH_NAME, "5교시", "6교시"]
+SUBJECTS = ["국어", "영어", "수학", "사회", "과학", "체육"]
+CLASS_NAME = "2-5"
+START = date(2025, 3, 3)
+
+
+def _signature(store, seed):
+    path = [["M", 20 + seed % 7, 40]] + [
+        ["Q", 20 + i * 4, 40 + (i * seed) % 30, 22 + i * 4, 42 + (i * seed) % 30] for i in range(40)
+    ]
+    return store.put_strokes(strokes_from_json({"objects": [{"type": "path", "stroke": "#222", "strokeWidth": 2, "path": path}]}))
+
+
+def seed(storage, store, n_students, n_days):
+    # 선생님 한 명이 하루에 같은 서명을 쓰는 경우가 많으므로 서명 수는 날짜 x 교시로 제한
+    signs = {(d, i): _signature(store, d * 10 + i) for d in range(n_days) for i in range(len(PERIODS))}
+    period_rows, entry_rows = [], []
+    for s in range(n_students):
+        student = f"학생{s:02d}"
+        storage.save_student(student, CLASS_NAME)
+        for d in range(n_days):
+            day = (START + timedelta(days=d)).isoformat()
+            for idx, name in enumerate(PERIODS):
+                if name == LUNCH_NAME:
+                    period_rows.append((student, day, idx, {"name": name, "eat": True, "brush": s % 2 == 0, "done": s % 2 == 0}))
+                    continue
+                period_rows.append((student, day, idx, {
+                    "name": name, "subject": SUBJECTS[idx % len(SUBJECTS)], "place": "2-5", "supplies": ["교과서", "필기도구"],
+                    "move_done": True, "ready": (s + idx) % 3 != 0, "done": (s + idx) % 3 != 0,
+                    "sign_locked": True, "sign": signs[(d, idx)],
+                }))
+            entry_rows.append((student, day, "comment", f"{student}의 {day} 하루. " * 8))
+    storage.save_period_rows(period_rows)
+    storage.save_entry_rows(entry_rows)
+    return len(period_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=30)
+    parser.add_argument("--days", type=int, default=5)
+    parser.add_argument("--workers", default=f"0,{os.cpu_count() or 1}")
+    parser.add_argument("--formats", default="pdf,png")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, "bench.db"))
+        store = SignatureStore(os.path.join(tmp, "signatures"))
+        rows = seed(storage, store, args.students, args.days)
+        date_to = START + timedelta(days=args.days - 1)
+
+        started = time.perf_counter()
+        data = reports.collect_reports(storage, reports.select_students(storage, CLASS_NAME), START, date_to)
+        collect_ms = (time.perf_counter() - started) * 1000
+        print(f"교시 기록 {rows}행, 보고서 {len(data)}개 (데이터 모으기 {collect_ms:.0f}ms), CPU {os.cpu_count()}개")
+        print(f"{'format':<8}{'workers':>8}{'reports':>9}{'sec':>8}{'reports/s':>11}{'zip MB':>9}")
+        for fmt in args.formats.split(","):
+            jobs = reports.report_jobs(data, fmt)
+            for workers in (int(w) for w in args.workers.split(",")):
+                out_path = os.path.join(tmp, f"reports_{fmt}_{workers}.zip")
+                started = time.perf_counter()
+                with open(out_path, "wb") as out:
+                    count = reports.export_reports(out, jobs, workers=workers, signature_root=store.root)
+                elapsed = time.perf_counter() - started
+                print(
+                    f"{fmt:<8}{workers:>8}{count:>9}{elapsed:>8.2f}{count / elapsed:>11.1f}"
+                    f"{os.path.getsize(out_path) / 2**20:>9.2f}"
+                )
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
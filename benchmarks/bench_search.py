@@ -0,0 +1,110 @@
+"""검색 색인 크기/질의 지연 시간 측정.
+
+    python benchmarks/bench_search.py [--students 600] [--days 500] [--weekend-every 5]
+
+학생 students 명이 days 일 동안 매일 코멘트를 쓰고 weekend-every 일마다 주말 일과를
+저장했다고 보고, 임시 저장소에 넣은 뒤 색인을 처음부터 만들고(rebuild) 여러 검색어의
+질의 시간(중앙값/최대, ms)을 잽니다. 저장할 때마다 색인을 고치는 비용과, 같은 문서를
+여러 번 고친 뒤 색인 크기도 함께 봅니다.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable.search import IndexedStorage, SearchIndex  # noqa: E402
+from timetable.storage import SQLiteStorage  # noqa: E402
+
+START = date(2022, 3, 2)
+WORDS = (
+    "오늘은 수업 시간에 친구들과 함께 재미있게 놀았다 급식이 맛있었다 쉬는 시간 숙제를 다 했다 "
+    "선생님께 칭찬을 받았다 조금 피곤했다 발표를 했다 미술 시간 그림을 그렸다 운동장에서 축구를 "
+    "도서관에서 책을 읽었다 내일은 더 열심히 하겠다 받아쓰기 수학 문제가 어려웠다 과학 실험"
+).split()
+RARE = ("체육관", "현장체험학습", "합창대회")
+PLACES = ("집", "학원", "도서관", "공원", "체육관", "수영장")
+TITLES = ("숙제", "독서", "피아노", "축구", "청소", "수영")
+QUERIES = ("체육관", "현장체험학습", "합창대회 발표", "수학 문제", "급식", "체", "없는낱말")
+
+
+def _comment(rng):
+    words = rng.choices(WORDS, k=rng.randint(6, 14))
+    if rng.random() < 0.01:
+        words.insert(rng.randrange(len(words)), rng.choice(RARE) + rng.choice(("에서", "이", "")))
+    return " ".join(words)
+
+
+def seed(storage, n_students, n_days, weekend_every, rng):
+    rows = 0
+    for d in range(n_days):
+        day = (START + timedelta(days=d)).isoformat()
+        batch = [(f"학생{s:04d}", day, "comment", _comment(rng)) for s in range(n_students)]
+        if d % weekend_every == 0:
+            batch += [
+                (f"학생{s:04d}", day, "weekend_m", [
+                    {"id": str(i), "title": rng.choice(TITLES), "place": rng.choice(PLACES), "time": 540 + i * 60, "done": False}
+                    for i in range(3)
+                ])
+                for s in range(n_students)
+            ]
+        storage.save_entry_rows(batch)
+        rows += len(batch)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=600)
+    parser.add_argument("--days", type=int, default=500)
+    parser.add_argument("--weekend-every", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        storage = SQLiteStorage(os.path.join(tmp, "bench.db"))
+        started = time.perf_counter()
+        rows = seed(storage, args.students, args.days, args.weekend_every, rng)
+        print(f"하루 항목 {rows}행 저장 {time.perf_counter() - started:.1f}s")
+
+        index = SearchIndex(os.path.join(tmp, "search.db"))
+        started = time.perf_counter()
+        index.rebuild(storage)
+        stats = index.stats()
+        print(
+            f"색인 만들기 {time.perf_counter() - started:.1f}s: 문서 {stats['docs']}개, 색인어 {stats['grams']}개, "
+            f"postings {stats['postings_bytes'] / 2**20:.1f}MB, 파일 {os.path.getsize(index.path) / 2**20:.1f}MB"
+        )
+
+        print(f"{'query':<16}{'hits':>6}{'median ms':>11}{'max ms':>9}")
+        for query in QUERIES:
+            times = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                hits = index.search(query)
+                times.append((time.perf_counter() - started) * 1000)
+            print(f"{query:<16}{len(hits):>6}{statistics.median(times):>11.2f}{max(times):>9.2f}")
+
+        # 저장할 때마다 색인 갱신: 코멘트 한 개 바꾸기
+        indexed = IndexedStorage(storage, index)
+        times = []
+        for i in range(50):
+            started = time.perf_counter()
+            indexed.save_entries("학생0000", START.isoformat(), {"comment": _comment(rng) + f" {i}"})
+            times.append((time.perf_counter() - started) * 1000)
+        print(f"코멘트 저장 + 색인 갱신: 중앙값 {statistics.median(times):.2f}ms, 최대 {max(times):.2f}ms")
+        # 같은 문서를 여러 번 고쳐도 색인이 커지지 않아야 함 (문서 번호를 그대로 씀)
+        after = index.stats()
+        print(f"50번 고친 뒤: 문서 {after['docs']}개, postings {after['postings_bytes'] / 2**20:.1f}MB")
+        index.close()
+        storage.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""페이지별 콜드 스타트 측정: 모듈 import 시간과 첫 렌더 지연 시간.
+
+    python benchmarks/bench_startup.py [--repeat 3] [--pages main,weekend,dashboard,search]
+
+페이지마다 새 파이썬 프로세스를 띄워, streamlit 자체를 불러온 뒤(서버에서는 이미
+불러와 있음) AppTest 로 페이지를 처음 한 번 그립니다. 그 사이에 불러온 모듈의
+import 시간은 -X importtime 출력에서 최상위 import 의 누적 시간을 더해 구하고,
+첫 렌더 시간과 함께 BUDGETS 와 비교합니다. 처음 그릴 때 불러오면 안 되는 무거운
+모듈(FORBIDDEN)이 sys.modules 에 있으면 시간과 상관없이 실패입니다.
+하나라도 넘으면 OVER BUDGET 으로 표시하고 종료 코드 1 을 돌려줍니다.
+같은 검사를 tests/test_startup_budget.py 가 pytest 로 돌립니다 (slow 표시).
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = {
+    "main": "streamlit_app.py",
+    "weekend": os.path.join("pages", "weekend_schedule.py"),
+    "dashboard": os.path.join("pages", "class_dashboard.py"),
+    "search": os.path.join("pages", "search.py"),
+}
+
+# 페이지 import 누적 시간(ms) / 첫 렌더(ms) 상한 (1 CPU 개발 VM 기준 측정값의 약 2배)
+BUDGETS = {
+    "main": {"import_ms": 150, "first_render_ms": 600},
+    "weekend": {"import_ms": 150, "first_render_ms": 500},
+    "dashboard": {"import_ms": 1000, "first_render_ms": 2000},
+    "search": {"import_ms": 150, "first_render_ms": 400},
+}
+
+# 첫 렌더에서 불러오면 안 되는 모듈 (서명 캔버스/보고서/일괄 내보내기를 쓸 때만 필요)
+# 대시보드는 st.dataframe 이 Arrow 로 직렬화하므로 pandas/pyarrow 를 씀
+FORBIDDEN = {
+    "main": ("pandas", "pyarrow", "numpy", "PIL.Image", "streamlit_drawable_canvas"),
+    "weekend": ("pandas", "pyarrow", "numpy", "PIL.Image", "streamlit_drawable_canvas"),
+    "dashboard": ("PIL.Image", "streamlit_drawable_canvas", "altair"),
+    "search": ("pandas", "pyarrow", "numpy", "PIL.Image", "streamlit_drawable_canvas"),
+}
+
+MARK = "--- bench_startup: page ---"
+
+# 메인 페이지는 수업 시간에는 지금 교시의 서명 캔버스를 그리므로, 재는 시각과 상관없이
+# 같은 화면이 되도록 지난 날짜(모든 교시가 읽기 전용 한 줄)로 처음 엽니다
+MAIN_DATE = "2025-03-03"
+
+# 자식 프로세스에서 실행하는 코드: 표시줄 뒤의 importtime 출력이 페이지 몫
+CHILD = f"""
+import datetime, json, logging, sys, time
+import streamlit
+from streamlit.testing.v1 import AppTest
+logging.disable(logging.CRITICAL)
+print({MARK!r}, file=sys.stderr, flush=True)
+started = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=60)
+at.session_state["selected_date"] = datetime.date.fromisoformat({MAIN_DATE!r})
+at.run()
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "first_render_ms": elapsed * 1000,
+    "exceptions": [e.message for e in at.exception],
+    "modules": sorted(sys.modules),
+}}))
+"""
+
+
+def import_ms(stderr):
+    """표시줄 뒤 -X importtime 출력에서 최상위 import 누적 시간(us) 합 -> ms"""
+    total = 0
+    seen = False
+    for line in stderr.splitlines():
+        if line == MARK:
+            seen = True
+            continue
+        if not seen or not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # 하위 import 는 이름 앞에 들여쓰기가 붙음
+        if not name[1:].startswith(" ") and cumulative.strip().isdigit():
+            total += int(cumulative)
+    return total / 1000
+
+
+def measure(page, env):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD, os.path.join(ROOT, PAGES[page])],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["import_ms"] = import_ms(proc.stderr)
+    return result
+
+
+def bench_env(tmp):
+    """모든 저장 파일을 tmp 아래에 두는 자식 프로세스 환경"""
+    env = dict(
+        os.environ,
+        TIMETABLE_STORAGE=f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+        TIMETABLE_JOURNAL=os.path.join(tmp, "journal.db"),
+        TIMETABLE_SEARCH=os.path.join(tmp, "search.db"),
+        TIMETABLE_METRICS=os.path.join(tmp, "metrics.db"),
+        TIMETABLE_SIGNATURE_DIR=os.path.join(tmp, "signatures"),
+    )
+    env.pop("TIMETABLE_PROFILE", None)
+    return env
+
+
+def check_page(page, env, repeat=3):
+    """(import ms 중앙값, 첫 렌더 ms 중앙값, 예산을 넘긴 항목 목록)"""
+    runs = [measure(page, env) for _ in range(repeat)]
+    imported = statistics.median(r["import_ms"] for r in runs)
+    rendered = statistics.median(r["first_render_ms"] for r in runs)
+    budget = BUDGETS[page]
+    problems = [e for r in runs for e in r["exceptions"]][:1]
+    if imported > budget["import_ms"]:
+        problems.append(f"import > {budget['import_ms']}ms")
+    if rendered > budget["first_render_ms"]:
+        problems.append(f"render > {budget['first_render_ms']}ms")
+    loaded = sorted({m for r in runs for m in FORBIDDEN[page] if m in r["modules"]})
+    if loaded:
+        problems.append(f"loaded {', '.join(loaded)}")
+    return imported, rendered, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="페이지마다 새 프로세스로 잴 횟수 (중앙값)")
+    parser.add_argument("--pages", default=",".join(PAGES))
+    args = parser.parse_args()
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        env = bench_env(tmp)
+        print(f"{'page':<11}{'import ms':>11}{'render ms':>11}  status")
+        for page in args.pages.split(","):
+            imported, rendered, problems = check_page(page, env, args.repeat)
+            failed = failed or bool(problems)
+            status = f"OVER BUDGET ({'; '.join(problems)})" if problems else "ok"
+            print(f"{page:<11}{imported:>11.1f}{rendered:>11.1f}  {status}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""여러 서버 프로세스가 같은 SQLite(WAL) 저장소를 공유할 때의 부하 시험.
+
+    python benchmarks/load_test.py [--sessions 30] [--workers 4] [--reruns 50] [--write-behind-ms 200]
+
+워커 프로세스 M 개가 각자 저장소를 열고(Streamlit 서버 프로세스 하나에 해당),
+세션 N 개를 스레드로 나눠 맡아 한 rerun 과 같은 저장소 호출(템플릿/하루 기록/
+하루 항목 읽기 → 체크박스 하나 바꿔 저장 → 가끔 코멘트 저장)을 반복합니다.
+
+1단계가 끝나면 세션을 다른 워커로 옮겨(로드 밸런서가 다른 프로세스로 보낸 경우)
+각 세션이 마지막에 쓴 값을 그대로 읽는지 확인합니다. 동기 쓰기와 지연 쓰기
+(write-behind) 두 방식의 rerun 지연 시간과 처리량, 잃어버린 쓰기 수를 출력합니다.
+"""
+import argparse
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from timetable.storage import SQLiteStorage  # noqa: E402
+from timetable.templates import TIMETABLE  # noqa: E402
+from timetable.write_behind import WriteBehindStorage  # noqa: E402
+
+DAY = date(2025, 3, 3).isoformat()
+N_PERIODS = 6
+FLAGS = ("move_done", "ready")
+
+
+def _open(path, write_behind_ms):
+    storage = SQLiteStorage(path)
+    return WriteBehindStorage(storage, write_behind_ms) if write_behind_ms > 0 else storage
+
+
+def _student(session):
+    return f"학생{session:03d}"
+
+
+def _session(storage, session, reruns, seed, latencies, state):
+    rng = random.Random(seed)
+    student = _student(session)
+    records = {}
+    for i in range(reruns):
+        started = time.perf_counter()
+        storage.load_template(student, TIMETABLE)
+        stored = storage.load_day(student, DAY)
+        storage.load_entries(student, DAY)
+        period = rng.randrange(N_PERIODS)
+        record = dict(stored.get(period) or {"name": f"{period + 1}교시"})
+        flag = rng.choice(FLAGS)
+        record[flag] = not record.get(flag, False)
+        storage.save_periods(student, DAY, {period: record})
+        records[period] = record
+        if i % 10 == 0:
+            storage.save_entries(student, DAY, {"comment": f"{i}"})
+        latencies.append((time.perf_counter() - started) * 1000)
+    state[session] = records
+
+
+def _worker(path, write_behind_ms, sessions, reruns, phase, results):
+    storage = _open(path, write_behind_ms)
+    latencies = []
+    state = {}
+    errors = []
+
+    def run(session):
+        try:
+            if phase == "verify":
+                # 다른 워커에서 쓴 값이 보이는지만 확인
+                state[session] = storage.load_day(_student(session), DAY)
+            else:
+                _session(storage, session, reruns, session, latencies, state)
+        except Exception as exc:
+            errors.append(repr(exc))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=run, args=(s,)) for s in sessions]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    storage.close()
+    results.put({"latencies": latencies, "state": state, "errors": errors, "elapsed": time.perf_counter() - started})
+
+
+def _run_phase(path, write_behind_ms, assignment, reruns, phase):
+    ctx = mp.get_context("spawn")
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(target=_worker, args=(path, write_behind_ms, sessions, reruns, phase, results))
+        for sessions in assignment
+    ]
+    for p in procs:
+        p.start()
+    outputs = [results.get() for _ in procs]
+    for p in procs:
+        p.join()
+    return outputs
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def run_mode(label, n_sessions, n_workers, reruns, write_behind_ms):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "load.db")
+        SQLiteStorage(path).close()
+        sessions = list(range(n_sessions))
+        assignment = [sessions[w::n_workers] for w in range(n_workers)]
+
+        started = time.perf_counter()
+        outputs = _run_phase(path, write_behind_ms, assignment, reruns, "load")
+        elapsed = time.perf_counter() - started
+
+        # 세션을 옆 워커로 옮겨 마지막 쓰기가 보이는지 확인
+        moved = assignment[1:] + assignment[:1]
+        verified = _run_phase(path, write_behind_ms, moved, reruns, "verify")
+
+    latencies = [ms for out in outputs for ms in out["latencies"]]
+    expected = {s: records for out in outputs for s, records in out["state"].items()}
+    seen = {s: records for out in verified for s, records in out["state"].items()}
+    lost = sum(
+        1
+        for s, records in expected.items()
+        for period, record in records.items()
+        if seen.get(s, {}).get(period) != record
+    )
+    errors = [e for out in outputs + verified for e in out["errors"]]
+    print(
+        f"{label:<14}{len(latencies):>8}{len(latencies) / elapsed:>12,.0f}"
+        f"{_percentile(latencies, 0.5):>9.2f}{_percentile(latencies, 0.95):>9.2f}{_percentile(latencies, 0.99):>9.2f}"
+        f"{lost:>7}{len(errors):>8}"
+    )
+    for error in errors[:5]:
+        print("  ", error)
+    return lost == 0 and not errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=30)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--reruns", type=int, default=50)
+    parser.add_argument("--write-behind-ms", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"세션 {args.sessions}개, 워커 {args.workers}개, 세션당 rerun {args.reruns}번")
+    print(f"{'mode':<14}{'reruns':>8}{'reruns/s':>12}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'lost':>7}{'errors':>8}")
+    ok = run_mode("sync", args.sessions, args.workers, args.reruns, 0)
+    ok = run_mode("write-behind", args.sessions, args.workers, args.reruns, args.write_behind_ms) and ok
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
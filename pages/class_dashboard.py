@@ -0,0 +1,194 @@
+import io
+import streamlit as st
+from datetime import datetime, timedelta
+
+from timetable import range_views
+from timetable.aggregates import class_progress
+from timetable.render import month_heatmap_html
+from timetable.metrics import RATES, WINDOWS, rolling_series, window_rates
+from timetable.session import get_metrics, get_signature_store, get_storage
+
+ALL_CLASSES = "전체"
+
+# 제목
+st.title("반 진행도 대시보드")
+
+selected_date = st.date_input("날짜를 선택하세요", datetime.now())
+date_key = selected_date.isoformat()
+weekday_labels = ["월", "화", "수", "목", "금", "토", "일"]
+st.markdown(f"#### {selected_date.month}월 {selected_date.day}일 {weekday_labels[selected_date.weekday()]}요일")
+
+storage = get_storage()
+class_name = st.selectbox("반 선택", [ALL_CLASSES] + storage.list_classes())
+
+
+# (날짜, 반, 리비전) 단위 캐시: 교시 기록이 저장되면 리비전이 올라가 자동으로 다시 계산됨
+@st.cache_data(max_entries=256, show_spinner=False)
+def load_class_progress(date_key, class_name, revision):
+    storage = get_storage()
+    if class_name == ALL_CLASSES:
+        records = storage.load_date(date_key)
+        students = ()
+    else:
+        records = storage.load_date(date_key, class_name)
+        students = storage.list_students(class_name)
+    return class_progress(records, students)
+
+
+# (월, 반, 기간 리비전) 단위 캐시: 한 달치 기록을 한 번의 질의로 읽어 날짜별 완료율만 남김
+@st.cache_data(max_entries=64, show_spinner=False)
+def load_month_completion(year, month, class_name, revision):
+    storage = get_storage()
+    month_from, month_to = range_views.month_bounds(year, month)
+    if class_name == ALL_CLASSES:
+        rows = storage.load_period_range(month_from, month_to)
+        students = ()
+    else:
+        rows = storage.load_period_range(month_from, month_to, class_name=class_name)
+        students = storage.list_students(class_name)
+    return range_views.month_heatmap_weeks(year, month, range_views.daily_completion(rows, students=students))
+
+
+per_period, per_student = load_class_progress(date_key, class_name, storage.date_revision(date_key))
+
+c1, c2, c3 = st.columns(3)
+with c1:
+    st.metric("학생 수", len(per_student))
+with c2:
+    st.metric("평균 진행률", f"{per_student['진행률(%)'].mean():.1f}%" if len(per_student) else "—")
+with c3:
+    st.metric("점심 완료", f"{int(per_student['점심'].sum())}명")
+
+st.markdown("### 교시별 완료율 (%)")
+if per_period.empty:
+    st.write("저장된 기록이 없습니다.")
+else:
+    st.dataframe(
+        per_period.drop(columns="period").rename(columns={
+            "name": "교시", "move_done": "이동", "ready": "준비물", "signed": "선생님확인", "done": "수업준비완료",
+        }),
+        hide_index=True,
+        width="stretch",
+    )
+
+st.markdown("### 학생별 진행도")
+if per_student.empty:
+    st.write("학생이 없습니다.")
+else:
+    st.dataframe(per_student, width="stretch")
+
+st.markdown(f"### {selected_date.month}월 수업 준비 완료율")
+month_from, month_to = range_views.month_bounds(selected_date.year, selected_date.month)
+month_weeks = load_month_completion(
+    selected_date.year, selected_date.month, class_name, storage.range_revision(month_from, month_to)
+)
+st.markdown(month_heatmap_html(month_weeks), unsafe_allow_html=True)
+
+# 학생별 추이: 저장할 때마다 고쳐 둔 하루 카운터를 최근 30일치만 읽어 연속 일수와 7/30일 비율을 계산
+metrics = get_metrics()
+if metrics is not None:
+    st.markdown("### 📈 학생별 추이")
+    if metrics.needs_rebuild():
+        with st.spinner("학생별 추이를 처음 계산하는 중..."):
+            metrics.rebuild(storage)
+    roster = storage.list_students(None if class_name == ALL_CLASSES else class_name)
+    recent = metrics.load_days(roster, selected_date - timedelta(days=max(WINDOWS) - 1), selected_date)
+    trend_rows = []
+    for name in roster:
+        row = {"학생": name, "연속 준비완료(일)": metrics.current_streak(name, selected_date)}
+        for window in WINDOWS:
+            for label, value in window_rates(recent[name], selected_date, window).items():
+                row[f"{label} {window}일(%)"] = value
+        trend_rows.append(row)
+    if trend_rows:
+        st.dataframe(trend_rows, hide_index=True, width="stretch")
+        trend_student = st.selectbox("추이 그래프를 볼 학생", roster, index=None, placeholder="학생 선택")
+        if trend_student is not None:
+            # altair 는 무거우므로 그래프를 그릴 때만 불러옴
+            import altair as alt
+
+            trend_from = selected_date - timedelta(days=89)
+            days = metrics.load_days([trend_student], trend_from - timedelta(days=6), selected_date)[trend_student]
+            series = [
+                {"날짜": day.isoformat(), "항목": label, "비율": value}
+                for day, label, value in rolling_series(days, trend_from, selected_date)
+            ]
+            if series:
+                sparkline = alt.Chart(alt.Data(values=series)).mark_line(interpolate="monotone").encode(
+                    x=alt.X("날짜:T", axis=None),
+                    y=alt.Y("비율:Q", axis=None, scale=alt.Scale(domain=[0, 100])),
+                    tooltip=["날짜:T", "항목:N", "비율:Q"],
+                ).properties(width=360, height=40)
+                st.caption("최근 90일, 날짜마다 직전 7일 비율(%)")
+                st.altair_chart(
+                    sparkline.facet(row=alt.Row("항목:N", sort=list(RATES), header=alt.Header(labelAngle=0, labelAlign="left", title=None))),
+                )
+            else:
+                st.write("최근 90일 기록이 없습니다.")
+    else:
+        st.write("학생이 없습니다.")
+
+# 반/학년 전체 학생의 하루·주간 보고서를 프로세스 풀에서 그려 zip 하나로 내려받음
+st.markdown("### 📄 보고서 내보내기")
+with st.form("report_export", border=False):
+    c1, c2, c3, c4 = st.columns([2, 2, 1, 1])
+    with c1:
+        report_from = st.date_input("시작일", selected_date - timedelta(days=selected_date.weekday()), key="report_from")
+    with c2:
+        report_to = st.date_input("종료일", selected_date, key="report_to")
+    with c3:
+        report_unit = st.radio("단위", ["하루", "주간"], key="report_unit")
+    with c4:
+        report_fmt = st.radio("형식", ["pdf", "png"], key="report_fmt")
+    report_scope = st.radio(
+        "대상", ["선택한 반", "같은 학년 전체"], horizontal=True, key="report_scope",
+        help="반 선택이 '전체'이면 모든 반",
+    )
+    submitted = st.form_submit_button("보고서 만들기")
+if submitted:
+    # 보고서 모듈은 PIL 을 불러오므로 내보낼 때만 불러옴
+    from timetable import reports
+
+    if class_name == ALL_CLASSES:
+        targets = reports.select_students(storage)
+    elif report_scope == "같은 학년 전체":
+        targets = reports.select_students(storage, grade=class_name.split("-")[0])
+    else:
+        targets = reports.select_students(storage, class_name=class_name)
+    with st.spinner("보고서를 그리는 중..."):
+        report_data = reports.collect_reports(storage, targets, report_from, report_to)
+        jobs = reports.report_jobs(report_data, report_fmt, "week" if report_unit == "주간" else "day")
+        out = io.BytesIO()
+        count = reports.export_reports(out, jobs, signature_root=get_signature_store().root)
+    if count:
+        st.download_button(
+            f"⬇️ 보고서 {count}개 내려받기 (zip)",
+            out.getvalue(),
+            file_name=f"reports_{report_from}_{report_to}.zip",
+            mime="application/zip",
+            key="report_download",
+        )
+    else:
+        st.write("기간 안에 저장된 기록이 없습니다.")
+
+# 변경 기록이 켜져 있으면 (TIMETABLE_JOURNAL) 선택한 날짜의 서명 잠금 해제 이력을 보여 줌
+journal = getattr(storage, "journal", None)
+if journal is not None:
+    st.markdown("### 🔓 서명 잠금 해제 기록")
+    students = None if class_name == ALL_CLASSES else storage.list_students(class_name)
+    unlocks = journal.signature_unlocks(date_key, date_key, students)
+    if unlocks:
+        st.dataframe(
+            [
+                {
+                    "학생": student,
+                    "교시 순서": period + 1,
+                    "시각": datetime.fromtimestamp(ts).strftime("%H:%M:%S"),
+                    "세션": actor,
+                }
+                for _, student, period, ts, actor in unlocks
+            ],
+            hide_index=True,
+        )
+    else:
+        st.write("잠금 해제 기록이 없습니다.")
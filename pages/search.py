@@ -0,0 +1,57 @@
+import time
+from html import escape
+
+import streamlit as st
+
+from timetable.search import KIND_LABELS, MAX_RESULTS, SEARCH_KINDS, snippet_html
+from timetable.session import get_search_index, get_storage
+
+ALL_CLASSES = "전체"
+
+# 제목
+st.title("기록 검색")
+
+storage = get_storage()
+index = get_search_index()
+if index is None:
+    st.write("검색 색인이 꺼져 있습니다 (TIMETABLE_SEARCH).")
+    st.stop()
+
+# 처음 켰을 때는 지금까지 저장된 코멘트/주말 일과를 한 번 색인 (이후에는 저장할 때마다 갱신)
+if index.needs_rebuild():
+    with st.spinner("검색 색인을 만드는 중..."):
+        index.rebuild(storage)
+
+query = st.text_input("검색어", placeholder="예) 체육관", help="띄어 쓴 낱말을 모두 포함하는 기록을 찾습니다.").strip()
+c1, c2, c3 = st.columns([1, 1, 2])
+with c1:
+    class_name = st.selectbox("반", [ALL_CLASSES] + storage.list_classes())
+with c2:
+    student = st.text_input("학생 이름", placeholder="비우면 모두").strip()
+with c3:
+    kinds = st.multiselect(
+        "대상", SEARCH_KINDS, default=list(SEARCH_KINDS), format_func=KIND_LABELS.get,
+    )
+
+if query:
+    students = None if class_name == ALL_CLASSES else storage.list_students(class_name)
+    if student:
+        students = [student] if students is None or student in students else []
+    started = time.perf_counter()
+    hits = index.search(query, students=students, kinds=tuple(kinds))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    more = f" (최근 {MAX_RESULTS}개만 표시)" if len(hits) >= MAX_RESULTS else ""
+    st.caption(f"{len(hits)}건{more} · {elapsed_ms:.0f}ms")
+    if hits:
+        # 결과 전체를 마크다운 요소 하나로 보냄
+        st.markdown(
+            "".join(
+                "<div style='padding:6px 0;border-bottom:1px solid #eee;'>"
+                f"<b>{date}</b> · {escape(name)} · <span style='color:#666;'>{KIND_LABELS[kind]}</span><br>"
+                f"{snippet_html(text, query)}</div>"
+                for date, name, kind, text in hits
+            ),
+            unsafe_allow_html=True,
+        )
+    else:
+        st.write("찾는 기록이 없습니다.")
@@ -1,7 +1,19 @@
 import streamlit as st
-from datetime import datetime, time, timedelta
+from datetime import datetime
 import uuid
-import pandas as pd
+
+from timetable.bulk_panel import bulk_panel
+from timetable import range_views, templates
+from timetable.profiling import start_profiler
+from timetable.render import task_table_html, week_grid_html
+from timetable.session import current_student, get_storage
+from timetable.state import fingerprint, manage_date_state, mark_synced, sync_date
+from timetable.tasks import TaskList
+from timetable.timeslots import format_minutes, section_slots
+
+# 렌더링 프로파일 (TIMETABLE_PROFILE=1 또는 ?profile=1 일 때만 기록)
+profiler = start_profiler("weekend")
+profiler.section("setup")
 
 # 제목
 st.title("주말 일과표")
@@ -9,6 +21,7 @@ st.title("주말 일과표")
 # 날짜 선택 및 요일 표시
 selected_date = st.date_input("날짜를 선택하세요", datetime.now())
 date_key = selected_date.isoformat()
+manage_date_state(date_key)
 weekday_labels = ["월", "화", "수", "목", "금", "토", "일"]
 st.markdown(f"#### {selected_date.month}월 {selected_date.day}일 {weekday_labels[selected_date.weekday()]}요일")
 
@@ -16,54 +29,140 @@ st.markdown(f"#### {selected_date.month}월 {selected_date.day}일 {weekday_labe
 morning_key = f"morning_tasks_{date_key}"
 afternoon_key = f"afternoon_tasks_{date_key}"
 
-def make_item(title="", place="", time_str=""):
-    # 'done' 상태 추가 (초기 False)
-    return {"id": str(uuid.uuid4()), "title": title, "place": place, "time": time_str, "done": False}
+def make_item(title="", place="", minutes=None):
+    # 'done' 상태 추가 (초기 False), 시간은 자정 기준 분 (없으면 None)
+    return {"id": str(uuid.uuid4()), "title": title, "place": place, "time": minutes, "done": False}
+
+# 주말 일과 일괄 가져오기/내보내기 (가져온 뒤에는 일과 목록을 저장소에서 다시 읽음)
+bulk_panel("weekend", reset_prefixes=("morning_tasks_", "afternoon_tasks_"))
+
+# 저장소: 선택한 날짜의 항목만 읽어 옴
+student = current_student()
+storage = get_storage()
+
+# 주간 보기: 그 주 토·일 일과를 한 번에 읽어 표 하나로 그리고, 하루 입력 화면은 건너뜀
+view_mode = st.radio("보기", ["하루", "주간"], horizontal=True, key="weekend_view_mode")
+if view_mode == "주간":
+    profiler.section("range_view")
+    weekend = range_views.week_dates(selected_date, range_views.WEEKEND_DAYS)
+    rows = storage.load_entry_range(("weekend_m", "weekend_a"), weekend[0], weekend[-1], student=student)
+    st.markdown(
+        week_grid_html(
+            tuple(range_views.day_label(d) for d in weekend),
+            range_views.weekend_week_grid(rows, weekend, storage.load_template(student, templates.WEEKEND)),
+        ),
+        unsafe_allow_html=True,
+    )
+    profiler.finish()
+    st.stop()
 
-# 초기 항목: title은 빈 문자열로 두어 placeholder(회색 안내)가 보이게 함
+stored_entries = storage.load_entries(student, date_key)
+
+# 요일 기본 일과: 이 날짜에 저장된 일과가 없으면 기본 일과를 그대로 쓰고, 바뀐 경우에만 날짜에 저장
+weekend_template = storage.load_template(student, templates.WEEKEND) or {}
+weekday_template = templates.day_template(weekend_template, selected_date.weekday())
+base_entries = {kind: stored_entries.get(kind) or weekday_template.get(kind) for kind in ("weekend_m", "weekend_a")}
+
+# 다른 서버 프로세스/탭에서 이 날짜가 저장됐거나 학생이 바뀌었으면 세션의 날짜 키를 지우고 저장소 값으로 다시 채움
+sync_date("weekend", date_key, fingerprint(student, weekday_template, stored_entries))
+
+# 초기 항목: 저장된 일과도 기본 일과도 없으면 title은 빈 문자열로 두어 placeholder(회색 안내)가 보이게 함
+# 일과 목록은 id 로 바로 찾고 시간순을 유지하는 TaskList 로 보관
 if morning_key not in st.session_state:
-    st.session_state[morning_key] = [make_item("", "", "")]
+    st.session_state[morning_key] = TaskList(base_entries["weekend_m"] or [make_item()])
 if afternoon_key not in st.session_state:
-    st.session_state[afternoon_key] = [make_item("", "", "")]
-
-# 시간 옵션 생성 (15분 간격)
-def make_time_options(section):
-    opts = []
-    if section == "m":  # 오전: 06:00 ~ 11:45
-        start = time(6,0)
-        end_hour = 11
-    else:  # 오후: 12:00 ~ 21:45
-        start = time(12,0)
-        end_hour = 21
-    cur = datetime.combine(datetime.today(), start)
-    while cur.time().hour <= end_hour:
-        opts.append(cur.time().strftime("%H:%M"))
-        cur += timedelta(minutes=15)
-    return opts
-
-def parse_time_str(tstr):
-    try:
-        h, m = tstr.split(":")
-        return int(h) * 60 + int(m)
-    except Exception:
-        return 10**9  # very large -> put at end
-
-def sort_tasks_by_time(state_key):
-    lst = list(st.session_state[state_key])
-    # stable sort by parse_time_str (empty/invalid times go to end)
-    lst.sort(key=lambda item: parse_time_str(item.get("time", "") or ""))
-    st.session_state[state_key] = lst
-
-def render_tasks(section_label, state_key, prefix):
+    st.session_state[afternoon_key] = TaskList(base_entries["weekend_a"] or [make_item()])
+
+# 저장소와 맞춰 둔 하루 항목. 일과 묶음은 프래그먼트로 따로 다시 실행되므로 세션에 두고 같이 씀
+known_key = f"weekend_known_{date_key}"
+st.session_state[known_key] = dict(stored_entries)
+
+def save_changed_entries(values):
+    """values 중 저장된 값(일과는 없으면 요일 기본 일과)과 다른 것만 저장하고 동기화 지문을 갱신"""
+    known = st.session_state[known_key]
+    changed = {
+        kind: value
+        for kind, value in values.items()
+        if value != (known.get("comment", "") if kind == "comment" else known.get(kind) or weekday_template.get(kind))
+    }
+    storage.save_entries(student, date_key, changed)
+    known.update(changed)
+    mark_synced("weekend", date_key, fingerprint(student, weekday_template, known))
+
+def render_summary(slot, tasks, empty_text):
+    rows = tuple(
+        (item.get("title", ""), item.get("place", ""), format_minutes(item.get("time")), bool(item.get("done", False)))
+        for item in tasks
+    )
+    if rows:
+        # st.table 은 내부에서 pandas 를 불러오므로 HTML 표 하나로 그림
+        slot.markdown(task_table_html(rows), unsafe_allow_html=True)
+    else:
+        slot.write(empty_text)
+
+def row_keys(prefix, item_id):
+    return {
+        name: f"{name}_{prefix}_{item_id}_{date_key}"
+        for name in ("row", "title", "place", "time", "done", "save", "del")
+    }
+
+def commit_row(tasks, item, keys, slots):
+    """폼으로 제출된 한 행의 값을 한 번에 반영 (시간이 바뀐 경우에만 정렬 위치를 다시 잡음)"""
+    fields = {"done": bool(st.session_state.get(keys["done"], item.get("done", False)))}
+    # 완료된 행은 입력칸 없이 취소선으로만 보이므로 완료 여부만 바꿈
+    if not item.get("done", False):
+        fields["title"] = st.session_state.get(keys["title"], item.get("title", ""))
+        fields["place"] = st.session_state.get(keys["place"], item.get("place", ""))
+        label = st.session_state.get(keys["time"])
+        fields["time"] = slots.by_label[label] if label in slots.by_label else item.get("time")
+    tasks.update(item["id"], **fields)
+
+def render_row(item, keys, slots):
+    # 행 하나가 폼: 입력하는 동안에는 rerun 이 없고, 저장을 누르면 네 칸이 함께 반영됨
+    with st.form(keys["row"], border=False):
+        c_title, c_place, c_time, c_actions = st.columns([3,3,3,1])
+        done_val = item.get("done", False)
+
+        # 완료된 일과는 스트라이크(취소선) + 연한 회색 텍스트로 표시, 편집 불가
+        if done_val:
+            for col, text in ((c_title, item.get("title", "") or "(완료된 일정)"), (c_place, item.get("place", "")), (c_time, format_minutes(item.get("time")))):
+                with col:
+                    st.markdown(f"<div style='color:#777; text-decoration:line-through; margin:6px 0;'>{text}</div>", unsafe_allow_html=True)
+        else:
+            with c_title:
+                st.text_input("", value=item.get("title", ""), placeholder="어떤 계획이 있나요?", key=keys["title"])
+            with c_place:
+                st.text_input("", value=item.get("place", ""), placeholder="어디에서 하나요?", key=keys["place"])
+            with c_time:
+                # 선택지 튜플은 캐시된 것을 그대로 쓰고, 현재 시간의 위치는 dict 로 바로 찾음
+                st.selectbox("", slots.labels, index=slots.index_of(item.get("time")), key=keys["time"])
+
+        # 오른쪽: 완료 체크박스와 저장/삭제 버튼
+        with c_actions:
+            st.checkbox("완료", value=done_val, key=keys["done"])
+            st.form_submit_button("저장", key=keys["save"])
+            st.form_submit_button("삭제", key=keys["del"])
+
+@st.fragment
+def task_section(section_label, state_key, prefix, kind, summary_slot, empty_text):
+    """오전/오후 일과 한 묶음. 행 저장/삭제/추가는 이 묶음과 그 요약 칸만 다시 실행"""
+    tasks = st.session_state[state_key]
+    slots = section_slots(prefix)
+
+    # 제출된 행을 먼저 반영해 바뀐 시간 순서대로 그림
+    for item in list(tasks):
+        keys = row_keys(prefix, item["id"])
+        if st.session_state.get(keys["save"]):
+            commit_row(tasks, item, keys, slots)
+        elif st.session_state.get(keys["del"]):
+            tasks.remove(item["id"])
+
     cols = st.columns([8,1])
     with cols[0]:
-        # 요청에 따라 섹션 제목을 '오전일과' / '오후일과' 형태로 표시
-        st.markdown(f"### {section_label}")  # section_label 전달시 "오전일과" 또는 "오후일과" 로 호출하세요
+        st.markdown(f"### {section_label}")
     with cols[1]:
         if st.button("추가", key=f"add_{prefix}_{date_key}"):
-            st.session_state[state_key].append(make_item("", "", ""))
-
-    time_opts = make_time_options(prefix)
+            tasks.add(make_item())
 
     # 헤더 행: 각 칸 위에 레이블 표시 (일과명 / 장소명 / 시간)
     # CSS로 레이블과 입력박스의 간격을 줄여 라벨이 입력박스와 가깝게 보이도록 함
@@ -86,108 +185,43 @@ def render_tasks(section_label, state_key, prefix):
         st.markdown('')
 
     # 렌더링: 각 항목의 위젯 key에 id 사용 -> 정렬 시 입력값 유지
-    for item in list(st.session_state[state_key]):
-        item_id = item["id"]
-        container = st.container()
-        with container:
-            c_title, c_place, c_time, c_actions = st.columns([3,3,3,1])
-
-            # done 상태 키/값 미리 확인
-            done_key = f"done_{prefix}_{item_id}_{date_key}"
-            done_val = st.session_state.get(done_key, item.get("done", False))
+    for item in list(tasks):
+        render_row(item, row_keys(prefix, item["id"]), slots)
 
-            # 일과명: 완료시에는 스트라이크(취소선) + 연한 회색 텍스트로 표시, 편집 불가
-            with c_title:
-                if done_val:
-                    display_title = item.get("title", "") or "(완료된 일정)"
-                    st.markdown(f"<div style='color:#777; text-decoration:line-through; margin:6px 0;'>{display_title}</div>", unsafe_allow_html=True)
-                else:
-                    title_val = st.text_input(
-                        "",  # 라벨은 위 헤더에서 처리
-                        value=item.get("title", ""),
-                        placeholder="어떤 계획이 있나요?",
-                        key=f"title_{prefix}_{item_id}_{date_key}"
-                    )
-                    # 저장
-                    for it in st.session_state[state_key]:
-                        if it["id"] == item_id:
-                            it["title"] = title_val
-                            break
-
-            # 장소 칸: 완료시 스트라이크로 표시
-            with c_place:
-                if done_val:
-                    display_place = item.get("place", "")
-                    st.markdown(f"<div style='color:#777; text-decoration:line-through; margin:6px 0;'>{display_place}</div>", unsafe_allow_html=True)
-                else:
-                    place_val = st.text_input(
-                        "",
-                        value=item.get("place", ""),
-                        placeholder="어디에서 하나요?",
-                        key=f"place_{prefix}_{item_id}_{date_key}"
-                    )
-                    for it in st.session_state[state_key]:
-                        if it["id"] == item_id:
-                            it["place"] = place_val
-                            break
-
-            # 시간 칸: 완료시 스트라이크로 표시
-            with c_time:
-                if done_val:
-                    display_time = item.get("time", "")
-                    st.markdown(f"<div style='color:#777; text-decoration:line-through; margin:6px 0;'>{display_time}</div>", unsafe_allow_html=True)
-                else:
-                    default_time = item.get("time") or (time_opts[0] if time_opts else "")
-                    idx = time_opts.index(default_time) if default_time in time_opts else 0
-                    selected_time = st.selectbox(
-                        "",
-                        time_opts,
-                        index=idx,
-                        key=f"time_{prefix}_{item_id}_{date_key}"
-                    )
-                    for it in st.session_state[state_key]:
-                        if it["id"] == item_id:
-                            it["time"] = selected_time
-                            break
-
-            # 오른쪽: 완료 체크박스와 삭제 버튼
-            with c_actions:
-                # '완료' 글자 표시(완료 전). 체크하면 글자가 사라지고 항목에 취소선이 그어짐.
-                if done_key not in st.session_state:
-                    st.session_state[done_key] = item.get("done", False)
-
-                # 완료 전에는 '완료' 라벨을 보여줌
-                if not st.session_state[done_key]:
-                    st.markdown("<div style='font-weight:600;margin-bottom:4px;'>완료</div>", unsafe_allow_html=True)
-
-                # 체크박스 (라벨 없음). 체크하면 다음 rerun에서 위 라벨이 사라지고 취소선이 적용됩니다.
-                done = st.checkbox("", value=st.session_state[done_key], key=done_key)
-                # 아이템 상태 업데이트
-                for it in st.session_state[state_key]:
-                    if it["id"] == item_id:
-                        it["done"] = done
-                        break
-
-                # 삭제 버튼 (기존 동작 유지)
-                del_key = f"del_{prefix}_{item_id}_{date_key}"
-                if st.button("삭제", key=del_key):
-                    st.session_state[state_key] = [it for it in st.session_state[state_key] if it["id"] != item_id]
-
-    # 입력/삭제 후에는 시간 기준으로 자동 정렬
-    sort_tasks_by_time(state_key)
+    save_changed_entries({kind: tasks.to_list()})
+    # 요약 칸은 페이지 아래에 있지만 위젯이 아니므로 프래그먼트에서 바로 다시 그릴 수 있음
+    render_summary(summary_slot, tasks, empty_text)
 
-# 렌더링: 섹션 라벨을 요청대로 설정
-render_tasks("오전일과", morning_key, "m")
+# 일과 묶음 자리: 요약 칸을 먼저 만든 뒤 아래에서 채움
+morning_area = st.container()
 st.markdown('<hr style="border-top: 2px dashed #bbb;">', unsafe_allow_html=True)
-render_tasks("오후일과", afternoon_key, "a")
+afternoon_area = st.container()
 
 # 코멘트 저장
+profiler.section("comment")
 st.markdown("### 오늘 하루는 어땠나요?")
+if f"comment_{date_key}" not in st.session_state:
+    st.session_state[f"comment_{date_key}"] = stored_entries.get("comment", "")
 comment = st.text_area("", key=f"comment_{date_key}")
 st.session_state["timetable"] = st.session_state.get("timetable", {})
 st.session_state["timetable"][f"{date_key}_comment"] = comment
+save_changed_entries({"comment": comment})
+
+# 오늘 일과(완료 표시는 빼고)를 이 요일의 기본 일과로 저장
+weekday_label = weekday_labels[selected_date.weekday()]
+if st.button(f"📌 {weekday_label}요일 기본 일과로 저장", key=f"save_weekend_template_{date_key}"):
+    weekday_template = {
+        kind: [{**item, "done": False} for item in st.session_state[key].to_list()]
+        for kind, key in (("weekend_m", morning_key), ("weekend_a", afternoon_key))
+    }
+    storage.save_template(
+        student, templates.WEEKEND, templates.with_day(weekend_template, selected_date.weekday(), weekday_template)
+    )
+    st.success(f"{weekday_label}요일 기본 일과를 저장했습니다. 새로 여는 {weekday_label}요일에 적용됩니다.")
+    save_changed_entries({})
 
 # 오늘 하루 요약 표 (오전 / 오후)
+profiler.section("summary")
 st.markdown("### 오늘 하루 요약")
 # 선택한 날짜와 요일을 표시합니다. 예: 2025년 10월 28일(화)
 selected_day_str = f"{selected_date.year}년 {selected_date.month}월 {selected_date.day}일({weekday_labels[selected_date.weekday()]})"
@@ -196,34 +230,17 @@ st.markdown(f"**{selected_day_str}**")
 cols = st.columns([1,1])
 with cols[0]:
     st.subheader("오전")
-    morning_rows = []
-    for item in st.session_state.get(morning_key, []):
-        morning_rows.append({
-            "일과명": item.get("title", ""),
-            "장소명": item.get("place", ""),
-            "시간": item.get("time", ""),
-            "완료": "✅" if item.get("done", False) else "—",
-        })
-    if morning_rows:
-        df_morning = pd.DataFrame(morning_rows)
-        df_morning.index = pd.RangeIndex(start=1, stop=len(df_morning)+1)
-        st.table(df_morning)
-    else:
-        st.write("오전 일정이 없습니다.")
-
+    morning_summary = st.empty()
 with cols[1]:
     st.subheader("오후")
-    afternoon_rows = []
-    for item in st.session_state.get(afternoon_key, []):
-        afternoon_rows.append({
-            "일과명": item.get("title", ""),
-            "장소명": item.get("place", ""),
-            "시간": item.get("time", ""),
-            "완료": "✅" if item.get("done", False) else "—",
-        })
-    if afternoon_rows:
-        df_afternoon = pd.DataFrame(afternoon_rows)
-        df_afternoon.index = pd.RangeIndex(start=1, stop=len(df_afternoon)+1)
-        st.table(df_afternoon)
-    else:
-        st.write("오후 일정이 없습니다.")
\ No newline at end of file
+    afternoon_summary = st.empty()
+
+# 렌더링: 섹션 라벨을 요청대로 설정
+profiler.section("morning_tasks")
+with morning_area:
+    task_section("오전일과", morning_key, "m", "weekend_m", morning_summary, "오전 일정이 없습니다.")
+profiler.section("afternoon_tasks")
+with afternoon_area:
+    task_section("오후일과", afternoon_key, "a", "weekend_a", afternoon_summary, "오후 일정이 없습니다.")
+
+profiler.finish()
@@ -1,10 +1,22 @@
 import streamlit as st
-from datetime import datetime, timedelta
-from streamlit_drawable_canvas import st_canvas
-import calendar
-import numpy as np
-from PIL import Image
-import base64
+from datetime import datetime
+
+from timetable.bulk_panel import bulk_panel
+from timetable.canvas import changed_strokes
+from timetable.profiling import start_profiler
+from timetable import range_views, templates
+from timetable.render import (
+    lunch_done_html, month_heatmap_html, period_row_html, progress_badge_html, summary_table_html, week_grid_html,
+)
+from timetable.schedule import LUNCH_NAME, build_schedule
+from timetable.session import current_student, get_signature_store, get_storage
+from timetable.state import fingerprint, manage_date_state, mark_synced, sync_date
+from timetable.subjects import load_registry
+
+# 렌더링 프로파일 (TIMETABLE_PROFILE=1 또는 ?profile=1 일 때만 기록)
+profiler = start_profiler("timetable")
+profiler.section("setup")
+
 # 서명 영역 크기 상수 (잠금 전/후 동일하게 유지)
 SIGN_W = 200
 SIGN_H = 120
@@ -26,12 +38,9 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# 과목 리스트 (특수학급 명칭 변경)
-subjects = [
-    "국어", "영어", "수학", "사회", "과학", "음악", "미술", "체육",
-    "진로", "정보", "역사",
-    "특수(진로)", "특수(수학)", "특수(체육)", "특수(국어)", "특수(정보)"
-]
+# 과목 리스트: subjects.toml 에서 한 번만 읽어 둔 과목 등록부 (장소/준비물 기본값 포함)
+subject_registry = load_registry()
+subjects = list(subject_registry.names)
 
 # 기본 시간표 정보
 default_periods = [
@@ -39,7 +48,7 @@ default_periods = [
     {"name": "2교시", "time": "09:55 ~ 10:40"},
     {"name": "3교시", "time": "10:50 ~ 11:35"},
     {"name": "4교시", "time": "11:45 ~ 12:30"},
-    {"name": "점심시간", "time": "12:30 ~ 13:30"},
+    {"name": LUNCH_NAME, "time": "12:30 ~ 13:30"},
     {"name": "5교시", "time": "13:30 ~ 14:15"},
     {"name": "6교시", "time": "14:25 ~ 15:10"},
 ]
@@ -49,6 +58,7 @@ if "periods" not in st.session_state:
     st.session_state["periods"] = default_periods.copy()
 
 # 시간표 수정 탭 (추가/삭제)
+profiler.section("period_editor")
 with st.expander("⏰ 시간표 수정/교시 추가/삭제"):
     periods = st.session_state["periods"]
     # 삭제 시 st.experimental_rerun() 사용하지 않도록 변경.
@@ -74,133 +84,244 @@ with st.expander("⏰ 시간표 수정/교시 추가/삭제"):
         periods.append({"name": f"{len(periods)+1}교시", "time": "시간 입력"})
     st.session_state["periods"] = periods
 
-# 준비물 기본값 함수 정의
-def get_default_supplies(subject):
-    # '특수' 과목은 필기도구로 매핑
-    if "특수" in subject:
-        return ["필기도구"]
-    if subject == "체육":
-        return ["체육복", "운동화"]
-    return ["교과서", "필기도구"]
+    # 편집 내용이 바뀔 때만 다시 해석/검증 (같은 내용이면 캐시된 시간표 사용)
+    for error in build_schedule(periods).errors:
+        st.warning(error)
+
+# 시간표 일괄 가져오기/내보내기 (가져온 날짜의 위젯 값은 저장소에서 다시 채움)
+bulk_panel(
+    "timetable",
+    reset_prefixes=("subject_", "place_", "supplies_", "move_done_", "ready_", "done_", "sign_", "lunch_"),
+)
 
 # 한글 요일
 weekday_labels = ["월", "화", "수", "목", "금", "토", "일"]
 
 # 날짜 선택(달력)
+profiler.section("header")
 st.title("오늘의 시간표")
-selected_date = st.date_input("날짜를 선택하세요", datetime.now())
+selected_date = st.date_input("날짜를 선택하세요", "today", key="selected_date")
 year, month, day = selected_date.year, selected_date.month, selected_date.day
 weekday = selected_date.weekday()  # 0=월, 6=일
 
+# 최근에 본 날짜의 위젯 키만 세션에 남기고 오래된 날짜는 정리 (값은 저장소에 있음)
+manage_date_state(selected_date)
+
 # 선택한 날짜 정보만 표시
 st.markdown(f"#### {month}월 {day}일 {weekday_labels[weekday]}요일")
 
-# 진행도 표시 (항상 상단 고정) — total이 0일 때 보호 추가
-def fixed_progress(progress, total):
-    if total <= 0:
-        return
-    st.markdown(
-        f"""
-        <div style="position:fixed;top:10px;right:10px;z-index:9999;background:rgba(255,255,255,0.9);padding:8px 16px;border-radius:20px;border:1px solid #eee;box-shadow:0 2px 8px #0001;">
-            🏃‍♂️ <b>진행도</b> {progress}/{total}
-            <div style="width:120px;height:8px;background:#eee;border-radius:4px;overflow:hidden;margin-top:4px;">
-                <div style="width:{int(progress/total*100)}%;height:100%;background:#4CAF50;"></div>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True
-    )
+# 저장소: 선택한 날짜의 기록만 한 번에 읽어 옴 (세션에 없는 값만 채움)
+student = current_student()
+storage = get_storage()
+signature_store = get_signature_store()
+
+# 주간/월간 보기: 기간 기록을 한 번에 읽어 표/달력 하나로 그리고, 하루 입력 화면은 건너뜀
+view_mode = st.radio("보기", ["하루", "주간", "월간"], horizontal=True, key="view_mode")
+if view_mode != "하루":
+    profiler.section("range_view")
+    if view_mode == "주간":
+        week = range_views.week_dates(selected_date, range_views.WEEKDAYS)
+        rows = storage.load_period_range(week[0], week[-1], student=student)
+        st.markdown(f"### {range_views.day_label(week[0])} ~ {range_views.day_label(week[-1])}")
+        st.markdown(
+            week_grid_html(
+                tuple(range_views.day_label(d) for d in week),
+                range_views.period_week_grid(
+                    rows, st.session_state["periods"], week, storage.load_template(student, templates.TIMETABLE)
+                ),
+            ),
+            unsafe_allow_html=True,
+        )
+    else:
+        month_from, month_to = range_views.month_bounds(year, month)
+        rows = storage.load_period_range(month_from, month_to, student=student)
+        completion = range_views.daily_completion(rows, build_schedule(st.session_state["periods"]).lesson_count)
+        st.markdown(f"### {year}년 {month}월 수업 준비 완료율")
+        st.markdown(month_heatmap_html(range_views.month_heatmap_weeks(year, month, completion)), unsafe_allow_html=True)
+    profiler.finish()
+    st.stop()
+# 요일 기본 시간표 위에 이 날짜에서 바꾼 값만 얹어 하루 기록을 만듦
+timetable_template = storage.load_template(student, templates.TIMETABLE) or {}
+weekday_template = templates.day_template(timetable_template, weekday)
+stored_overrides = storage.load_day(student, selected_date)
+stored_periods = templates.resolve_periods(weekday_template, stored_overrides)
+stored_entries = storage.load_entries(student, selected_date)
+
+# 다른 서버 프로세스/탭에서 이 날짜가 저장됐거나 학생이 바뀌었으면 세션의 날짜 키를 지우고 저장소 값으로 다시 채움
+sync_date(
+    "timetable", selected_date,
+    fingerprint(student, weekday_template, stored_overrides, stored_entries.get("comment", "")),
+)
+
+def seed_state(key, value):
+    if key not in st.session_state:
+        st.session_state[key] = value
 
 # 세션 상태 초기화
 if "timetable" not in st.session_state:
     st.session_state["timetable"] = {}
 
 periods = st.session_state["periods"]
-progress_steps = len([p for p in periods if p["name"] != "점심시간"])
-progress = 0
+schedule = build_schedule(periods)
+progress_steps = schedule.lesson_count
+
+# 집중 모드: 지금(또는 다음) 교시와 직접 펼친 교시만 위젯/캔버스를 만들고,
+# 나머지 교시는 저장된 기록으로 읽기 전용 한 줄만 표시.
+# 오늘이 아니거나 남은 교시가 없으면 모든 교시를 한 줄로 보여 주고, 필요한 교시만 펼쳐서 편집
+focus_mode = st.toggle("⏱ 현재 교시만 펼치기", value=True, key="focus_mode")
+active_periods = schedule.active_indexes(selected_date, datetime.now())
+
+# 교시별 최종 기록 (진행도/요약 표는 위젯 키 대신 이 기록을 읽음)
+day_records = {}
+# 교시/점심 조각(fragment)만 다시 실행될 때는 진행도와 요약 표도 조각 안에서 다시 그림.
+# 전체 실행 중에는 모든 교시를 그린 뒤 한 번만 그림
+rendering_page = True
+progress_slot = None
+summary_slot = None
+
+def save_period(idx, record):
+    """교시 기록이 저장된 값과 다르면 기본 시간표와 다른 값만 바로 저장"""
+    if record == stored_periods.get(idx, {}):
+        return
+    # 기본 시간표와 같은 과목/장소/준비물은 빼고 바뀐 값만 저장 (아무것도 안 한 날짜는 행을 만들지 않음)
+    override = templates.sparse_record(weekday_template.get(idx, {}), record)
+    if idx in stored_overrides or not templates.is_blank_override(override):
+        if stored_overrides:
+            storage.save_periods(student, selected_date, {idx: override})
+            stored_overrides[idx] = override
+            stored_periods[idx] = record
+            return
+        # 이 날짜에 처음 저장할 때는 나머지 교시도 함께 저장해 하루 교시 수가 저장소에 남도록 함
+        day = templates.day_overrides([p["name"] for p in periods], weekday_template, {**day_records, idx: record})
+        storage.save_periods(student, selected_date, day)
+        stored_overrides.update(day)
+        stored_periods.update(templates.resolve_periods(weekday_template, day))
 
-# 시간표 입력
-for idx, period in enumerate(periods):
-    st.markdown(f"### {period['name']} ({period['time']})")
+# 진행도 표시 (항상 상단 고정) — total이 0일 때 보호 추가
+def render_progress():
+    if progress_steps <= 0:
+        return
+    progress = sum(1 for record in day_records.values() if record.get("done"))
+    progress_slot.markdown(progress_badge_html(progress, progress_steps), unsafe_allow_html=True)
+
+def render_summary():
+    # 요약 표는 교시 기록으로 한 번에 만들어 요소 하나로 표시 (점심시간 제외)
+    summary_rows = []
+    for idx, period in enumerate(periods):
+        if schedule[idx].is_lunch:
+            continue
+        # 교시 조각에서 확정한 기록 읽기 (접힌 교시는 저장된 기록)
+        record = day_records.get(idx, {})
+        summary_rows.append((
+            f"{period['name']} [{record.get('subject', '')}]",
+            bool(record.get("move_done", False)),
+            bool(record.get("ready", False)),
+            # 선생님 확인은 "이미지 존재 AND 잠금 버튼이 눌린 경우"에만 활성화
+            bool(record.get("sign_locked", False) and record.get("sign") is not None),
+        ))
+    summary_slot.markdown(summary_table_html(tuple(summary_rows)), unsafe_allow_html=True)
+
+def mark_day_synced():
+    comment = st.session_state.get(f"comment_{selected_date}", stored_entries.get("comment", ""))
+    mark_synced("timetable", selected_date, fingerprint(student, weekday_template, stored_overrides, comment))
+
+def period_done(idx, record):
+    """조각 하나가 끝날 때: 기록을 저장하고, 조각만 다시 실행된 경우 진행도/요약 표 갱신"""
+    day_records[idx] = record
+    save_period(idx, record)
+    # 점선 구분선
+    st.markdown('<hr style="border-top: 2px dashed #bbb;">', unsafe_allow_html=True)
+    if not rendering_page:
+        render_progress()
+        render_summary()
+        mark_day_synced()
+
+@st.fragment
+def lunch_block(idx, period):
+    """점심시간 처리 (교사싸인 없음). 체크하면 이 블록과 진행도/요약만 다시 실행"""
+    stored = stored_periods.get(idx, {})
     col1, col2, col3, col4, col5 = st.columns([2,2,2,2,2])
 
-    # 점심시간 처리 (교사싸인 없음)
-    if period["name"] == "점심시간":
-        # 안정적인 키 사용
-        lunch_eat_key = f"lunch_eat_{selected_date}_{idx}"
-        lunch_brush_key = f"lunch_brush_{selected_date}_{idx}"
-        lunch_done_key = f"lunch_done_{selected_date}_{idx}"
+    # 안정적인 키 사용
+    lunch_eat_key = f"lunch_eat_{selected_date}_{idx}"
+    lunch_brush_key = f"lunch_brush_{selected_date}_{idx}"
+    lunch_done_key = f"lunch_done_{selected_date}_{idx}"
+    seed_state(lunch_eat_key, stored.get("eat", False))
+    seed_state(lunch_brush_key, stored.get("brush", False))
 
-        # 식사, 양치 체크박스 생성 (세션이 자동으로 관리)
-        with col1:
-            st.checkbox("🍱 식사", key=lunch_eat_key)
-        with col2:
-            st.checkbox("🪥 양치", key=lunch_brush_key)
+    # 식사, 양치 체크박스 생성 (세션이 자동으로 관리)
+    with col1:
+        st.checkbox("🍱 식사", key=lunch_eat_key)
+    with col2:
+        st.checkbox("🪥 양치", key=lunch_brush_key)
 
-        # 현재 상태 읽기
-        eat_val = st.session_state.get(lunch_eat_key, False)
-        brush_val = st.session_state.get(lunch_brush_key, False)
+    # 현재 상태 읽기
+    eat_val = st.session_state.get(lunch_eat_key, False)
+    brush_val = st.session_state.get(lunch_brush_key, False)
 
-        # 둘 다 체크되어 있을 때만 자동으로 점심 완료가 활성화되도록 함
-        lunch_done_val = bool(eat_val and brush_val)
+    # 둘 다 체크되어 있을 때만 자동으로 점심 완료가 활성화되도록 함
+    lunch_done_val = bool(eat_val and brush_val)
 
-        # 세션값을 위젯 생성 전에 설정(자동 반영, 사용자가 직접 조작 불가)
-        st.session_state[lunch_done_key] = lunch_done_val
+    # 세션값을 위젯 생성 전에 설정(자동 반영, 사용자가 직접 조작 불가)
+    st.session_state[lunch_done_key] = lunch_done_val
 
-        # 완료 표시: 활성화이면 초록색 체크 텍스트, 아니면 회색 대시 (가운데 정렬)
-        with col3:
-            if lunch_done_val:
-                st.markdown(
-                    "<div style='display:flex;align-items:center;justify-content:center;height:28px;color:#2e7d32;font-weight:700;'>✅ 점심시간 완료</div>",
-                    unsafe_allow_html=True,
-                )
-            else:
-                st.markdown(
-                    "<div style='display:flex;align-items:center;justify-content:center;height:28px;color:#bbb;font-weight:700;'>— 점심시간 완료</div>",
-                    unsafe_allow_html=True,
-                )
-
-        # 완료 여부로 진행도 계산
-        if st.session_state.get(lunch_done_key, False):
-            progress += 1
+    # 완료 표시: 활성화이면 초록색 체크 텍스트, 아니면 회색 대시 (가운데 정렬)
+    with col3:
+        st.markdown(lunch_done_html(lunch_done_val), unsafe_allow_html=True)
+
+    period_done(idx, {"name": period["name"], "eat": bool(eat_val), "brush": bool(brush_val), "done": lunch_done_val})
+
+@st.fragment
+def period_block(idx, period):
+    """교시 하나. 체크박스/잠금 버튼을 누르면 이 교시와 진행도/요약만 다시 실행"""
+    stored = stored_periods.get(idx, {})
+
+    if focus_mode and idx not in active_periods:
+        if not st.checkbox("✏️ 펼쳐서 편집", key=f"expand_{idx}_{selected_date}"):
+            sign_digest = stored.get("sign")
+            signed = bool(stored.get("sign_locked") and sign_digest)
+            st.markdown(
+                period_row_html(
+                    stored.get("subject", ""),
+                    stored.get("place", ""),
+                    tuple(stored.get("supplies", ())),
+                    bool(stored.get("move_done")),
+                    bool(stored.get("ready")),
+                    signed,
+                    signature_store.data_uri(sign_digest) if signed else None,
+                ),
+                unsafe_allow_html=True,
+            )
+            period_done(idx, stored)
+            return
 
-        # 점선 구분선
-        st.markdown('<hr style="border-top: 2px dashed #bbb;">', unsafe_allow_html=True)
-        continue
+    col1, col2, col3, col4, col5 = st.columns([2,2,2,2,2])
 
     subject_key = f"subject_{idx}_{selected_date}"
     done_key = f"done_{idx}_{selected_date}"
     supplies_key = f"supplies_{idx}_{selected_date}"
     ready_key = f"ready_{idx}_{selected_date}"
     move_done_key = f"move_done_{idx}_{selected_date}"
+    place_key = f"place_{idx}_{selected_date}"
+    prev_subj_key = f"subject_prev_{idx}_{selected_date}"
+
+    # 저장된 기록 복원: 과목을 복원할 때는 장소/준비물이 기본값으로 덮이지 않도록 이전 과목도 함께 맞춤
+    if stored:
+        if subject_key not in st.session_state and stored.get("subject") in subjects:
+            st.session_state[subject_key] = stored["subject"]
+            st.session_state[prev_subj_key] = stored["subject"]
+            st.session_state.setdefault("supplies_state", {})[subject_key] = stored["subject"]
+        seed_state(place_key, stored.get("place", ""))
+        seed_state(supplies_key, ", ".join(stored.get("supplies", [])))
+        seed_state(move_done_key, stored.get("move_done", False))
+        seed_state(ready_key, stored.get("ready", False))
 
     with col1:
         subject = st.selectbox("과목 선택", subjects, key=subject_key)
     with col2:
-        # 과목에 따라 자동으로 장소를 채움 (요구사항 반영)
-        def get_default_place_for_subject(subj):
-            # 국어, 영어, 수학, 사회, 진로, 역사 -> 2-5
-            if subj in ["국어", "영어", "수학", "사회", "진로", "역사"]:
-                return "2-5"
-            # '특수'가 들어가면 모두 특수학급
-            if "특수" in subj:
-                return "특수학급"
-            # 기타 매핑
-            if subj == "정보":
-                return "컴퓨터실"
-            if subj == "체육":
-                return "운동장, 체육관"
-            if subj == "미술":
-                return "미술실"
-            if subj == "음악":
-                return "음악실"
-            if subj == "과학":
-                return "과학실"
-            return ""
-
-        auto_place = get_default_place_for_subject(subject)
-        place_key = f"place_{idx}_{selected_date}"
-        prev_subj_key = f"subject_prev_{idx}_{selected_date}"
+        # 과목에 따라 자동으로 장소를 채움 (과목 등록부 조회 한 번)
+        subject_info = subject_registry.get(subject)
+        auto_place = subject_info.place
 
         # 이전 과목을 기록해 두어 과목 변경 시 장소를 자동 갱신하도록 함
         if prev_subj_key not in st.session_state:
@@ -230,7 +351,7 @@ for idx, period in enumerate(periods):
     if "supplies_state" not in st.session_state:
         st.session_state["supplies_state"] = {}
     prev_subject = st.session_state["supplies_state"].get(subject_key, "")
-    default_supplies = get_default_supplies(subject)
+    default_supplies = subject_info.supplies
     if prev_subject != subject:
         st.session_state[supplies_key] = ", ".join(default_supplies)
         st.session_state["supplies_state"][subject_key] = subject
@@ -263,8 +384,6 @@ for idx, period in enumerate(periods):
             else:
                 label_html = "<div style='display:flex;align-items:center;height:28px;color:#444;'>수업 준비 완료</div>"
             st.markdown(label_html, unsafe_allow_html=True)
-        if st.session_state.get(done_key, False):
-            progress += 1
     with col5:
         st.markdown("교사 확인")
 
@@ -273,34 +392,31 @@ for idx, period in enumerate(periods):
         sign_img_key = f"sign_img_{idx}_{date_key}"
         sign_locked_key = f"sign_locked_{idx}_{date_key}"
         canvas_key = f"sign_canvas_{idx}_{date_key}"
+        canvas_digest_key = f"sign_canvas_digest_{idx}_{date_key}"
         lock_icon_key = f"lock_icon_{idx}_{date_key}"
         unlock_icon_key = f"unlock_icon_{idx}_{date_key}"
 
         if sign_locked_key not in st.session_state:
-            st.session_state[sign_locked_key] = False
+            st.session_state[sign_locked_key] = stored.get("sign_locked", False)
+        # 세션에는 서명 이미지 대신 서명 저장소의 해시만 보관
         if sign_img_key not in st.session_state:
-            st.session_state[sign_img_key] = None
+            st.session_state[sign_img_key] = stored.get("sign")
 
-        saved_img = st.session_state.get(sign_img_key)
+        saved_sign = st.session_state.get(sign_img_key)
 
         # 잠금 상태: 이미지 박스(편집 불가) — 하나의 칸만 표시
         if st.session_state.get(sign_locked_key, False):
-            if saved_img is not None:
-                try:
-                    from io import BytesIO
-                    buf = BytesIO()
-                    saved_img.convert("RGBA").save(buf, format="PNG")
-                    b64 = base64.b64encode(buf.getvalue()).decode()
-                    st.markdown(
-                        f"""
-                        <div style="width:200px;height:120px;border:1px solid #ddd;background:#fff;display:flex;align-items:center;justify-content:center;box-sizing:border-box;overflow:hidden;">
-                            <img src="data:image/png;base64,{b64}" style="width:100%;height:100%;object-fit:contain;display:block;"/>
-                        </div>
-                        """,
-                        unsafe_allow_html=True,
-                    )
-                except Exception:
-                    st.image(saved_img, width=200)
+            # data URI 는 서명 저장소의 LRU 캐시에서 가져오므로 rerun 마다 다시 인코딩하지 않음
+            sign_uri = signature_store.data_uri(saved_sign) if saved_sign is not None else None
+            if sign_uri is not None:
+                st.markdown(
+                    f"""
+                    <div style="width:200px;height:120px;border:1px solid #ddd;background:#fff;display:flex;align-items:center;justify-content:center;box-sizing:border-box;overflow:hidden;">
+                        <img src="{sign_uri}" style="max-width:100%;max-height:100%;object-fit:contain;display:block;"/>
+                    </div>
+                    """,
+                    unsafe_allow_html=True,
+                )
             else:
                 st.markdown("<div style='width:200px;height:120px;border:1px dashed #ccc;display:flex;align-items:center;justify-content:center;color:#999;'>저장된 서명이 없습니다.</div>", unsafe_allow_html=True)
 
@@ -308,6 +424,10 @@ for idx, period in enumerate(periods):
                 st.session_state[sign_locked_key] = False
         else:
             # 편집 가능 상태: 캔버스 하나만 노출 (200x120)
+            # 획은 브라우저에 모아 두었다가 캔버스의 보내기 버튼을 누를 때 한 번만 보냄 (획마다 rerun 하지 않음)
+            # 캔버스 컴포넌트는 numpy/PIL 까지 불러오므로 잠금 해제된 교시를 처음 그릴 때만 불러옴
+            from streamlit_drawable_canvas import st_canvas
+
             canvas_result = st_canvas(
                 key=canvas_key,
                 height=120,
@@ -317,27 +437,19 @@ for idx, period in enumerate(periods):
                 drawing_mode="freedraw",
                 stroke_width=2,
                 stroke_color="#222",
-                update_streamlit=True,
+                update_streamlit=False,
             )
 
-            # 캔버스 결과를 안전하게 PIL로 변환해 저장
-            if canvas_result is not None and getattr(canvas_result, "image_data", None) is not None:
-                try:
-                    arr = np.array(canvas_result.image_data)
-                    if arr.dtype.kind == "f":
-                        if arr.max() <= 1.01:
-                            arr = (arr * 255).astype(np.uint8)
-                        else:
-                            arr = arr.astype(np.uint8)
-                    else:
-                        arr = arr.astype(np.uint8)
-                    if arr.ndim == 3 and arr.shape[2] == 3:
-                        alpha = np.full((arr.shape[0], arr.shape[1], 1), 255, dtype=np.uint8)
-                        arr = np.concatenate([arr, alpha], axis=2)
-                    pil_img = Image.fromarray(arr).convert("RGBA")
-                    st.session_state[sign_img_key] = pil_img
-                except Exception:
-                    st.error("서명 이미지 변환에 실패했습니다.")
+            # 보낸 획 좌표를 서명 원본으로 저장 (이미지로 바꾸지 않음, 같은 획이면 같은 해시)
+            # 아무것도 보내지 않았으면 None, 지우고 보냈으면 서명 없음.
+            # 직전 rerun 과 같은 json_data 면 다시 압축/해시/저장하지 않음
+            json_data = getattr(canvas_result, "json_data", None)
+            if json_data is not None:
+                digest, changed, strokes = changed_strokes(json_data, st.session_state.get(canvas_digest_key))
+                if changed:
+                    st.session_state[canvas_digest_key] = digest
+                    st.session_state[sign_img_key] = signature_store.put_strokes(strokes) if strokes is not None else None
+            st.caption("서명 후 캔버스 아래 보내기 버튼을 누르고 잠그세요.")
 
             # 잠금 버튼: 서명이 존재할 때만 잠금 가능
             if st.button("🔒 잠금", key=lock_icon_key):
@@ -355,18 +467,61 @@ for idx, period in enumerate(periods):
             "move_done": st.session_state.get(move_done_key, False),
             # sign info kept in separate sign_img_key / sign_locked_key
         }
-    # 점선 구분선
-    st.markdown('<hr style="border-top: 2px dashed #bbb;">', unsafe_allow_html=True)
+    period_done(idx, {
+        "name": period["name"],
+        "subject": subject,
+        "place": place,
+        "supplies": supplies_list,
+        "move_done": bool(st.session_state.get(move_done_key, False)),
+        "ready": bool(ready),
+        "done": bool(done),
+        "sign_locked": bool(st.session_state.get(sign_locked_key, False)),
+        "sign": st.session_state.get(sign_img_key),
+    })
+
+# 시간표 입력: 교시마다 조각 하나 (바뀐 교시 기록은 조각 안에서 바로 저장)
+profiler.section("periods")
+for idx, period in enumerate(periods):
+    st.markdown(f"### {period['name']} ({period['time']})")
+    if schedule[idx].is_lunch:
+        lunch_block(idx, period)
+    else:
+        period_block(idx, period)
+
+# 오늘 과목/장소/준비물을 이 요일의 기본 시간표로 저장하고, 오늘 기록은 기본값과 다른 값만 남김
+if st.button(f"📌 {weekday_labels[weekday]}요일 기본 시간표로 저장", key="save_timetable_template"):
+    new_weekday_template = {
+        idx: templates.template_fields(record)
+        for idx, record in day_records.items()
+        if not schedule[idx].is_lunch and record.get("subject")
+    }
+    storage.save_template(
+        student, templates.TIMETABLE, templates.with_day(timetable_template, weekday, new_weekday_template)
+    )
+    compacted = {
+        idx: templates.sparse_record(new_weekday_template.get(idx, {}), record) for idx, record in day_records.items()
+    }
+    storage.save_periods(student, selected_date, compacted)
+    weekday_template = new_weekday_template
+    stored_overrides.update(compacted)
+    st.success(f"{weekday_labels[weekday]}요일 기본 시간표를 저장했습니다. 다른 {weekday_labels[weekday]}요일에도 적용됩니다.")
 
 # 진행도(상단 고정)
-fixed_progress(progress, progress_steps)
+progress_slot = st.empty()
+render_progress()
 
 # 오늘 하루 코멘트
+profiler.section("comment")
 st.markdown("### 오늘 하루는 어땠나요?")
+seed_state(f"comment_{selected_date}", stored_entries.get("comment", ""))
 comment = st.text_area("", key=f"comment_{selected_date}")
 st.session_state["timetable"][f"{selected_date}_comment"] = comment
+if comment != stored_entries.get("comment", ""):
+    storage.save_entries(student, selected_date, {"comment": comment})
+    stored_entries["comment"] = comment
+mark_day_synced()
 
-# (시간표 루프가 끝난 직후, fixed_progress 호출 전에 아래 코드를 추가)
+profiler.section("summary")
 st.markdown("### 오늘 하루 요약")
 st.caption("오늘 학교 생활을 요약합니다(장소 이동/준비물/선생님 확인)")
 
@@ -374,56 +529,8 @@ st.caption("오늘 학교 생활을 요약합니다(장소 이동/준비물/선
 selected_day_str = f"{selected_date.year}년 {selected_date.month}월 {selected_date.day}일({weekday_labels[selected_date.weekday()]})"
 st.markdown(f"**{selected_day_str}**")
 
-date_key_iso = selected_date.isoformat() if hasattr(selected_date, "isoformat") else str(selected_date)
-
-# 헤더 (칸 너비를 같게)
-h1, h2, h3, h4 = st.columns([1,1,1,1])
-with h1:
-    st.markdown("**교시[교과]**")
-with h2:
-    st.markdown("**이동**")
-with h3:
-    st.markdown("**준비물**")
-with h4:
-    st.markdown("**선생님확인**")
+summary_slot = st.empty()
+render_summary()
+rendering_page = False
 
-# 각 교시 요약 행 생성 (점심시간 제외)
-for idx, period in enumerate(periods):
-    if period["name"] == "점심시간":
-        continue
-
-    # 원본 키들 (메인 루프와 동일한 키 형식 사용)
-    subj_key = f"subject_{idx}_{selected_date}"
-    move_done_key = f"move_done_{idx}_{selected_date}"
-    ready_key = f"ready_{idx}_{selected_date}"
-    sign_img_key = f"sign_img_{idx}_{date_key_iso}"
-    sign_locked_key = f"sign_locked_{idx}_{date_key_iso}"
-
-    # 원본 상태 읽기 (요약은 오로지 원본 상태만 반영)
-    subj_val = st.session_state.get(subj_key, "")
-    move_val = bool(st.session_state.get(move_done_key, False))
-    ready_val = bool(st.session_state.get(ready_key, False))
-    # 선생님 확인은 "이미지 존재 AND 잠금 버튼이 눌린 경우"에만 활성화되도록 변경
-    sign_val = bool(st.session_state.get(sign_locked_key, False) and st.session_state.get(sign_img_key) is not None)
-
-    c1, c2, c3, c4 = st.columns([1,1,1,1])
-    with c1:
-        # "1교시[국어]" 형식으로 표시
-        st.markdown(f"{period['name']} [{subj_val}]")
-    # 체크 표시들은 모두 가운데 정렬로 표시
-    with c2:
-        if move_val:
-            st.markdown("<div style='display:flex;align-items:center;justify-content:center;height:24px;color:#2e7d32;font-weight:700;'>✔</div>", unsafe_allow_html=True)
-        else:
-            st.markdown("<div style='display:flex;align-items:center;justify-content:center;height:24px;color:#bbb;font-weight:700;'>—</div>", unsafe_allow_html=True)
-    with c3:
-        if ready_val:
-            st.markdown("<div style='display:flex;align-items:center;justify-content:center;height:24px;color:#2e7d32;font-weight:700;'>✔</div>", unsafe_allow_html=True)
-        else:
-            st.markdown("<div style='display:flex;align-items:center;justify-content:center;height:24px;color:#bbb;font-weight:700;'>—</div>", unsafe_allow_html=True)
-    with c4:
-        # 선생님 확인도 가운데 정렬된 초록 체크로 표시 (읽기 전용: 조작 불가)
-        if sign_val:
-            st.markdown("<div style='display:flex;align-items:center;justify-content:center;height:24px;color:#2e7d32;font-weight:700;'>✔</div>", unsafe_allow_html=True)
-        else:
-            st.markdown("<div style='display:flex;align-items:center;justify-content:center;height:24px;color:#bbb;font-weight:700;'>—</div>", unsafe_allow_html=True)
\ No newline at end of file
+profiler.finish()
@@ -0,0 +1,2 @@
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: 새 프로세스를 띄우는 느린 검사 (-m 'not slow' 로 건너뜀)")
@@ -0,0 +1,48 @@
+import io
+
+from timetable import bulk_io
+from timetable.schedule import LUNCH_NAME
+from timetable.storage import MemoryStorage
+
+DAY = "2025-03-03"
+
+
+def _seed(storage):
+    storage.save_periods("민수", DAY, {
+        0: {"name": "1교시", "subject": "국어", "place": "교실", "supplies": ["교과서"],
+            "move_done": True, "ready": True, "done": True, "sign_locked": True, "sign": "ab" * 32},
+        1: {"name": LUNCH_NAME, "eat": True, "brush": True, "done": True},
+    })
+    storage.save_student("민수", "1반")
+
+
+def test_export_import_round_trip_keeps_signature_and_lunch_checks():
+    storage = MemoryStorage()
+    _seed(storage)
+    before = storage.load_day("민수", DAY)
+
+    for fmt in ("csv", "parquet"):
+        out = io.BytesIO()
+        assert bulk_io.export_timetable(storage, out, fmt) == 2
+        result = bulk_io.import_timetable(storage, io.BytesIO(out.getvalue()), fmt)
+
+        assert result == {"rows": 2, "skipped": 0, "errors": []}
+        after = storage.load_day("민수", DAY)
+        assert after[0]["sign"] == before[0]["sign"] and after[0]["sign_locked"] is True
+        assert after[1]["eat"] is True and after[1]["brush"] is True
+        assert after[0]["subject"] == "국어" and after[0]["supplies"] == ["교과서"]
+
+
+def test_import_overwrites_only_columns_in_file():
+    storage = MemoryStorage()
+    _seed(storage)
+    data = "student,date,period,place,ready\n민수,2025-03-03,0,과학실,0\n민수,2025-03-03,2,운동장,1\n"
+
+    result = bulk_io.import_timetable(storage, io.StringIO(data), "csv")
+
+    day = storage.load_day("민수", DAY)
+    assert result["rows"] == 2
+    assert day[0] == {"name": "1교시", "subject": "국어", "place": "과학실", "supplies": ["교과서"],
+                      "move_done": True, "ready": False, "done": True, "sign_locked": True, "sign": "ab" * 32}
+    assert day[1]["eat"] is True
+    assert day[2] == {"place": "운동장", "ready": True}
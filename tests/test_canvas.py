@@ -0,0 +1,53 @@
+from timetable.canvas import changed_strokes, strokes_from_json, strokes_svg
+
+
+def _fabric(*paths):
+    return {"version": "4.4.0", "objects": [
+        {"type": "path", "stroke": "#222", "strokeWidth": 2, "path": path} for path in paths
+    ]}
+
+
+def test_changed_strokes_skips_unchanged_canvas():
+    data = _fabric([["M", 1.04, 2.0], ["L", 5.0, 6.0]])
+    digest, changed, strokes = changed_strokes(data)
+    assert changed and strokes == strokes_from_json(data)
+
+    # 같은 획을 새로 받은 dict (rerun 마다 컴포넌트가 새로 만듦)
+    again = _fabric([["M", 1.04, 2.0], ["L", 5.0, 6.0]])
+    assert changed_strokes(again, digest) == (digest, False, None)
+
+    moved = _fabric([["M", 1.04, 2.0], ["L", 5.0, 6.5]])
+    digest2, changed, strokes = changed_strokes(moved, digest)
+    assert changed and digest2 != digest and strokes["strokes"][0]["path"][-1] == ["L", 5.0, 6.5]
+
+
+def test_changed_strokes_reports_cleared_canvas():
+    digest, _, _ = changed_strokes(_fabric([["M", 1, 2], ["L", 3, 4]]))
+    cleared = {"version": "4.4.0", "objects": []}
+    _, changed, strokes = changed_strokes(cleared, digest)
+    assert changed and strokes is None
+
+
+def test_strokes_from_json_drops_unknown_commands_and_bad_coordinates():
+    data = _fabric(
+        [["M", "1.04", 2], ["L", 5, None], ["X", 1, 2], ["Q", 1, 2, 3], ["L", float("nan"), 1], ["L", 5.06, 6]],
+        [["M", "a", 1], ['"/><script>', 1, 2]],
+    )
+
+    strokes = strokes_from_json(data)
+
+    assert strokes == {"strokes": [{"color": "#222", "width": 2, "path": [["M", 1.0, 2.0], ["L", 5.1, 6.0]]}]}
+    assert strokes_from_json(_fabric([["Z"], ["bad"]])) is None
+
+
+def test_strokes_svg_emits_only_known_commands():
+    stored = {"strokes": [
+        {"color": "#222", "width": 2, "path": [["M", 1, 2], ["L", '3"/><script>', 4], ["L", 5, 6], ["Z"]]},
+        {"color": "#222", "width": "x", "path": [["onload", 1, 2]]},
+    ]}
+
+    svg = strokes_svg(stored)
+
+    assert 'd="M 1.0 2.0 L 5.0 6.0 Z"' in svg
+    assert "script" not in svg and "onload" not in svg
+    assert svg.count("<path") == 1
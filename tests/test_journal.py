@@ -0,0 +1,64 @@
+import random
+
+import pytest
+
+from timetable.journal import ENTRY, PERIOD, Journal, JournaledStorage
+from timetable.storage import MemoryStorage
+
+DAY = "2025-03-03"
+
+
+@pytest.fixture
+def storage(tmp_path):
+    storage = JournaledStorage(MemoryStorage(), Journal(str(tmp_path / "journal.db"), snapshot_every=3), lambda: "교사")
+    yield storage
+    storage.close()
+
+
+def test_replay_across_snapshots_matches_stored_day(storage):
+    rng = random.Random(1)
+    for i in range(40):
+        period = rng.randrange(7)
+        storage.save_periods("민수", DAY, {period: {"name": f"{period + 1}교시", "done": rng.random() < 0.5, "n": i}})
+        if i % 5 == 0:
+            storage.save_entries("민수", DAY, {"comment": f"코멘트 {i}"})
+
+    records, entries = storage.journal.restore_day("민수", DAY)
+
+    assert records == storage.inner.load_day("민수", DAY)
+    assert entries == storage.inner.load_entries("민수", DAY)
+    journal = storage.journal
+    with journal._db_lock:
+        (snapshot_seq,) = journal._conn.execute(
+            "SELECT seq FROM snapshots WHERE student = ? AND date = ?", ("민수", DAY)
+        ).fetchone()
+        (last_seq,) = journal._conn.execute("SELECT MAX(seq) FROM events").fetchone()
+    # 스냅샷 뒤에는 snapshot_every 개 미만의 이벤트만 남음
+    assert 0 <= last_seq - snapshot_seq < journal.snapshot_every
+
+
+def test_recover_into_rewrites_lost_day(storage):
+    storage.save_periods("민수", DAY, {0: {"name": "1교시", "done": True}, 1: {"name": "2교시"}})
+    storage.save_entries("민수", DAY, {"comment": "좋았어요"})
+
+    fresh = MemoryStorage()
+    assert storage.journal.recover_into(fresh, "민수", DAY) == 3
+    assert fresh.load_day("민수", DAY) == storage.inner.load_day("민수", DAY)
+    assert fresh.load_entries("민수", DAY) == {"comment": "좋았어요"}
+
+
+def test_history_and_signature_unlocks(storage):
+    sign = {"name": "1교시", "sign": "ab" * 32}
+    storage.save_periods("민수", DAY, {0: {**sign, "sign_locked": True}})
+    storage.save_periods("민수", DAY, {0: {**sign, "sign_locked": False}})
+    storage.save_periods("민수", DAY, {0: {**sign, "sign_locked": False}})
+    storage.save_period_rows([("영희", DAY, 0, {**sign, "sign_locked": False})])
+
+    history = storage.journal.history("민수", DAY, kind=PERIOD, key=0)
+    assert [event["value"]["sign_locked"] for event in history] == [True, False, False]
+    assert {event["actor"] for event in history} == {"교사"}
+    assert storage.journal.history("민수", DAY, kind=ENTRY) == []
+
+    unlocks = storage.journal.signature_unlocks(DAY, DAY)
+    assert [(date, student, period, actor) for date, student, period, _, actor in unlocks] == [(DAY, "민수", 0, "교사")]
+    assert storage.journal.signature_unlocks(DAY, DAY, students=["영희"]) == []
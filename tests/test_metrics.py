@@ -0,0 +1,83 @@
+import random
+from datetime import date, timedelta
+
+from timetable.metrics import WINDOWS, MetricsStorage, MetricsStore, rolling_series, window_rates
+from timetable.schedule import LUNCH_NAME
+from timetable.storage import MemoryStorage
+from timetable.templates import TIMETABLE
+
+START = date(2025, 3, 3)  # 월요일
+
+
+def _lesson(done, **extra):
+    return {"name": "1교시", "move_done": done, "ready": done, "done": done, **extra}
+
+
+def _day(offset):
+    return (START + timedelta(days=offset)).isoformat()
+
+
+def test_streak_counts_lesson_days_across_gaps():
+    storage = MetricsStorage(MemoryStorage(), MetricsStore(":memory:"))
+    storage.save_periods("민수", _day(0), {0: _lesson(False)})
+    for offset in (1, 2, 4, 7):  # 3, 5, 6 일은 기록 없음 (수업 없는 날은 끊지 않음)
+        storage.save_periods("민수", _day(offset), {0: _lesson(True)})
+    storage.save_periods("민수", _day(5), {0: {"name": LUNCH_NAME, "eat": True}})  # 점심만 있는 날
+
+    streak = storage.metrics.current_streak
+    assert streak("민수", START + timedelta(days=7)) == 4
+    assert streak("민수", START + timedelta(days=3)) == 2
+    assert streak("민수", START) == 0
+    assert streak("영희", START) == 0
+
+    storage.save_periods("민수", _day(4), {0: _lesson(False)})
+    assert streak("민수", START + timedelta(days=7)) == 1
+
+
+def test_window_rates_and_rolling_series_match_brute_force():
+    rng = random.Random(5)
+    storage = MetricsStorage(MemoryStorage(), MetricsStore(":memory:"))
+    records = {}
+    for offset in range(60):
+        if rng.random() < 0.2:
+            continue
+        day = {p: _lesson(rng.random() < 0.7) for p in range(rng.randint(1, 6))}
+        day[6] = {"name": LUNCH_NAME, "eat": rng.random() < 0.8, "brush": rng.random() < 0.5}
+        storage.save_periods("민수", _day(offset), day)
+        records[_day(offset)] = day
+
+    last = START + timedelta(days=59)
+    days = storage.metrics.load_days(["민수"], START, last)["민수"]
+
+    def expected(end, window):
+        picked = [day for d, day in records.items() if (end - timedelta(days=window - 1)).isoformat() <= d <= end.isoformat()]
+        lessons = [r for day in picked for r in day.values() if r["name"] != LUNCH_NAME]
+        lunches = [r for day in picked for r in day.values() if r["name"] == LUNCH_NAME]
+        return (
+            round(sum(r["done"] for r in lessons) / len(lessons) * 100, 1) if lessons else None,
+            round(sum(r["eat"] for r in lunches) / len(lunches) * 100, 1) if lunches else None,
+        )
+
+    for window in WINDOWS:
+        rates = window_rates(days, last, window)
+        assert (rates["수업준비완료"], rates["점심 먹기"]) == expected(last, window)
+
+    series = {(d, name): value for d, name, value in rolling_series(days, START + timedelta(days=10), last)}
+    for offset in range(10, 60):
+        end = START + timedelta(days=offset)
+        assert (series.get((end, "수업준비완료")), series.get((end, "점심 먹기"))) == expected(end, 7)
+
+
+def test_template_lessons_count_as_unfinished_and_rebuild_matches():
+    inner = MemoryStorage()
+    template = {"0": {str(p): {"name": f"{p + 1}교시", "subject": "국어"} for p in range(6)}}
+    inner.save_template("민수", TIMETABLE, template)
+    storage = MetricsStorage(inner, MetricsStore(":memory:"))
+    storage.save_periods("민수", _day(0), {0: _lesson(True)})
+
+    days = storage.metrics.load_days(["민수"], START, START)["민수"]
+    assert days[0][1]["lessons"] == 6 and days[0][1]["done"] == 1
+
+    rebuilt = MetricsStore(":memory:")
+    rebuilt.rebuild(inner)
+    assert rebuilt.load_days(["민수"], START, START) == storage.metrics.load_days(["민수"], START, START)
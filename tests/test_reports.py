@@ -0,0 +1,19 @@
+from timetable import reports
+from timetable.storage import MemoryStorage
+
+DAY = "2025-03-03"
+
+
+def test_select_students_without_filter_includes_unassigned_class():
+    storage = MemoryStorage()
+    storage.save_student("민수", "2-5")
+    storage.save_student("영희", "3-1")
+    storage.save_student("철수", "")
+    storage.save_periods("철수", DAY, {0: {"name": "1교시", "done": True}})
+
+    targets = reports.select_students(storage)
+
+    assert sorted(targets) == [("민수", "2-5"), ("영희", "3-1"), ("철수", "")]
+    assert reports.select_students(storage, grade=2) == [("민수", "2-5")]
+    found = reports.collect_reports(storage, targets, DAY, DAY)
+    assert [(report["student"], report["class_name"]) for report in found] == [("철수", "")]
@@ -0,0 +1,60 @@
+import random
+from datetime import date, datetime
+
+from timetable.schedule import LUNCH_NAME, build_schedule, parse_time_range
+
+PERIODS = [
+    {"name": "1교시", "time": "09:00 ~ 09:40"},
+    {"name": "2교시", "time": "09:50 ~ 10:30"},
+    {"name": LUNCH_NAME, "time": "12:10 ~ 13:00"},
+    {"name": "3교시", "time": "10:40 ~ 11:20"},
+    {"name": "4교시", "time": "시간 미정"},
+]
+
+
+def test_period_at_and_next_after_match_linear_scan():
+    schedule = build_schedule(PERIODS)
+    timed = [(p.start, p.end, p.index) for p in schedule if p.has_time]
+
+    for minute in range(0, 24 * 60):
+        at = [idx for start, end, idx in timed if start <= minute < end]
+        later = sorted((start, idx) for start, _, idx in timed if start > minute)
+        assert schedule.period_at(minute) == (at[0] if at else None), minute
+        assert schedule.next_after(minute) == (later[0][1] if later else None), minute
+
+
+def test_boundaries_and_active_indexes():
+    schedule = build_schedule(PERIODS)
+    today = date(2025, 3, 3)
+
+    assert schedule.period_at(540) == 0 and schedule.period_at(580) is None  # 끝 시각은 포함하지 않음
+    assert schedule.next_after(580) == 1
+    assert schedule.active_indexes(today, datetime(2025, 3, 3, 9, 45)) == {1}
+    assert schedule.active_indexes(today, datetime(2025, 3, 3, 12, 30)) == {2}
+    assert schedule.active_indexes(today, datetime(2025, 3, 3, 14, 0)) == set()
+    assert schedule.active_indexes(date(2025, 3, 4), datetime(2025, 3, 3, 9, 10)) == set()
+
+
+def test_invalid_and_overlapping_times_are_reported():
+    schedule = build_schedule(PERIODS + [{"name": "5교시", "time": "11:00 ~ 11:30"}])
+
+    assert schedule.lesson_count == 5
+    assert any("4교시" in error for error in schedule.errors)
+    assert any("3교시" in error and "5교시" in error for error in schedule.errors)
+    assert parse_time_range("09:00-09:40") == (540, 580)
+    assert parse_time_range("10:00 ~ 09:00") is None
+    assert build_schedule(PERIODS) is build_schedule([dict(p) for p in PERIODS])
+
+
+def test_random_schedules_match_linear_scan():
+    rng = random.Random(4)
+    for _ in range(50):
+        starts = sorted(rng.sample(range(480, 960, 5), 6))
+        periods = [
+            {"name": f"{i + 1}교시", "time": f"{s // 60:02d}:{s % 60:02d} ~ {(s + 4) // 60:02d}:{(s + 4) % 60:02d}"}
+            for i, s in enumerate(rng.sample(starts, len(starts)))
+        ]
+        schedule = build_schedule(periods)
+        for minute in range(470, 970):
+            at = [p.index for p in schedule if p.start <= minute < p.end]
+            assert schedule.period_at(minute) == (at[0] if at else None)
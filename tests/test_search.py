@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from timetable import search
+from timetable.search import IndexedStorage, SearchIndex, normalize, text_grams
+from timetable.storage import MemoryStorage
+
+WORDS = "체육관 수학 급식 발표 도서관 미술 운동장 숙제 친구 과학 가 나".split()
+QUERIES = ["체육관", "수학 급식", "가", "체", "관", "도서관 숙제 친구", "육관", "없음"]
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    # 블록 32문서: 배열 컨테이너는 1개까지, 넘으면 4바이트 비트맵
+    monkeypatch.setattr(search, "BLOCK_BITS", 5)
+    monkeypatch.setattr(search, "BLOCK_DOCS", 32)
+    monkeypatch.setattr(search, "BITMAP_BYTES", 4)
+    monkeypatch.setattr(search, "ARRAY_MAX", 1)
+
+
+def _brute_force(truth, query, limit=search.MAX_RESULTS):
+    terms = normalize(query).split()
+    hits = [(d, s, k, t) for (s, d, k), t in truth.items() if t and all(term in t for term in terms)]
+    return sorted(hits, key=lambda hit: (hit[0], hit[1]), reverse=True)[:limit]
+
+
+def _random_index(rng, edits=1500):
+    index, truth = SearchIndex(":memory:"), {}
+    for _ in range(edits):
+        student, day = f"s{rng.randrange(8)}", f"2025-03-{rng.randrange(1, 29):02d}"
+        text = " ".join(rng.choices(WORDS, k=rng.randint(0, 5)))
+        index.update(student, day, {"comment": text})
+        truth[(student, day, "comment")] = normalize(text)
+    return index, truth
+
+
+def test_text_grams_cover_particles_and_single_letters():
+    grams = text_grams("체육관에서 놀기")
+    assert {"체육", "육관", "관에", "에서", "서" + search.END, "놀기", "기" + search.END} == grams
+
+
+def test_search_matches_brute_force_after_edits(small_blocks):
+    index, truth = _random_index(random.Random(3))
+
+    for query in QUERIES:
+        assert index.search(query) == _brute_force(truth, query), query
+    # 같은 (student, date, kind) 는 고쳐도 처음 받은 문서 번호를 씀
+    max_doc = index._conn.execute("SELECT MAX(doc) FROM docs").fetchone()[0]
+    assert max_doc == index._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+    assert index.stats()["docs"] == sum(1 for text in truth.values() if text)
+
+
+def test_postings_switch_between_array_and_bitmap(small_blocks):
+    index = SearchIndex(":memory:")
+
+    def sizes():
+        return {len(data) for (data,) in index._conn.execute("SELECT data FROM postings WHERE gram = '체육'")}
+
+    index.update("a", "2025-03-03", {"comment": "체육"})
+    assert sizes() == {2}
+    index.update("b", "2025-03-03", {"comment": "체육"})
+    assert sizes() == {4}
+    assert len(index.search("체육")) == 2
+
+    index.update("b", "2025-03-03", {"comment": "수학"})
+    assert sizes() == {2}
+    index.update("a", "2025-03-03", {"comment": ""})
+    assert sizes() == set()
+    assert index.search("체육") == []
+
+
+@pytest.mark.parametrize("scan_ratio", [0, 10 ** 9])
+def test_scan_and_candidate_paths_agree(small_blocks, monkeypatch, scan_ratio):
+    # 0 이면 항상 원문 훑기, 아주 크면 항상 후보 확인
+    monkeypatch.setattr(search, "SCAN_RATIO", scan_ratio)
+    index, truth = _random_index(random.Random(7), edits=600)
+
+    for query in QUERIES:
+        assert index.search(query, limit=20) == _brute_force(truth, query, limit=20), query
+
+
+def test_indexed_storage_updates_index_and_filters_by_kind():
+    storage = IndexedStorage(MemoryStorage(), SearchIndex(":memory:"))
+    storage.save_entries("민수", "2025-03-08", {
+        "comment": "도서관에서 숙제",
+        "weekend_m": [{"id": "1", "title": "수영", "place": "체육관"}],
+    })
+
+    assert [hit[2] for hit in storage.index.search("체육관")] == ["weekend_m"]
+    assert storage.index.search("도서관", kinds=("weekend_m",)) == []
+    assert storage.load_entries("민수", "2025-03-08")["comment"] == "도서관에서 숙제"
@@ -0,0 +1,13 @@
+import pytest
+
+from benchmarks.bench_startup import BUDGETS, FORBIDDEN, bench_env, check_page
+
+pytestmark = pytest.mark.slow
+
+
+@pytest.mark.parametrize("page", sorted(BUDGETS))
+def test_page_cold_start_within_budget(page, tmp_path):
+    assert page in FORBIDDEN
+    imported, rendered, problems = check_page(page, bench_env(str(tmp_path)), repeat=1)
+
+    assert problems == [], f"{page}: import {imported:.1f}ms, render {rendered:.1f}ms"
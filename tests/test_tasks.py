@@ -0,0 +1,57 @@
+import random
+
+from timetable.tasks import TaskList
+from timetable.timeslots import NO_TIME
+
+
+def _ids(tasks):
+    return [item["id"] for item in tasks]
+
+
+def test_items_sorted_by_time_with_untimed_last_and_ties_in_insert_order():
+    tasks = TaskList([
+        {"id": "a", "title": "독서", "time": None},
+        {"id": "b", "title": "수영", "time": "10:30"},
+        {"id": "c", "title": "숙제", "time": 540},
+        {"id": "d", "title": "산책", "time": "09:00"},
+    ])
+
+    assert _ids(tasks) == ["c", "d", "b", "a"]
+    assert tasks.get("b")["time"] == 630
+    assert "_seq" not in tasks.to_list()[0]
+
+
+def test_time_change_moves_item_and_other_updates_keep_position():
+    tasks = TaskList([{"id": i, "time": t} for i, t in (("a", 540), ("b", 600), ("c", 600))])
+
+    tasks.update("b", title="수영", done=True)
+    assert _ids(tasks) == ["a", "b", "c"]
+    tasks.update("a", time="10:00")  # 같은 시간이면 나중에 바꾼 항목이 뒤로
+    assert _ids(tasks) == ["b", "c", "a"]
+    tasks.update("c", time=600)  # 시간이 그대로면 자리 유지
+    assert _ids(tasks) == ["b", "c", "a"]
+
+    tasks.remove("c")
+    tasks.remove("없음")
+    assert _ids(tasks) == ["b", "a"] and len(tasks) == 2 and "c" not in tasks
+
+
+def test_random_operations_match_full_sort():
+    rng = random.Random(2)
+    tasks, model, seq = TaskList(), {}, 0
+    for step in range(500):
+        op = rng.random()
+        item_id = str(rng.randrange(30))
+        time = rng.choice([None, *range(480, 720, 30)])
+        if op < 0.4 and item_id not in model:
+            tasks.add({"id": item_id, "time": time})
+            model[item_id], seq = (time, seq), seq + 1
+        elif op < 0.8 and item_id in model:
+            tasks.update(item_id, time=time)
+            if time != model[item_id][0]:
+                model[item_id], seq = (time, seq), seq + 1
+        elif item_id in model:
+            tasks.remove(item_id)
+            del model[item_id]
+        expected = sorted(model, key=lambda i: (NO_TIME if model[i][0] is None else model[i][0], model[i][1]))
+        assert _ids(tasks) == expected, step
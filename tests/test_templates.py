@@ -0,0 +1,40 @@
+from timetable import templates
+from timetable.aggregates import class_progress
+from timetable.schedule import LUNCH_NAME
+from timetable.storage import MemoryStorage
+
+NAMES = ["1교시", "2교시", "3교시", "4교시", LUNCH_NAME, "5교시", "6교시"]
+MONDAY = "2025-03-03"
+
+
+def _monday_template():
+    return {
+        idx: {"name": name, "subject": "국어", "place": "교실", "supplies": ["교과서"]}
+        for idx, name in enumerate(NAMES)
+        if name != LUNCH_NAME
+    }
+
+
+def test_template_day_with_one_checked_period_is_not_complete():
+    day_tpl = _monday_template()
+    checked = {**day_tpl[0], "move_done": True, "ready": True, "done": True, "sign_locked": False, "sign": None}
+    storage = MemoryStorage()
+    storage.save_periods("민수", MONDAY, templates.day_overrides(NAMES, day_tpl, {0: checked}))
+
+    _, per_student = class_progress(storage.load_date(MONDAY))
+
+    assert per_student.loc["민수", "교시 수"] == 6
+    assert per_student.loc["민수", "수업준비완료"] == 1
+    assert per_student.loc["민수", "진행률(%)"] == 16.7
+
+
+def test_day_overrides_keep_only_values_that_differ_from_template():
+    day_tpl = _monday_template()
+    day = templates.day_overrides(NAMES, day_tpl, {1: {**day_tpl[1], "place": "과학실", "ready": True}})
+
+    assert set(day) == set(range(len(NAMES)))
+    assert day[1] == {"name": "2교시", "place": "과학실", "move_done": False, "ready": True, "done": False,
+                      "sign_locked": False, "sign": None}
+    assert "subject" not in day[0]
+    assert templates.resolve_periods(day_tpl, day)[0]["subject"] == "국어"
+    assert day[4] == templates.blank_record(LUNCH_NAME)
@@ -0,0 +1,36 @@
+import pytest
+
+from timetable import timeslots
+from timetable.timeslots import parse_sections, section_slots
+
+
+@pytest.fixture
+def fresh_cache():
+    parse_sections.cache_clear()
+    yield
+    parse_sections.cache_clear()
+
+
+def test_section_slots_parses_env_once_per_value(monkeypatch, fresh_cache):
+    monkeypatch.setenv("TIMETABLE_MORNING", "07:00 ~ 11:00")
+    monkeypatch.delenv("TIMETABLE_AFTERNOON", raising=False)
+    calls = []
+    monkeypatch.setattr(timeslots, "parse_time_range", lambda text: calls.append(text) or (7 * 60, 11 * 60))
+
+    for _ in range(5):
+        slots = section_slots("m", 30)
+    assert slots.labels[0] == "07:00" and slots.labels[-1] == "10:30"
+    assert section_slots("a", 30).minutes[0] == 12 * 60
+    assert calls == ["07:00 ~ 11:00"]
+
+    # 값이 바뀌면 캐시 키도 바뀌어 새로 해석
+    monkeypatch.setenv("TIMETABLE_MORNING", "08:00 ~ 11:00")
+    section_slots("m", 30)
+    assert calls == ["07:00 ~ 11:00", "08:00 ~ 11:00"]
+
+
+def test_parse_sections_rejects_misaligned_bounds(fresh_cache):
+    with pytest.raises(ValueError):
+        parse_sections(30, "07:15 ~ 11:00")
+    with pytest.raises(ValueError):
+        parse_sections(15, "06:00 ~ 13:00", "12:00 ~ 22:00")
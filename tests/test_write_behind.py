@@ -0,0 +1,58 @@
+import threading
+import time
+
+from timetable.storage import MemoryStorage
+from timetable.write_behind import WriteBehindStorage
+
+DAY = "2025-03-03"
+
+
+class SlowStorage(MemoryStorage):
+    """읽기/쓰기 사이에 틈을 벌려 flush 와 load_day 가 겹치게 함"""
+
+    def load_day(self, student, date):
+        records = super().load_day(student, date)
+        time.sleep(0.002)
+        return records
+
+    def save_rows(self, period_rows, entry_rows):
+        time.sleep(0.001)
+        super().save_rows(period_rows, entry_rows)
+
+
+def test_load_day_sees_own_writes_while_flushing():
+    storage = WriteBehindStorage(SlowStorage(), interval_ms=60_000)
+    stop = threading.Event()
+    errors = []
+
+    def flusher():
+        while not stop.is_set():
+            try:
+                storage.flush()
+            except Exception as exc:  # pragma: no cover - 실패 보고용
+                errors.append(exc)
+
+    def bulk_writer():
+        # 다른 학생의 일괄 저장은 먼저 내려쓰므로 flush 와 같이 돌아감
+        for i in range(200):
+            storage.save_period_rows([("영희", DAY, 0, {"n": i})])
+
+    threads = [threading.Thread(target=flusher), threading.Thread(target=bulk_writer)]
+    for thread in threads:
+        thread.start()
+    stale = []
+    try:
+        for i in range(150):
+            storage.save_periods("민수", DAY, {0: {"n": i}})
+            seen = storage.load_day("민수", DAY)[0]["n"]
+            if seen != i:
+                stale.append((i, seen))
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        storage.close()
+
+    assert not errors
+    assert stale == []
+    assert storage.inner.load_day("영희", DAY)[0] == {"n": 199}
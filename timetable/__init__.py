@@ -0,0 +1 @@
+"""시간표 앱에서 공용으로 쓰는 저장소/상태 관리 모듈 모음."""
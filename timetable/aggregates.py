@@ -0,0 +1,68 @@
+"""반/학교 단위 진행도 집계.
+
+학생별 위젯 로직을 다시 돌리지 않고, 저장된 교시 기록을 DataFrame 하나로
+만들어 group-by 한 번으로 교시별 완료율과 학생별 진행도를 계산합니다.
+"""
+import pandas as pd
+
+from timetable.schedule import LUNCH_NAME
+
+FLAG_COLUMNS = ["move_done", "ready", "signed", "done"]
+
+BOOL_COLUMNS = ["move_done", "ready", "done", "sign_locked", "eat", "brush"]
+
+RECORD_COLUMNS = ["student", "period", "name", "subject", "place", "sign", *BOOL_COLUMNS]
+
+COUNT_COLUMNS = ["교시 수", "이동", "준비물", "선생님확인", "수업준비완료"]
+
+
+def records_frame(records):
+    """[(student, period, dict)] -> 교시 기록 DataFrame"""
+    df = pd.DataFrame(
+        [{**data, "student": student, "period": period} for student, period, data in records],
+        columns=RECORD_COLUMNS,
+    )
+    for col in BOOL_COLUMNS:
+        df[col] = df[col].eq(True)
+    df["name"] = df["name"].fillna("")
+    # 요약 표와 같은 기준: 잠금 + 서명 이미지가 있어야 선생님 확인
+    df["signed"] = df["sign_locked"] & df["sign"].notna()
+    return df
+
+
+def class_progress(records, students=()):
+    """(교시별 완료율, 학생별 진행도) DataFrame 반환
+
+    students 를 주면 기록이 없는 학생도 0 으로 포함합니다.
+    """
+    df = records_frame(records)
+    lessons = df[df["name"] != LUNCH_NAME]
+    lunch = df[df["name"] == LUNCH_NAME]
+
+    per_period = (
+        lessons.groupby(["period", "name"], sort=True)[FLAG_COLUMNS]
+        .mean()
+        .mul(100)
+        .round(1)
+        .reset_index()
+    )
+
+    grouped = lessons.groupby("student")
+    per_student = pd.DataFrame({
+        "교시 수": grouped.size(),
+        "이동": grouped["move_done"].sum(),
+        "준비물": grouped["ready"].sum(),
+        "선생님확인": grouped["signed"].sum(),
+        "수업준비완료": grouped["done"].sum(),
+    })
+    lunch_done = lunch.groupby("student")["done"].any()
+    per_student["점심"] = lunch_done.reindex(per_student.index, fill_value=False)
+    roster = sorted(set(students) | set(per_student.index) | set(lunch_done.index))
+    per_student = per_student.reindex(roster, fill_value=0)
+    per_student[COUNT_COLUMNS] = per_student[COUNT_COLUMNS].astype(int)
+    per_student["점심"] = per_student["점심"].astype(bool)
+    per_student["진행률(%)"] = (
+        per_student["수업준비완료"].div(per_student["교시 수"].where(per_student["교시 수"] > 0)).mul(100).round(1).fillna(0)
+    )
+    per_student.index.name = "학생"
+    return per_period, per_student
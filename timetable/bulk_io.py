@@ -0,0 +1,334 @@
+"""시간표/주말 일과 일괄 가져오기·내보내기 (CSV, Parquet).
+
+파일 전체를 메모리에 올리지 않도록 행을 chunk_rows 개씩 읽어 저장소에
+한 트랜잭션씩 반영하고, 내보낼 때도 저장소에서 묶음 단위로 읽어 바로
+씁니다.
+
+시간표 열: student, class_name, date, period, name, subject, place,
+          supplies("교과서, 필기도구"), move_done, ready, done, sign_locked
+주말 일과 열: student, date, section(m/a), id, title, place, time("HH:MM"), done
+(저장소에는 시간을 자정 기준 분으로 보관하고, 파일에는 "HH:MM" 으로 씁니다)
+
+시간표를 내보낼 때는 요일 기본 시간표를 얹어, 템플릿에만 있는 교시/날짜도
+완전한 행으로 씁니다 (다시 가져오면 같은 하루가 됨).
+"""
+import csv
+import io
+import uuid
+from datetime import date as date_cls, timedelta
+from functools import lru_cache
+
+from timetable.templates import TIMETABLE, day_template
+from timetable.timeslots import format_minutes, parse_minutes
+
+CHUNK_ROWS = 5000
+
+TIMETABLE_COLUMNS = [
+    "student", "class_name", "date", "period", "name", "subject", "place",
+    "supplies", "move_done", "ready", "done", "sign_locked",
+]
+WEEKEND_COLUMNS = ["student", "date", "section", "id", "title", "place", "time", "done"]
+
+TIMETABLE_BOOL_FIELDS = ("move_done", "ready", "done", "sign_locked")
+
+SECTION_KINDS = {"m": "weekend_m", "a": "weekend_a"}
+
+TRUE_VALUES = {"1", "true", "t", "y", "yes", "o", "✔", "✅"}
+
+MAX_REPORTED_ERRORS = 20
+
+
+def _bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value or "").strip().lower() in TRUE_VALUES
+
+
+def _date(value):
+    if isinstance(value, date_cls):
+        return value.isoformat()
+    return date_cls.fromisoformat(str(value).strip()[:10]).isoformat()
+
+
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+@lru_cache(maxsize=None)
+def _schema(columns):
+    """parquet 스키마. pyarrow 는 무거우므로 parquet 을 실제로 읽고 쓸 때만 불러옴"""
+    import pyarrow as pa
+
+    return pa.schema([
+        (col, pa.int64() if col == "period" else pa.bool_() if col in TIMETABLE_BOOL_FIELDS else pa.string())
+        for col in columns
+    ])
+
+
+def iter_chunks(fileobj, fmt, chunk_rows=CHUNK_ROWS):
+    """파일에서 dict 행 목록을 chunk_rows 개씩 읽어 내보냄 (fmt: csv/parquet)"""
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(fileobj).iter_batches(batch_size=chunk_rows):
+            yield batch.to_pylist()
+        return
+    text = io.TextIOWrapper(fileobj, encoding="utf-8-sig", newline="") if _is_binary(fileobj) else fileobj
+    chunk = []
+    for row in csv.DictReader(text):
+        chunk.append(row)
+        if len(chunk) >= chunk_rows:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+    if text is not fileobj:
+        text.detach()
+
+
+def _is_binary(fileobj):
+    return not isinstance(fileobj, io.TextIOBase)
+
+
+def _new_result():
+    return {"rows": 0, "skipped": 0, "errors": []}
+
+
+def _skip(result, line, exc):
+    result["skipped"] += 1
+    if len(result["errors"]) < MAX_REPORTED_ERRORS:
+        result["errors"].append(f"{line}행: {exc}")
+
+
+def _timetable_fields(row):
+    """파일 행에서 교시 기록 값. 파일에 없는 열은 넣지 않음 (저장된 값을 그대로 둠)"""
+    data = {field: _text(row[field]) for field in ("name", "subject", "place") if field in row}
+    if "supplies" in row:
+        supplies = row["supplies"] or ""
+        if isinstance(supplies, str):
+            supplies = [s.strip() for s in supplies.split(",") if s.strip()]
+        data["supplies"] = list(supplies)
+    data.update({field: _bool(row[field]) for field in TIMETABLE_BOOL_FIELDS if field in row})
+    return data
+
+
+def import_timetable(storage, fileobj, fmt, chunk_rows=CHUNK_ROWS):
+    """시간표 파일 가져오기. (student, date, period) 가 같으면 파일에 있는 열만 덮어씀
+
+    서명(sign), 점심 체크(eat/brush)처럼 파일에 없는 값은 저장된 기록에서 그대로 가져가므로
+    기록이 있는 날짜에 가져오거나 내보낸 파일을 다시 가져와도 지워지지 않습니다.
+    """
+    result = _new_result()
+    line = 1
+    for chunk in iter_chunks(fileobj, fmt, chunk_rows):
+        days = {}
+        classes = {}
+        for row in chunk:
+            line += 1
+            try:
+                student = _text(row.get("student"))
+                if not student:
+                    raise ValueError("student 가 비어 있습니다")
+                key, period = (student, _date(row.get("date"))), int(row.get("period"))
+                data = _timetable_fields(row)
+            except (TypeError, ValueError) as exc:
+                _skip(result, line, exc)
+                continue
+            if key not in days:
+                days[key] = ({}, storage.load_day(*key))
+            records, stored = days[key]
+            base = records.get(period) or stored.get(period) or {}
+            records[period] = {**base, **data}
+            result["rows"] += 1
+            class_name = _text(row.get("class_name"))
+            if class_name:
+                classes[student] = class_name
+        storage.save_period_rows([
+            (student, day, period, record)
+            for (student, day), (records, _) in days.items()
+            for period, record in records.items()
+        ])
+        for student, class_name in classes.items():
+            storage.save_student(student, class_name)
+    return result
+
+
+def import_weekend(storage, fileobj, fmt, chunk_rows=CHUNK_ROWS):
+    """주말 일과 가져오기. 같은 id 의 항목은 바꾸고 나머지는 기존 목록 뒤에 추가"""
+    result = _new_result()
+    line = 1
+    for chunk in iter_chunks(fileobj, fmt, chunk_rows):
+        groups = {}
+        for row in chunk:
+            line += 1
+            try:
+                student = _text(row.get("student"))
+                if not student:
+                    raise ValueError("student 가 비어 있습니다")
+                kind = SECTION_KINDS.get(_text(row.get("section")).lower())
+                if kind is None:
+                    raise ValueError("section 은 m 또는 a 여야 합니다")
+                time_text = _text(row.get("time"))
+                minutes = parse_minutes(time_text)
+                if time_text and minutes is None:
+                    raise ValueError("time 은 HH:MM 형식이어야 합니다")
+                item = {
+                    "id": _text(row.get("id")) or str(uuid.uuid4()),
+                    "title": _text(row.get("title")),
+                    "place": _text(row.get("place")),
+                    "time": minutes,
+                    "done": _bool(row.get("done")),
+                }
+                groups.setdefault((student, _date(row.get("date")), kind), []).append(item)
+            except (TypeError, ValueError) as exc:
+                _skip(result, line, exc)
+
+        rows = []
+        for (student, day, kind), items in groups.items():
+            existing = storage.load_entries(student, day).get(kind) or []
+            merged = {item["id"]: item for item in existing}
+            for item in items:
+                merged[item["id"]] = item
+            rows.append((student, day, kind, list(merged.values())))
+            result["rows"] += len(items)
+        storage.save_entry_rows(rows)
+    return result
+
+
+def _resolved_period_rows(storage, date_from, date_to, chunk_rows):
+    """저장된 교시 기록에 요일 템플릿을 얹고, 템플릿에만 있는 교시와 날짜도 채워 묶음으로 내보냄
+
+    날짜 기록에는 템플릿과 다른 값만 있고 아무것도 바꾸지 않은 교시/날짜는 행이 없으므로,
+    템플릿을 얹지 않으면 내보낸 파일을 다시 가져왔을 때 그 교시/날짜가 사라집니다.
+    템플릿에만 있는 날짜는 내보내는 기간(없으면 저장된 첫 날~마지막 날) 안에서 채웁니다.
+    """
+    student_templates = {}
+
+    def template_of(student):
+        if student not in student_templates:
+            student_templates[student] = storage.load_template(student, TIMETABLE) or {}
+        return student_templates[student]
+
+    def day_tpl(student, day):
+        return day_template(template_of(student), date_cls.fromisoformat(day).weekday())
+
+    def template_only(student, day, stored):
+        return [
+            (student, day, period, base) for period, base in sorted(day_tpl(student, day).items()) if period not in stored
+        ]
+
+    seen = set()
+    key, stored = None, set()
+    first = last = None
+    for batch in storage.iter_period_rows(date_from, date_to, chunk_rows):
+        rows = []
+        # 저장소는 (date, student, period) 순으로 내보내므로 (student, date) 하루가 이어서 나옴
+        for student, day, period, data in batch:
+            if (student, day) != key:
+                if key is not None:
+                    rows.extend(template_only(*key, stored))
+                key, stored = (student, day), set()
+                if template_of(student):
+                    seen.add(key)
+                first, last = first or day, day
+            stored.add(period)
+            rows.append((student, day, period, {**day_tpl(student, day).get(period, {}), **data}))
+        yield rows
+    if key is not None:
+        yield template_only(*key, stored)
+
+    first, last = date_from or first, date_to or last
+    if first is None or last is None:
+        return
+    first, last = date_cls.fromisoformat(str(first)), date_cls.fromisoformat(str(last))
+    rows = []
+    for student in storage.list_students():
+        if not template_of(student):
+            continue
+        day = first
+        while day <= last:
+            if (student, day.isoformat()) not in seen:
+                rows.extend(template_only(student, day.isoformat(), ()))
+                if len(rows) >= chunk_rows:
+                    yield rows
+                    rows = []
+            day += timedelta(days=1)
+    if rows:
+        yield rows
+
+
+def _timetable_rows(storage, date_from, date_to, chunk_rows):
+    classes = {}
+    for batch in _resolved_period_rows(storage, date_from, date_to, chunk_rows):
+        for student, _, _, _ in batch:
+            if student not in classes:
+                classes[student] = storage.load_student_class(student) or ""
+        yield [
+            {
+                "student": student,
+                "class_name": classes[student],
+                "date": day,
+                "period": period,
+                "name": data.get("name", ""),
+                "subject": data.get("subject", ""),
+                "place": data.get("place", ""),
+                "supplies": ", ".join(data.get("supplies", [])),
+                **{field: bool(data.get(field, False)) for field in TIMETABLE_BOOL_FIELDS},
+            }
+            for student, day, period, data in batch
+        ]
+
+
+def _weekend_rows(storage, date_from, date_to, chunk_rows):
+    sections = {kind: section for section, kind in SECTION_KINDS.items()}
+    for batch in storage.iter_entry_rows(sections, date_from, date_to, chunk_rows):
+        yield [
+            {
+                "student": student,
+                "date": day,
+                "section": sections[kind],
+                "id": item.get("id", ""),
+                "title": item.get("title", ""),
+                "place": item.get("place", ""),
+                "time": format_minutes(parse_minutes(item.get("time"))),
+                "done": bool(item.get("done", False)),
+            }
+            for student, day, kind, items in batch
+            for item in items
+        ]
+
+
+def _write(chunks, out, fmt, columns):
+    count = 0
+    if fmt == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = _schema(tuple(columns))
+        with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+            for rows in chunks:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                count += len(rows)
+        return count
+    text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="") if _is_binary(out) else out
+    writer = csv.DictWriter(text, fieldnames=columns)
+    writer.writeheader()
+    for rows in chunks:
+        writer.writerows(rows)
+        count += len(rows)
+    text.flush()
+    if text is not out:
+        text.detach()
+    return count
+
+
+def export_timetable(storage, out, fmt, date_from=None, date_to=None, chunk_rows=CHUNK_ROWS):
+    """시간표를 out 에 씀. 쓴 행 수 반환"""
+    chunks = _timetable_rows(storage, date_from, date_to, chunk_rows)
+    return _write(chunks, out, fmt, TIMETABLE_COLUMNS)
+
+
+def export_weekend(storage, out, fmt, date_from=None, date_to=None, chunk_rows=CHUNK_ROWS):
+    """주말 일과를 out 에 씀. 쓴 행 수 반환"""
+    chunks = _weekend_rows(storage, date_from, date_to, chunk_rows)
+    return _write(chunks, out, fmt, WEEKEND_COLUMNS)
@@ -0,0 +1,57 @@
+"""두 페이지에서 같이 쓰는 일괄 가져오기/내보내기 패널."""
+import io
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from timetable import bulk_io
+from timetable.session import get_storage
+
+KINDS = {
+    "timetable": ("시간표", bulk_io.import_timetable, bulk_io.export_timetable, bulk_io.TIMETABLE_COLUMNS),
+    "weekend": ("주말 일과", bulk_io.import_weekend, bulk_io.export_weekend, bulk_io.WEEKEND_COLUMNS),
+}
+
+MIME_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def _format_of(filename):
+    return "parquet" if filename.lower().endswith((".parquet", ".pq")) else "csv"
+
+
+def bulk_panel(kind, reset_prefixes=()):
+    """가져오기/내보내기 expander. 가져온 뒤에는 reset_prefixes 로 시작하는 세션 키를 지워 다시 읽게 함"""
+    label, importer, exporter, columns = KINDS[kind]
+    storage = get_storage()
+
+    with st.expander(f"📦 {label} 일괄 가져오기/내보내기"):
+        st.caption("열: " + ", ".join(columns))
+        uploaded = st.file_uploader("CSV 또는 Parquet 파일", type=["csv", "parquet", "pq"], key=f"bulk_upload_{kind}")
+        if uploaded is not None and st.button("가져오기", key=f"bulk_import_{kind}"):
+            with st.spinner("가져오는 중..."):
+                result = importer(storage, uploaded, _format_of(uploaded.name))
+            st.success(f"{result['rows']}행을 가져왔습니다. (건너뜀 {result['skipped']}행)")
+            for error in result["errors"]:
+                st.warning(error)
+            for key in list(st.session_state.keys()):
+                if key.startswith(tuple(reset_prefixes)):
+                    del st.session_state[key]
+
+        today = datetime.now().date()
+        c1, c2, c3 = st.columns([2, 2, 1])
+        with c1:
+            date_from = st.date_input("시작일", today - timedelta(days=30), key=f"bulk_from_{kind}")
+        with c2:
+            date_to = st.date_input("종료일", today, key=f"bulk_to_{kind}")
+        with c3:
+            fmt = st.radio("형식", ["csv", "parquet"], key=f"bulk_fmt_{kind}")
+        if st.button("내보내기 파일 만들기", key=f"bulk_export_{kind}"):
+            out = io.BytesIO()
+            count = exporter(storage, out, fmt, date_from, date_to)
+            st.download_button(
+                f"⬇️ {count}행 내려받기",
+                out.getvalue(),
+                file_name=f"{kind}_{date_from}_{date_to}.{fmt}",
+                mime=MIME_TYPES[fmt],
+                key=f"bulk_download_{kind}",
+            )
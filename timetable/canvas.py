@@ -0,0 +1,180 @@
+"""st_canvas 결과를 서명으로 바꾸는 변환.
+
+서명 캔버스는 update_streamlit=False 로 두어 획을 브라우저에 모았다가 한 번만
+보내고, 그때 온 json_data 의 획(path) 좌표만 작게 줄여 서명의 원본으로 저장합니다.
+화면에는 획으로 만든 SVG 를 쓰고, 비트맵은 정말 필요할 때만 획에서 그립니다.
+이 모듈은 표준 라이브러리만 불러오고, PIL 은 rasterize_strokes 안에서만 씁니다.
+"""
+import json
+import math
+import zlib
+from html import escape
+
+# 잘라낼 때 잉크 주변에 남길 여백(px)
+CROP_MARGIN = 4
+
+# 획 좌표는 소수 첫째 자리까지만 보관
+STROKE_PRECISION = 1
+# 비트맵으로 그릴 때 곡선(Q) 하나를 나누는 선분 수
+CURVE_STEPS = 4
+# 받아들이는 SVG path 명령과 좌표 개수 (fabric.js 자유 그리기가 쓰는 절대 좌표 명령만)
+PATH_COMMANDS = {"M": 2, "L": 2, "Q": 4, "C": 6, "Z": 0}
+
+
+def _coord(value):
+    """좌표 -> float. 숫자가 아니거나 유한하지 않으면 None"""
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+def _path_command(cmd, precision=None):
+    """["Q", cx, cy, x, y] 처럼 알려진 명령과 맞는 개수의 좌표만 통과. 아니면 None
+
+    SVG 의 d 속성에 그대로 들어가므로 명령 글자와 숫자 외에는 내보내지 않습니다.
+    """
+    if not isinstance(cmd, (list, tuple)) or not cmd or cmd[0] not in PATH_COMMANDS:
+        return None
+    if len(cmd) - 1 != PATH_COMMANDS[cmd[0]]:
+        return None
+    coords = [_coord(v) for v in cmd[1:]]
+    if None in coords:
+        return None
+    return [cmd[0], *(round(v, precision) if precision is not None else v for v in coords)]
+
+
+def _clean_path(path, precision=None):
+    """걸러 낸 명령 목록. 좌표가 하나도 없으면 (Z 뿐이면) 그릴 것이 없으므로 빈 목록"""
+    path = [cmd for cmd in (_path_command(cmd, precision) for cmd in path or ()) if cmd]
+    return path if any(len(cmd) > 1 for cmd in path) else []
+
+
+def strokes_from_json(json_data, precision=STROKE_PRECISION):
+    """fabric.js json_data -> {"strokes": [{"color", "width", "path"}]}. 획이 없으면 None
+
+    path 는 [["M", x, y], ["Q", cx, cy, x, y], ..., ["L", x, y]] 로 캔버스 좌표입니다.
+    PATH_COMMANDS 에 없는 명령이나 숫자가 아닌 좌표는 버리고, 남는 명령이 없는 획도 버립니다.
+    """
+    strokes = []
+    for obj in (json_data or {}).get("objects", ()):
+        if obj.get("type") != "path" or not obj.get("path"):
+            continue
+        path = _clean_path(obj["path"], precision)
+        if not path:
+            continue
+        strokes.append({
+            "color": obj.get("stroke") or "#000",
+            "width": _coord(obj.get("strokeWidth")) or 1,
+            "path": path,
+        })
+    return {"strokes": strokes} if strokes else None
+
+
+def canvas_fingerprint(json_data):
+    """json_data 중 strokes_from_json 이 읽는 값(획 종류/색/굵기/경로)의 해시
+
+    json.dumps 는 좌표 float 를 문자열로 바꾸느라 획 저장만큼 느리므로 튜플 해시를 씁니다.
+    문자열 해시는 프로세스마다 달라지므로 같은 세션 안의 비교에만 씁니다.
+    """
+    return hash(tuple(
+        (obj.get("type"), obj.get("stroke"), obj.get("strokeWidth"), tuple(map(tuple, obj.get("path") or ())))
+        for obj in (json_data or {}).get("objects", ())
+    ))
+
+
+def changed_strokes(json_data, last_digest=None):
+    """(digest, changed, strokes). 획이 직전과 같으면 다시 만들지 않음
+
+    changed 가 False 면 strokes 는 None 이고, 호출하는 쪽은 저장/세션 갱신을 건너뜁니다.
+    """
+    digest = canvas_fingerprint(json_data)
+    if digest == last_digest:
+        return digest, False, None
+    return digest, True, strokes_from_json(json_data)
+
+
+def encode_strokes(strokes):
+    """저장/해시용 zlib 압축 JSON 바이트 (같은 획이면 같은 바이트)"""
+    return zlib.compress(json.dumps(strokes, separators=(",", ":"), sort_keys=True).encode(), 9)
+
+
+def is_strokes_blob(data):
+    """encode_strokes 로 만든 바이트인지 (zlib 최대 압축 헤더). PNG/WebP 서명과 구분"""
+    return data[:2] == b"\x78\xda"
+
+
+def decode_strokes(data):
+    return json.loads(zlib.decompress(data))
+
+
+def _points(path):
+    """path 명령 -> 점 목록 (곡선은 CURVE_STEPS 개의 선분으로 나눔)"""
+    points = []
+    for cmd in path:
+        if cmd[0] == "Q" and points:
+            (x0, y0), (cx, cy, x1, y1) = points[-1], cmd[1:5]
+            for i in range(1, CURVE_STEPS + 1):
+                t = i / CURVE_STEPS
+                points.append((
+                    (1 - t) ** 2 * x0 + 2 * (1 - t) * t * cx + t * t * x1,
+                    (1 - t) ** 2 * y0 + 2 * (1 - t) * t * cy + t * t * y1,
+                ))
+        elif len(cmd) >= 3:
+            points.append((cmd[-2], cmd[-1]))
+    return points
+
+
+def strokes_bbox(strokes, margin=CROP_MARGIN):
+    """획 전체를 감싸는 (left, top, right, bottom). 여백과 선 굵기를 포함"""
+    xs, ys, width = [], [], 0
+    for stroke in strokes["strokes"]:
+        for cmd in stroke["path"]:
+            xs.extend(cmd[1::2])
+            ys.extend(cmd[2::2])
+        width = max(width, stroke["width"])
+    pad = margin + width / 2
+    return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+
+
+def strokes_svg(strokes, margin=CROP_MARGIN):
+    """획을 잉크 영역만 보이는 SVG 문자열로 (비트맵 변환 없음)
+
+    저장된 획도 PATH_COMMANDS 로 다시 걸러 d 속성에는 명령 글자와 숫자만 들어갑니다.
+    """
+    strokes = {"strokes": [
+        {**stroke, "path": _clean_path(stroke.get("path")), "width": _coord(stroke.get("width")) or 1}
+        for stroke in strokes["strokes"]
+    ]}
+    strokes["strokes"] = [stroke for stroke in strokes["strokes"] if stroke["path"]]
+    left, top, right, bottom = strokes_bbox(strokes, margin)
+    paths = "".join(
+        f'<path d="{" ".join(" ".join(str(v) for v in cmd) for cmd in stroke["path"])}" '
+        f'stroke="{escape(str(stroke["color"]))}" stroke-width="{stroke["width"]:g}"/>'
+        for stroke in strokes["strokes"]
+    )
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{left:g} {top:g} {right - left:g} {bottom - top:g}" '
+        f'width="{right - left:g}" height="{bottom - top:g}" fill="none" stroke-linecap="round" stroke-linejoin="round">'
+        f"{paths}</svg>"
+    )
+
+
+def rasterize_strokes(strokes, margin=CROP_MARGIN, scale=1):
+    """획을 잉크 영역만 잘린 RGBA 이미지로 그림 (보고서처럼 비트맵이 필요할 때만)"""
+    from PIL import Image, ImageDraw
+
+    left, top, right, bottom = strokes_bbox(strokes, margin)
+    size = (max(int((right - left) * scale + 0.5), 1), max(int((bottom - top) * scale + 0.5), 1))
+    img = Image.new("RGBA", size, (255, 255, 255, 0))
+    draw = ImageDraw.Draw(img)
+    for stroke in strokes["strokes"]:
+        points = [((x - left) * scale, (y - top) * scale) for x, y in _points(stroke["path"])]
+        width = max(int(stroke["width"] * scale + 0.5), 1)
+        if len(points) > 1:
+            draw.line(points, fill=stroke["color"], width=width, joint="curve")
+        r = width / 2
+        for x, y in (points[0], points[-1]) if points else ():
+            draw.ellipse((x - r, y - r, x + r, y + r), fill=stroke["color"])
+    return img
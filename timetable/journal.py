@@ -0,0 +1,299 @@
+"""변경 기록(journal)과 하루 스냅샷.
+
+저장소에는 마지막 값만 남기 때문에 잠금 해제처럼 "누가 언제 바꿨는지"를
+확인할 수 없고, 지연 쓰기 중 서버가 죽으면 마지막 변경을 되살릴 방법이
+없습니다. JournaledStorage 는 교시 기록/하루 항목이 저장될 때마다 바뀐 값을
+한 줄짜리 이벤트로 별도의 SQLite 파일에 덧붙이기만(append-only) 합니다.
+
+- 그룹 커밋: 쓰기 스레드 하나가 대기열에 쌓인 이벤트를 한 트랜잭션으로
+  내려쓰고, 그동안 들어온 이벤트는 다음 트랜잭션에 함께 묶습니다.
+  화면에서 한 번 저장할 때는 대기열에 넣기만 하므로 클릭마다 디스크 쓰기를
+  기다리지 않고, 일괄 저장은 마지막에 한 번만 커밋을 기다립니다.
+- 스냅샷: (student, date) 하루에 스냅샷 이후 이벤트가 snapshot_every 개
+  쌓이면 그 시점의 하루 상태를 통째로 저장합니다. 하루 복원은 스냅샷 하나와
+  그 뒤 이벤트(최대 snapshot_every 개 남짓)만 읽으므로 기록이 길어져도
+  복원 시간이 늘지 않습니다.
+
+TIMETABLE_JOURNAL 에 파일 경로를 주면 켜집니다 (기본은 꺼짐).
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+
+from timetable.sqlite_db import connect
+from timetable.storage import ForwardingStorage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = "timetable_journal.db"
+SNAPSHOT_EVERY = 64
+
+# 이벤트 종류: 교시 기록은 key 가 교시 번호, 하루 항목은 key 가 kind
+PERIOD = "p"
+ENTRY = "e"
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+class Journal:
+    """append-only 이벤트 테이블 + 하루 스냅샷 테이블"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS events (
+        seq INTEGER PRIMARY KEY,
+        ts REAL NOT NULL,
+        actor TEXT NOT NULL,
+        student TEXT NOT NULL,
+        date TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        key TEXT NOT NULL,
+        data TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_events_day ON events (student, date, seq);
+    CREATE INDEX IF NOT EXISTS idx_events_date ON events (date, student);
+    CREATE TABLE IF NOT EXISTS snapshots (
+        student TEXT NOT NULL,
+        date TEXT NOT NULL,
+        seq INTEGER NOT NULL,
+        state TEXT NOT NULL,
+        PRIMARY KEY (student, date)
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path=DEFAULT_PATH, snapshot_every=SNAPSHOT_EVERY):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        # 커밋은 쓰기 스레드에서만 하므로 fsync(synchronous=FULL) 가 저장하는 쪽을 막지 않음
+        self._conn = connect(path, self.SCHEMA, synchronous="FULL")
+        # 연결은 쓰기 스레드와 읽기(복원/감사)가 함께 쓰므로 락으로 보호
+        self._db_lock = threading.Lock()
+        self._cond = threading.Condition()
+        self._queue = []
+        # 번호표: 넣은 이벤트 수 / 디스크에 닿은 이벤트 수
+        self._appended = 0
+        self._committed = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="timetable-journal", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # 쓰기
+    def append(self, actor, student, date, kind, items, wait=True):
+        """items: {key: value}. wait 이면 이 이벤트들이 커밋될 때까지 기다림"""
+        if not items:
+            return
+        ts = time.time()
+        rows = [(ts, actor, student, str(date), kind, str(key), _dumps(value)) for key, value in items.items()]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("닫힌 변경 기록입니다")
+            self._queue.extend(rows)
+            self._appended += len(rows)
+            ticket = self._appended
+            self._cond.notify_all()
+            if wait:
+                self._cond.wait_for(lambda: self._committed >= ticket or self._closed)
+
+    def flush(self):
+        """지금까지 넣은 이벤트가 모두 커밋될 때까지 기다림"""
+        with self._cond:
+            ticket = self._appended
+            self._cond.wait_for(lambda: self._committed >= ticket or self._closed)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._closed)
+                if not self._queue:
+                    return
+                batch, self._queue = self._queue, []
+            try:
+                self._commit(batch)
+            except Exception:
+                # 기록이 저장을 막지는 않음: 남기지 못한 묶음은 로그로만 알림
+                logger.exception("변경 기록 %d건을 쓰지 못했습니다", len(batch))
+            with self._cond:
+                self._committed += len(batch)
+                self._cond.notify_all()
+
+    def _commit(self, batch):
+        days = {(row[2], row[3]) for row in batch}
+        with self._db_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO events (ts, actor, student, date, kind, key, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    batch,
+                )
+                for student, date in days:
+                    self._maybe_snapshot(student, date)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _maybe_snapshot(self, student, date):
+        """스냅샷 이후 이벤트가 snapshot_every 개 이상이면 지금 상태를 스냅샷으로 (락 안에서 호출)"""
+        base = self._snapshot_seq(student, date)
+        (count,) = self._conn.execute(
+            "SELECT COUNT(*) FROM events WHERE student = ? AND date = ? AND seq > ?", (student, date, base)
+        ).fetchone()
+        if count < self.snapshot_every:
+            return
+        seq, state = self._replay(student, date)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO snapshots (student, date, seq, state) VALUES (?, ?, ?, ?)",
+            (student, date, seq, _dumps(state)),
+        )
+
+    # 읽기
+    def _snapshot_seq(self, student, date):
+        row = self._conn.execute(
+            "SELECT seq FROM snapshots WHERE student = ? AND date = ?", (student, date)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def _replay(self, student, date):
+        """스냅샷 + 그 뒤 이벤트 -> (마지막 seq, 하루 상태)"""
+        row = self._conn.execute(
+            "SELECT seq, state FROM snapshots WHERE student = ? AND date = ?", (student, date)
+        ).fetchone()
+        seq, state = (row[0], json.loads(row[1])) if row else (0, {PERIOD: {}, ENTRY: {}})
+        for seq, kind, key, data in self._conn.execute(
+            "SELECT seq, kind, key, data FROM events WHERE student = ? AND date = ? AND seq > ? ORDER BY seq",
+            (student, date, seq),
+        ):
+            state[kind][key] = json.loads(data)
+        return seq, state
+
+    def restore_day(self, student, date):
+        """하루 상태를 되살림 -> (교시 기록 {period: dict}, 하루 항목 {kind: value})"""
+        self.flush()
+        with self._db_lock:
+            _, state = self._replay(student, str(date))
+        return {int(k): v for k, v in state[PERIOD].items()}, state[ENTRY]
+
+    def recover_into(self, storage, student, date):
+        """되살린 하루를 저장소에 다시 씀 (지연 쓰기 중 비정상 종료 뒤 복구용)"""
+        records, entries = self.restore_day(student, date)
+        storage.save_periods(student, date, records)
+        storage.save_entries(student, date, entries)
+        return len(records) + len(entries)
+
+    def history(self, student, date, kind=None, key=None):
+        """하루의 이벤트 목록 (오래된 순) -> [{"seq", "ts", "actor", "kind", "key", "value"}]"""
+        sql = "SELECT seq, ts, actor, kind, key, data FROM events WHERE student = ? AND date = ?"
+        args = [student, str(date)]
+        if kind is not None:
+            sql += " AND kind = ?"
+            args.append(kind)
+        if key is not None:
+            sql += " AND key = ?"
+            args.append(str(key))
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(sql + " ORDER BY seq", args).fetchall()
+        return [
+            {"seq": seq, "ts": ts, "actor": actor, "kind": kind, "key": key, "value": json.loads(data)}
+            for seq, ts, actor, kind, key, data in rows
+        ]
+
+    def signature_unlocks(self, date_from, date_to, students=None):
+        """기간 안에 서명 잠금이 풀린 이벤트 -> [(date, student, period, ts, actor)] (최근 순)
+
+        같은 교시의 바로 앞 이벤트가 잠금 상태였는데 이번 이벤트에서 풀린 경우만 셉니다.
+        이벤트의 date 는 기록한 날이 아니라 기록 대상 날짜이므로 그 교시의 이력은
+        범위 안에 모두 들어 있습니다.
+        """
+        self.flush()
+        with self._db_lock:
+            rows = self._conn.execute(
+                "SELECT student, date, key, ts, actor, data FROM events"
+                " WHERE date BETWEEN ? AND ? AND kind = ? ORDER BY student, date, key, seq",
+                (str(date_from), str(date_to), PERIOD),
+            ).fetchall()
+        wanted = set(students) if students is not None else None
+        unlocks = []
+        last = {}
+        for student, date, key, ts, actor, data in rows:
+            if wanted is not None and student not in wanted:
+                continue
+            locked = bool(json.loads(data).get("sign_locked"))
+            if last.get((student, date, key)) and not locked:
+                unlocks.append((date, student, int(key), ts, actor))
+            last[(student, date, key)] = locked
+        unlocks.sort(key=lambda row: row[3], reverse=True)
+        return unlocks
+
+    def close(self):
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=5)
+        with self._db_lock:
+            self._conn.close()
+
+
+class JournaledStorage(ForwardingStorage):
+    """inner 에 저장한 뒤 같은 변경을 journal 에 남기는 래퍼.
+
+    actor 는 이벤트를 남긴 사람을 돌려주는 함수입니다 (페이지에서는 학생 이름과 세션).
+    """
+
+    def __init__(self, inner, journal, actor=lambda: ""):
+        super().__init__(inner)
+        self.journal = journal
+        self.actor = actor
+
+    def save_periods(self, student, date, records):
+        self.inner.save_periods(student, date, records)
+        self.journal.append(self.actor(), student, date, PERIOD, records, wait=False)
+
+    def save_entries(self, student, date, entries):
+        self.inner.save_entries(student, date, entries)
+        self.journal.append(self.actor(), student, date, ENTRY, entries, wait=False)
+
+    def save_period_rows(self, rows):
+        rows = list(rows)
+        self.inner.save_period_rows(rows)
+        self._append_rows(PERIOD, rows)
+
+    def save_entry_rows(self, rows):
+        rows = list(rows)
+        self.inner.save_entry_rows(rows)
+        self._append_rows(ENTRY, rows)
+
+    def save_rows(self, period_rows, entry_rows):
+        period_rows, entry_rows = list(period_rows), list(entry_rows)
+        self.inner.save_rows(period_rows, entry_rows)
+        self._append_rows(PERIOD, period_rows)
+        self._append_rows(ENTRY, entry_rows)
+
+    def _append_rows(self, kind, rows):
+        actor = self.actor()
+        days = {}
+        for student, date, key, value in rows:
+            days.setdefault((student, str(date)), {})[key] = value
+        # 하루씩 넣되 커밋은 마지막에 한 번만 기다림
+        for (student, date), items in days.items():
+            self.journal.append(actor, student, date, kind, items, wait=False)
+        self.journal.flush()
+
+    def close(self):
+        try:
+            self.inner.close()
+        finally:
+            self.journal.close()
+
+
+def journal_from_env(storage, actor=lambda: ""):
+    """TIMETABLE_JOURNAL 경로에 변경 기록을 남기는 저장소 (설정하지 않으면 그대로)"""
+    path = os.environ.get("TIMETABLE_JOURNAL", "")
+    return JournaledStorage(storage, Journal(path), actor) if path else storage
@@ -0,0 +1,343 @@
+"""학생별 장기 추이 (연속 수업준비완료 일수, 최근 7/30일 비율).
+
+상담 화면에서 학생마다 저장된 모든 날짜를 다시 훑지 않도록, 교시 기록/주말 일과가
+저장될 때마다 (student, date) 하루 행의 카운터만 고칩니다.
+
+- 하루 행에는 교시마다 요약 표와 같은 기준의 플래그 비트(이동/준비물/선생님확인/
+  수업준비완료, 점심은 먹기/양치)와 주말 일과 (전체, 완료) 수를 두고, 그 합계를
+  열로 보관합니다. 교시 하나가 바뀌면 그 교시 비트만 바꾸고 하루 합계를 다시
+  더하므로 저장 한 번의 비용은 기록 기간과 상관없습니다.
+- 연속 일수(streak)는 저장하지 않고 읽을 때 셉니다. 덜 끝난 수업일만 담는 부분
+  인덱스로 마지막으로 끊긴 날을 찾고, 그 뒤의 수업일 수를 세므로 예전 날짜를
+  고쳐도 뒤쪽 날짜를 다시 쓰지 않습니다.
+- 7/30일 비율은 기간 안의 하루 행(최대 30개)만 읽어 더합니다. 추이 그래프는 ring
+  buffer(deque) 로 창을 밀며 날짜마다 비율을 구합니다.
+
+수업 수는 저장된 수업 기록에 그 요일 기본 시간표에만 있는 교시를 더해 셉니다.
+TIMETABLE_METRICS 에 파일 경로를 주면 켜집니다 (기본은 꺼짐).
+"""
+import json
+import os
+import threading
+from collections import deque
+from datetime import date as date_cls, timedelta
+
+from timetable.schedule import LUNCH_NAME
+from timetable.sqlite_db import connect, transaction
+from timetable.storage import ForwardingStorage
+from timetable.templates import TIMETABLE, day_template
+
+DEFAULT_PATH = "timetable_metrics.db"
+# 하루 행 형식이 바뀌면 올림 (하루 행은 저장소에서 다시 만들 수 있으므로 지우고 다시 만듦)
+SCHEMA_VERSION = 2
+WEEKEND_KINDS = ("weekend_m", "weekend_a")
+
+# 교시 플래그 비트
+LUNCH, MOVE, READY, SIGNED, DONE, EAT, BRUSH = (1 << i for i in range(7))
+
+# 하루 합계 열 (days 테이블 열 순서와 같음)
+COUNT_COLUMNS = ("lessons", "move", "ready", "signed", "done", "lunch", "eat", "brush", "wk_total", "wk_done")
+
+# 비율: 이름 -> (분자 열, 분모 열)
+RATES = {
+    "이동": ("move", "lessons"),
+    "준비물": ("ready", "lessons"),
+    "선생님확인": ("signed", "lessons"),
+    "수업준비완료": ("done", "lessons"),
+    "점심 먹기": ("eat", "lunch"),
+    "양치": ("brush", "lunch"),
+    "주말 일과": ("wk_done", "wk_total"),
+}
+WINDOWS = (7, 30)
+
+
+def period_bits(record):
+    """교시 기록 -> 플래그 비트 (선생님확인은 잠금 + 서명이 있을 때만)"""
+    if record.get("name") == LUNCH_NAME:
+        return LUNCH | (EAT if record.get("eat") else 0) | (BRUSH if record.get("brush") else 0)
+    bits = 0
+    if record.get("move_done"):
+        bits |= MOVE
+    if record.get("ready"):
+        bits |= READY
+    if record.get("sign_locked") and record.get("sign") is not None:
+        bits |= SIGNED
+    if record.get("done"):
+        bits |= DONE
+    return bits
+
+
+def task_counts(items):
+    """주말 일과 목록 -> [전체, 완료]"""
+    items = [item for item in items or () if isinstance(item, dict)]
+    return [len(items), sum(1 for item in items if item.get("done"))]
+
+
+def day_counts(periods, entries):
+    """{교시: 비트}, {kind: [전체, 완료]} -> COUNT_COLUMNS 순서의 합계"""
+    counts = dict.fromkeys(COUNT_COLUMNS, 0)
+    for bits in periods.values():
+        if bits & LUNCH:
+            counts["lunch"] += 1
+            counts["eat"] += bool(bits & EAT)
+            counts["brush"] += bool(bits & BRUSH)
+            continue
+        counts["lessons"] += 1
+        for flag, col in ((MOVE, "move"), (READY, "ready"), (SIGNED, "signed"), (DONE, "done")):
+            counts[col] += bool(bits & flag)
+    for total, done in entries.values():
+        counts["wk_total"] += total
+        counts["wk_done"] += done
+    return tuple(counts[col] for col in COUNT_COLUMNS)
+
+
+def _complete(counts):
+    lessons, done = counts[0], counts[4]
+    return int(lessons > 0 and done >= lessons)
+
+
+class MetricsStore:
+    """(student, date) 하루 카운터 + 연속 일수 (SQLite)"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS days (
+        student TEXT NOT NULL,
+        date TEXT NOT NULL,
+        periods TEXT NOT NULL,
+        entries TEXT NOT NULL,
+        lessons INTEGER NOT NULL,
+        move INTEGER NOT NULL,
+        ready INTEGER NOT NULL,
+        signed INTEGER NOT NULL,
+        done INTEGER NOT NULL,
+        lunch INTEGER NOT NULL,
+        eat INTEGER NOT NULL,
+        brush INTEGER NOT NULL,
+        wk_total INTEGER NOT NULL,
+        wk_done INTEGER NOT NULL,
+        complete INTEGER NOT NULL,
+        PRIMARY KEY (student, date)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_days_breaks ON days (student, date) WHERE lessons > 0 AND complete = 0;
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path, self.SCHEMA, version=SCHEMA_VERSION, tables=("days", "meta"))
+
+    def _transaction(self):
+        return transaction(self._conn, self._lock)
+
+    # 쓰기
+    def update(self, student, date, periods=None, entries=None, template_lessons=None):
+        """저장된 교시 기록 {period: dict} / 하루 항목 {kind: value} 를 하루 행에 반영"""
+        self.update_days({(student, str(date)): (periods or {}, entries or {})}, template_lessons)
+
+    def update_days(self, days, template_lessons=None):
+        """{(student, date): ({period: dict}, {kind: value})} 를 한 트랜잭션으로 반영
+
+        template_lessons(student, date) 는 그 요일 기본 시간표의 교시 번호들로, 하루에
+        교시 기록이 처음 들어올 때만 불러 저장되지 않은 교시를 덜 끝난 수업으로 셉니다.
+        """
+        with self._transaction() as conn:
+            for (student, date), (periods, entries) in sorted(days.items()):
+                self._apply(conn, student, str(date), periods, entries, template_lessons)
+
+    def _apply(self, conn, student, date, periods, entries, template_lessons):
+        row = conn.execute("SELECT periods, entries FROM days WHERE student = ? AND date = ?", (student, date)).fetchone()
+        period_map, entry_map = (json.loads(row[0]), json.loads(row[1])) if row else ({}, {})
+        if periods and not period_map and template_lessons is not None:
+            period_map = {str(period): 0 for period in template_lessons(student, date)}
+        for period, record in periods.items():
+            period_map[str(period)] = period_bits(record)
+        for kind, value in entries.items():
+            if kind in WEEKEND_KINDS:
+                entry_map[kind] = task_counts(value)
+        counts = day_counts(period_map, entry_map)
+        conn.execute(
+            f"INSERT OR REPLACE INTO days (student, date, periods, entries, {', '.join(COUNT_COLUMNS)}, complete)"
+            f" VALUES (?, ?, ?, ?, {', '.join('?' * len(COUNT_COLUMNS))}, ?)",
+            (student, date, json.dumps(period_map, sort_keys=True), json.dumps(entry_map, sort_keys=True),
+             *counts, _complete(counts)),
+        )
+
+    def needs_rebuild(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM meta WHERE key = 'built'").fetchone() is None
+
+    def rebuild(self, storage, batch_size=5000):
+        """저장소의 교시 기록/주말 일과 전체로 하루 행을 다시 만듦 (처음 켤 때 한 번)"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM days")
+        count = 0
+        template_lessons = TemplateLessons(storage)
+        for batch in storage.iter_period_rows(batch_size=batch_size):
+            days = {}
+            for student, date, period, record in batch:
+                days.setdefault((student, date), ({}, {}))[0][period] = record
+            self.update_days(days, template_lessons)
+            count += len(batch)
+        for batch in storage.iter_entry_rows(WEEKEND_KINDS, batch_size=batch_size):
+            days = {}
+            for student, date, kind, value in batch:
+                days.setdefault((student, date), ({}, {}))[1][kind] = value
+            self.update_days(days)
+            count += len(batch)
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('built', ?)", (str(count),))
+        return count
+
+    # 읽기
+    def load_days(self, students, date_from, date_to):
+        """{student: [(date, {열: 값})]} (날짜 순). 학생마다 (student, date) 기본키 범위 조회"""
+        result = {}
+        with self._lock:
+            for student in students:
+                rows = self._conn.execute(
+                    f"SELECT date, {', '.join(COUNT_COLUMNS)} FROM days"
+                    " WHERE student = ? AND date BETWEEN ? AND ? ORDER BY date",
+                    (student, str(date_from), str(date_to)),
+                ).fetchall()
+                result[student] = [(row[0], dict(zip(COUNT_COLUMNS, row[1:]))) for row in rows]
+        return result
+
+    def current_streak(self, student, day):
+        """day 까지 연속으로 수업준비를 모두 끝낸 수업일 수
+
+        마지막으로 덜 끝난 수업일은 부분 인덱스(idx_days_breaks)에서 바로 찾고,
+        그 뒤 수업일만 기본키 범위로 셉니다 (연속 일수만큼만 읽음).
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(date) FROM days WHERE student = ? AND date <= ? AND lessons > 0 AND complete = 0",
+                (student, str(day)),
+            ).fetchone()
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM days WHERE student = ? AND date > ? AND date <= ? AND lessons > 0",
+                (student, row[0] or "", str(day)),
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def window_rates(days, day, window):
+    """day 까지 window 일 동안의 비율(%) {이름: 값 또는 None}. days: load_days 의 한 학생 목록"""
+    start = (day - timedelta(days=window - 1)).isoformat()
+    end = day.isoformat()
+    sums = dict.fromkeys(COUNT_COLUMNS, 0)
+    for date, counts in days:
+        if start <= date <= end:
+            for col in COUNT_COLUMNS:
+                sums[col] += counts[col]
+    return {name: _rate(sums[num], sums[den]) for name, (num, den) in RATES.items()}
+
+
+def rolling_series(days, date_from, date_to, window=7):
+    """날짜마다 직전 window 일의 비율 -> [(date, 이름, 값)] (altair long format)
+
+    창에 들어오는 날의 합계를 더하고 빠지는 날을 빼는 ring buffer 로 날짜당 O(1).
+    """
+    by_date = dict(days)
+    ring = deque()
+    sums = dict.fromkeys(COUNT_COLUMNS, 0)
+    series = []
+    day = date_from - timedelta(days=window - 1)
+    while day <= date_to:
+        counts = by_date.get(day.isoformat())
+        ring.append(counts)
+        if counts:
+            for col in COUNT_COLUMNS:
+                sums[col] += counts[col]
+        if len(ring) > window:
+            old = ring.popleft()
+            if old:
+                for col in COUNT_COLUMNS:
+                    sums[col] -= old[col]
+        if day >= date_from:
+            for name, (num, den) in RATES.items():
+                value = _rate(sums[num], sums[den])
+                if value is not None:
+                    series.append((day, name, value))
+        day += timedelta(days=1)
+    return series
+
+
+def _rate(num, den):
+    return round(num / den * 100, 1) if den else None
+
+
+def template_lessons(template, date):
+    """그 날짜 요일 기본 시간표의 교시 번호들"""
+    return day_template(template, date_cls.fromisoformat(str(date)).weekday()).keys()
+
+
+class TemplateLessons:
+    """rebuild 용 template_lessons (학생마다 템플릿을 한 번만 읽음)"""
+
+    def __init__(self, storage):
+        self.storage = storage
+        self._templates = {}
+
+    def __call__(self, student, date):
+        if student not in self._templates:
+            self._templates[student] = self.storage.load_template(student, TIMETABLE)
+        return template_lessons(self._templates[student], date)
+
+
+class MetricsStorage(ForwardingStorage):
+    """inner 에 저장한 뒤 같은 변경으로 학생별 하루 카운터를 고치는 래퍼"""
+
+    def __init__(self, inner, metrics):
+        super().__init__(inner)
+        self.metrics = metrics
+
+    def _template_lessons(self, student, date):
+        # 하루에 교시 기록이 처음 들어올 때만 불리므로 템플릿을 매번 새로 읽음
+        return template_lessons(self.inner.load_template(student, TIMETABLE), date)
+
+    def save_periods(self, student, date, records):
+        self.inner.save_periods(student, date, records)
+        if records:
+            self.metrics.update(student, date, periods=records, template_lessons=self._template_lessons)
+
+    def save_entries(self, student, date, entries):
+        self.inner.save_entries(student, date, entries)
+        if any(kind in WEEKEND_KINDS for kind in entries):
+            self.metrics.update(student, date, entries=entries)
+
+    def save_period_rows(self, rows):
+        self.save_rows(rows, ())
+
+    def save_entry_rows(self, rows):
+        self.save_rows((), rows)
+
+    def save_rows(self, period_rows, entry_rows):
+        period_rows, entry_rows = list(period_rows), list(entry_rows)
+        self.inner.save_rows(period_rows, entry_rows)
+        days = {}
+        for student, date, period, record in period_rows:
+            days.setdefault((student, str(date)), ({}, {}))[0][period] = record
+        for student, date, kind, value in entry_rows:
+            if kind in WEEKEND_KINDS:
+                days.setdefault((student, str(date)), ({}, {}))[1][kind] = value
+        if days:
+            self.metrics.update_days(days, self._template_lessons)
+
+    def close(self):
+        try:
+            self.inner.close()
+        finally:
+            self.metrics.close()
+
+
+def metrics_from_env():
+    """TIMETABLE_METRICS 경로의 추이 저장소 (설정하지 않으면 None)"""
+    path = os.environ.get("TIMETABLE_METRICS", "")
+    return MetricsStore(path) if path else None
@@ -0,0 +1,142 @@
+"""rerun 단위 렌더링 비용 측정.
+
+TIMETABLE_PROFILE=1 환경 변수나 ?profile=1 쿼리로 켭니다. 켜져 있으면
+구간(section)별 실행 시간과 브라우저로 보낸 요소(delta) 수, rerun 끝의
+session_state 크기를 기록해 사이드바 디버그 패널에 보여 주고,
+TIMETABLE_PROFILE_LOG 파일(기본 profile.jsonl)에 JSON 한 줄씩 덧붙입니다.
+
+스크립트가 위에서 아래로 흐르는 구조라 with 블록 대신 구간 경계마다
+section() 을 호출하는 방식을 씁니다. 꺼져 있을 때는 아무 일도 하지 않는
+객체가 반환됩니다.
+
+요소 수는 rerun 동안 ScriptRunContext 의 enqueue 를 감싸서 셉니다. rerun 이 예외나
+st.rerun/st.stop 으로 끊겨 finish() 까지 가지 못하면 감싼 함수가 남으므로,
+start_profiler() 는 (꺼져 있어도) 먼저 남아 있는 것을 원래 enqueue 로 되돌립니다.
+"""
+import collections
+import json
+import os
+import threading
+import time
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from timetable.state import DateStateManager
+
+DEFAULT_LOG = "profile.jsonl"
+
+_log_lock = threading.Lock()
+
+
+def profiling_enabled():
+    if os.environ.get("TIMETABLE_PROFILE", "") not in ("", "0"):
+        return True
+    return st.query_params.get("profile", "") not in ("", "0")
+
+
+class _NullProfiler:
+    def section(self, name):
+        pass
+
+    def finish(self):
+        pass
+
+
+class RerunProfiler:
+    """한 번의 rerun 을 구간별로 측정"""
+
+    def __init__(self, page):
+        self.page = page
+        self.sections = []
+        self._current = None
+        self._counts = collections.Counter()
+        self._ctx = get_script_run_ctx()
+        self._orig_enqueue = None
+        _restore_enqueue(self._ctx)
+        if self._ctx is not None:
+            # 브라우저로 나가는 메시지를 세기 위해 이번 rerun 동안만 enqueue 를 감쌈
+            self._orig_enqueue = self._ctx._enqueue
+            self._ctx._enqueue = self._counting_enqueue
+        self._started = time.perf_counter()
+
+    def _counting_enqueue(self, msg):
+        if msg.WhichOneof("type") == "delta":
+            delta = msg.delta
+            kind = delta.WhichOneof("type")
+            if kind == "new_element":
+                kind = delta.new_element.WhichOneof("type")
+            self._counts[kind] += 1
+        self._orig_enqueue(msg)
+
+    def _close_current(self):
+        if self._current is None:
+            return
+        name, started = self._current
+        self.sections.append({
+            "name": name,
+            "ms": round((time.perf_counter() - started) * 1000, 3),
+            "elements": dict(self._counts),
+        })
+        self._counts = collections.Counter()
+        self._current = None
+
+    def section(self, name):
+        """직전 구간을 닫고 새 구간을 시작"""
+        self._close_current()
+        self._current = (name, time.perf_counter())
+
+    def finish(self):
+        self._close_current()
+        if self._orig_enqueue is not None:
+            self._ctx._enqueue = self._orig_enqueue
+            self._orig_enqueue = None
+
+        memory = DateStateManager().memory_usage()
+        record = {
+            "ts": time.time(),
+            "page": self.page,
+            "session": getattr(self._ctx, "session_id", None),
+            "total_ms": round((time.perf_counter() - self._started) * 1000, 3),
+            "elements": sum(sum(s["elements"].values()) for s in self.sections),
+            "session_state_bytes": memory["total"],
+            "session_state_dates": memory["dates"],
+            "sections": self.sections,
+        }
+        self._write_log(record)
+        self._render_panel(record)
+        return record
+
+    @staticmethod
+    def _write_log(record):
+        path = os.environ.get("TIMETABLE_PROFILE_LOG", DEFAULT_LOG)
+        line = json.dumps(record, ensure_ascii=False)
+        with _log_lock, open(path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    @staticmethod
+    def _render_panel(record):
+        with st.sidebar.expander("🛠 렌더링 프로파일", expanded=False):
+            st.caption(
+                f"전체 {record['total_ms']:.1f}ms · 요소 {record['elements']}개 · "
+                f"session_state {record['session_state_bytes'] / 1024:.1f}KB "
+                f"(날짜 {len(record['session_state_dates'])}개)"
+            )
+            st.table([
+                {"구간": s["name"], "ms": s["ms"], "요소": sum(s["elements"].values())}
+                for s in record["sections"]
+            ])
+
+
+def _restore_enqueue(ctx):
+    """이전 rerun 의 프로파일러가 감싼 채로 남긴 enqueue 를 원래 함수로 되돌림"""
+    while ctx is not None and isinstance(getattr(ctx._enqueue, "__self__", None), RerunProfiler):
+        ctx._enqueue = ctx._enqueue.__self__._orig_enqueue
+
+
+def start_profiler(page):
+    """프로파일링이 켜져 있으면 RerunProfiler, 아니면 아무 일도 하지 않는 객체"""
+    _restore_enqueue(get_script_run_ctx())
+    if profiling_enabled():
+        return RerunProfiler(page)
+    return _NullProfiler()
@@ -0,0 +1,115 @@
+"""주간/월간 보기용 집계.
+
+기간의 기록을 저장소에서 한 번의 질의(load_period_range / load_entry_range)로
+읽은 뒤 날짜별로 묶어, 하루 화면의 위젯 로직을 다시 돌리지 않고 표와 달력을
+그릴 값만 만듭니다. 결과는 render 모듈의 캐시 함수에 넘기도록 튜플로 돌려줍니다.
+"""
+import calendar
+from datetime import date as date_cls, timedelta
+
+from timetable.schedule import LUNCH_NAME
+from timetable.templates import day_template
+from timetable.timeslots import NO_TIME, format_minutes, parse_minutes
+
+WEEKDAYS = (0, 1, 2, 3, 4)
+WEEKEND_DAYS = (5, 6)
+WEEKDAY_LABELS = ["월", "화", "수", "목", "금", "토", "일"]
+WEEKEND_KINDS = (("weekend_m", "오전일과"), ("weekend_a", "오후일과"))
+
+
+def week_dates(day, weekdays=WEEKDAYS):
+    """day 가 속한 주(월요일 시작)에서 weekdays 에 해당하는 날짜 목록"""
+    monday = day - timedelta(days=day.weekday())
+    return [monday + timedelta(days=d) for d in weekdays]
+
+
+def month_bounds(year, month):
+    return date_cls(year, month, 1), date_cls(year, month, calendar.monthrange(year, month)[1])
+
+
+def day_label(day):
+    return f"{day.month}/{day.day}({WEEKDAY_LABELS[day.weekday()]})"
+
+
+def _by_date(rows):
+    days = {}
+    for _, day, key, data in rows:
+        days.setdefault(day, {})[key] = data
+    return days
+
+
+def period_week_grid(rows, periods, dates, template=None):
+    """한 학생의 교시 기록 -> ((교시명, ((과목, 완료), ...날짜별)), ...). 요일 템플릿이 있으면 그 위에 얹음"""
+    days = _by_date(rows)
+    day_templates = {day: day_template(template, day.weekday()) for day in dates}
+    grid = []
+    for idx, period in enumerate(periods):
+        cells = []
+        for day in dates:
+            record = {**day_templates[day].get(idx, {}), **days.get(day.isoformat(), {}).get(idx, {})}
+            if period["name"] == LUNCH_NAME:
+                cells.append((("🍱", bool(record.get("done"))),))
+            else:
+                cells.append(((record.get("subject") or "—", bool(record.get("done"))),))
+        grid.append((period["name"], tuple(cells)))
+    return tuple(grid)
+
+
+def weekend_week_grid(rows, dates, template=None):
+    """한 학생의 주말 일과 -> ((오전일과/오후일과, ((("09:00 청소", 완료), ...), ...날짜별)), ...)
+
+    저장된 일과가 없는 날짜는 요일 기본 일과를 보여 줍니다.
+    """
+    days = _by_date(rows)
+    grid = []
+    for kind, label in WEEKEND_KINDS:
+        cells = []
+        for day in dates:
+            items = days.get(day.isoformat(), {}).get(kind) or day_template(template, day.weekday()).get(kind) or []
+            # 시간은 분(int) 으로 저장됨 (예전 "HH:MM" 도 허용), 시간이 없으면 맨 뒤
+            timed = sorted(
+                ((parse_minutes(item.get("time")), item) for item in items),
+                key=lambda entry: NO_TIME if entry[0] is None else entry[0],
+            )
+            cells.append(tuple(
+                (f"{format_minutes(minutes)} {item.get('title') or '(제목 없음)'}".strip(), bool(item.get("done")))
+                for minutes, item in timed
+            ))
+        grid.append((label, tuple(cells)))
+    return tuple(grid)
+
+
+def daily_completion(rows, lesson_count=None, students=()):
+    """교시 기록 -> {날짜: 완료율(%)}. 완료율은 학생별 (완료 수업 / 수업 수) 의 평균.
+
+    lesson_count 가 없으면 그날 가장 많이 기록된 수업 수를 씁니다.
+    students 를 주면 기록이 없는 학생도 0% 로 평균에 넣습니다.
+    """
+    days = {}
+    for student, day, _, data in rows:
+        counts = days.setdefault(day, {}).setdefault(student, [0, 0])
+        if data.get("name") == LUNCH_NAME:
+            continue
+        counts[1] += 1
+        if data.get("done"):
+            counts[0] += 1
+    result = {}
+    for day, counts in days.items():
+        total = lesson_count or max(lessons for _, lessons in counts.values())
+        if total <= 0:
+            continue
+        members = set(counts) | set(students)
+        done = sum(min(counts[s][0], total) for s in members if s in counts)
+        result[day] = round(done / (total * len(members)) * 100, 1)
+    return result
+
+
+def month_heatmap_weeks(year, month, completion):
+    """달력 주 단위로 (일, 완료율 또는 None) 를 묶은 튜플. 달에 속하지 않는 칸은 (0, None)"""
+    weeks = []
+    for week in calendar.monthcalendar(year, month):
+        weeks.append(tuple(
+            (d, completion.get(date_cls(year, month, d).isoformat()) if d else None)
+            for d in week
+        ))
+    return tuple(weeks)
@@ -0,0 +1,144 @@
+"""HTML 조각 렌더링 (입력값이 같으면 캐시된 문자열을 재사용).
+
+요약 표·진행도 배지·점심 완료 표시는 Jinja2 템플릿을 모듈 로드 때 한 번만
+컴파일해 두고, 표 전체를 문자열 하나로 만들어 마크다운 요소 하나로 보냅니다.
+"""
+from functools import lru_cache
+from html import escape
+
+from jinja2 import Environment
+
+CHECK_ON = "<span style='color:#2e7d32;font-weight:700;'>✔</span>"
+CHECK_OFF = "<span style='color:#bbb;font-weight:700;'>—</span>"
+
+
+def _check(label, value):
+    return f"<span style='margin-right:12px;color:#555;'>{label} {CHECK_ON if value else CHECK_OFF}</span>"
+
+
+@lru_cache(maxsize=2048)
+def period_row_html(subject, place, supplies, move_done, ready, signed, sign_uri=None):
+    """접힌 교시용 읽기 전용 한 줄 (위젯/캔버스 없이 마크다운 하나)"""
+    sign_html = (
+        f"<img src='{sign_uri}' style='height:28px;max-width:80px;object-fit:contain;vertical-align:middle;border:1px solid #eee;'/>"
+        if sign_uri else ""
+    )
+    return (
+        "<div style='display:flex;flex-wrap:wrap;align-items:center;gap:4px 16px;padding:6px 10px;"
+        "border:1px solid #eee;border-radius:8px;background:#fafafa;'>"
+        f"<span style='font-weight:700;'>{escape(subject or '—')}</span>"
+        f"<span style='color:#666;'>📍 {escape(place or '—')}</span>"
+        f"<span style='color:#666;'>🎒 {escape(', '.join(supplies) or '—')}</span>"
+        f"{_check('이동', move_done)}{_check('준비물', ready)}{_check('선생님확인', signed)}"
+        f"{sign_html}"
+        "</div>"
+    )
+
+
+_env = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+
+_CELL = (
+    "{% macro cell(value, height=24) %}"
+    "<div style='display:flex;align-items:center;justify-content:center;height:{{ height }}px;"
+    "color:{{ '#2e7d32' if value else '#bbb' }};font-weight:700;'>{{ caller() }}</div>"
+    "{% endmacro %}"
+)
+
+SUMMARY_TEMPLATE = _env.from_string(_CELL + """
+<div style='display:grid;grid-template-columns:repeat(4,1fr);row-gap:6px;align-items:center;'>
+<div><b>교시[교과]</b></div><div><b>이동</b></div><div><b>준비물</b></div><div><b>선생님확인</b></div>
+{% for label, move_done, ready, signed in rows %}
+<div>{{ label }}</div>
+{% call cell(move_done) %}{{ '✔' if move_done else '—' }}{% endcall %}
+{% call cell(ready) %}{{ '✔' if ready else '—' }}{% endcall %}
+{% call cell(signed) %}{{ '✔' if signed else '—' }}{% endcall %}
+{% endfor %}
+</div>
+""")
+
+PROGRESS_TEMPLATE = _env.from_string("""
+<div style="position:fixed;top:10px;right:10px;z-index:9999;background:rgba(255,255,255,0.9);padding:8px 16px;border-radius:20px;border:1px solid #eee;box-shadow:0 2px 8px #0001;">
+🏃‍♂️ <b>진행도</b> {{ progress }}/{{ total }}
+<div style="width:120px;height:8px;background:#eee;border-radius:4px;overflow:hidden;margin-top:4px;">
+<div style="width:{{ percent }}%;height:100%;background:#4CAF50;"></div>
+</div>
+</div>
+""")
+
+LUNCH_DONE_TEMPLATE = _env.from_string(
+    _CELL + "{% call cell(done, 28) %}{{ '✅' if done else '—' }} 점심시간 완료{% endcall %}"
+)
+
+
+@lru_cache(maxsize=512)
+def summary_table_html(rows):
+    """오늘 하루 요약 표 전체. rows: ((교시[교과], 이동, 준비물, 선생님확인), ...)"""
+    return SUMMARY_TEMPLATE.render(rows=rows)
+
+
+@lru_cache(maxsize=256)
+def progress_badge_html(progress, total):
+    """상단 고정 진행도 배지 (total 은 0보다 커야 함)"""
+    return PROGRESS_TEMPLATE.render(progress=progress, total=total, percent=int(progress / total * 100))
+
+
+@lru_cache(maxsize=2)
+def lunch_done_html(done):
+    return LUNCH_DONE_TEMPLATE.render(done=done)
+
+
+WEEK_GRID_TEMPLATE = _env.from_string("""
+<div style='display:grid;grid-template-columns:minmax(80px,1fr) repeat({{ headers|length }},2fr);gap:4px;font-size:14px;'>
+<div></div>{% for header in headers %}<div style='font-weight:700;text-align:center;'>{{ header }}</div>{% endfor %}
+{% for label, cells in rows %}
+<div style='font-weight:600;'>{{ label }}</div>
+{% for cell in cells %}
+<div style='border:1px solid #eee;border-radius:6px;padding:4px 6px;background:#fafafa;'>
+{% for text, done in cell %}<div style='color:{{ '#2e7d32' if done else '#555' }};'>{{ '✔' if done else '·' }} {{ text }}</div>{% else %}<div style='color:#bbb;'>—</div>{% endfor %}
+</div>
+{% endfor %}
+{% endfor %}
+</div>
+""")
+
+MONTH_HEATMAP_TEMPLATE = _env.from_string("""
+<div style='display:grid;grid-template-columns:repeat(7,1fr);gap:4px;max-width:420px;'>
+{% for label in ['월', '화', '수', '목', '금', '토', '일'] %}<div style='text-align:center;font-weight:700;'>{{ label }}</div>{% endfor %}
+{% for week in weeks %}{% for day, percent in week %}
+{% if not day %}<div></div>
+{% elif percent is none %}<div title='기록 없음' style='height:40px;border-radius:6px;background:#f2f2f2;color:#999;padding:2px 4px;font-size:12px;'>{{ day }}</div>
+{% else %}<div title='{{ percent }}%' style='height:40px;border-radius:6px;background:rgba(76,175,80,{{ '%.2f'|format(0.15 + percent / 100 * 0.85) }});color:{{ '#fff' if percent >= 60 else '#333' }};padding:2px 4px;font-size:12px;'>{{ day }}<br><b>{{ percent|round|int }}%</b></div>
+{% endif %}
+{% endfor %}{% endfor %}
+</div>
+""")
+
+
+TASK_TABLE_TEMPLATE = _env.from_string("""
+<table style='width:100%;border-collapse:collapse;font-size:14px;'>
+<thead><tr style='border-bottom:1px solid #ddd;'><th></th><th style='text-align:left;'>일과명</th><th style='text-align:left;'>장소명</th><th>시간</th><th>완료</th></tr></thead>
+<tbody>
+{% for title, place, time, done in rows %}
+<tr style='border-bottom:1px solid #f0f0f0;'><td style='color:#999;'>{{ loop.index }}</td><td>{{ title }}</td><td>{{ place }}</td><td style='text-align:center;'>{{ time }}</td><td style='text-align:center;'>{{ '✅' if done else '—' }}</td></tr>
+{% endfor %}
+</tbody>
+</table>
+""")
+
+
+@lru_cache(maxsize=256)
+def task_table_html(rows):
+    """주말 일과 요약 표 (pandas 없이). rows: ((일과명, 장소명, "HH:MM", 완료), ...)"""
+    return TASK_TABLE_TEMPLATE.render(rows=rows)
+
+
+@lru_cache(maxsize=128)
+def week_grid_html(headers, rows):
+    """주간 표. headers: 날짜 라벨, rows: ((행 라벨, ((내용, 완료), ...) 칸별), ...)"""
+    return WEEK_GRID_TEMPLATE.render(headers=headers, rows=rows)
+
+
+@lru_cache(maxsize=128)
+def month_heatmap_html(weeks):
+    """월간 완료율 달력. weeks: range_views.month_heatmap_weeks 결과"""
+    return MONTH_HEATMAP_TEMPLATE.render(weeks=weeks)
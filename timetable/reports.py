@@ -0,0 +1,351 @@
+"""학생별 하루/주간 보고서 (PDF, PNG) 일괄 생성.
+
+저장소에서 기간 기록을 한 번에 읽어 (학생, 날짜) 별 보고서 데이터를 만들고,
+그리기는 ProcessPoolExecutor 의 작업 프로세스들이 나눠 맡습니다. 각 작업
+프로세스는 서명 비트맵을 해시 단위 LRU 캐시에 두어 같은 서명을 다시 그리지 않고,
+끝난 보고서는 순서대로 zip 에 바로 써서 전체 결과를 메모리에 모으지 않습니다.
+
+PDF/PNG 모두 PIL 로 A4 한 장(주간은 날짜마다 한 장)을 그립니다. 한글 글꼴은
+TIMETABLE_REPORT_FONT 경로나 흔한 시스템 글꼴 위치에서 찾습니다.
+"""
+import logging
+import multiprocessing as mp
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date as date_cls, timedelta
+from functools import lru_cache
+from io import BytesIO
+
+from PIL import Image, ImageDraw, ImageFont
+
+from timetable.range_views import WEEKDAY_LABELS, WEEKEND_KINDS
+from timetable.schedule import LUNCH_NAME
+from timetable.signatures import SignatureStore
+from timetable.templates import TIMETABLE, WEEKEND, day_template, resolve_periods
+from timetable.timeslots import NO_TIME, format_minutes, parse_minutes
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {"pdf": "application/pdf", "png": "image/png"}
+UNITS = ("day", "week")
+
+# A4 (100 dpi)
+DPI = 100
+PAGE_W, PAGE_H = 827, 1169
+MARGIN = 48
+TITLE_SIZE, TEXT_SIZE, SMALL_SIZE = 26, 16, 14
+
+FONT_PATHS = (
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "C:/Windows/Fonts/malgun.ttf",
+)
+
+# 교시 표: (머리글, 보고서 키, 폭)
+PERIOD_COLUMNS = (
+    ("교시", "name", 70), ("과목", "subject", 90), ("장소", "place", 100), ("준비물", "supplies", 190),
+    ("이동", "move_done", 50), ("준비물", "ready", 60), ("선생님 확인", "signed", 120),
+)
+ROW_H = 40
+
+# 작업 프로세스마다 캐시해 둘 서명 비트맵 수
+SIGNATURE_CACHE = 512
+
+ENTRY_KINDS = ("comment",) + tuple(kind for kind, _ in WEEKEND_KINDS)
+
+
+# 보고서 데이터 (본 프로세스)
+
+def select_students(storage, class_name=None, grade=None):
+    """반("2-5") 또는 학년("2" -> "2-*" 반 전체)의 [(학생, 반)]. 둘 다 없으면 반이 없는 학생까지 전체"""
+    if class_name:
+        classes = [class_name]
+    elif grade:
+        classes = [c for c in storage.list_classes() if c.split("-")[0] == str(grade)]
+    else:
+        # list_classes 는 빈 반을 빼므로 반을 정하지 않은 학생("")도 따로 넣음
+        classes = [*storage.list_classes(), ""]
+    return [(student, c) for c in classes for student in storage.list_students(c)]
+
+
+def collect_reports(storage, students, date_from, date_to):
+    """[(학생, 반)] 의 기간 기록 -> 날짜순 하루 보고서 dict 목록 (기록이 있는 날짜만)
+
+    교시는 요일 기본 시간표 전체에 저장된 기록을 얹고, 주말 일과가 없는 날짜에는
+    요일 기본 일과를 씁니다. 결과는 작업 프로세스로 넘길 수 있도록 기본 타입만 씁니다.
+    """
+    classes = dict(students)
+    days = {}
+    for class_name in sorted(set(classes.values())):
+        for student, day, period, data in storage.load_period_range(date_from, date_to, class_name=class_name):
+            if student in classes:
+                days.setdefault((student, day), {"periods": {}, "entries": {}})["periods"][period] = data
+    for student, day, kind, value in storage.load_entry_range(ENTRY_KINDS, date_from, date_to):
+        if student in classes:
+            days.setdefault((student, day), {"periods": {}, "entries": {}})["entries"][kind] = value
+
+    timetable_templates, weekend_templates = {}, {}
+    reports = []
+    for (student, day), found in sorted(days.items(), key=lambda item: (item[0][1], item[0][0])):
+        if student not in timetable_templates:
+            timetable_templates[student] = storage.load_template(student, TIMETABLE)
+            weekend_templates[student] = storage.load_template(student, WEEKEND)
+        weekday = date_cls.fromisoformat(day).weekday()
+        # 저장되지 않은 교시도 요일 기본 시간표로 채워 하루 교시 전체를 보고서에 넣음
+        periods = resolve_periods(day_template(timetable_templates[student], weekday), found["periods"])
+        weekend_tpl = day_template(weekend_templates[student], weekday)
+        reports.append(_day_report(
+            student, classes[student], day,
+            [data for _, data in sorted(periods.items())],
+            {kind: found["entries"].get(kind) or weekend_tpl.get(kind) or [] for kind, _ in WEEKEND_KINDS},
+            found["entries"].get("comment", ""),
+        ))
+    return reports
+
+
+def _day_report(student, class_name, day, records, weekend, comment):
+    periods, lunch = [], None
+    for record in records:
+        if record.get("name") == LUNCH_NAME:
+            lunch = {k: bool(record.get(k)) for k in ("eat", "brush", "done")}
+            continue
+        signed = bool(record.get("sign_locked") and record.get("sign"))
+        periods.append({
+            "name": record.get("name", ""),
+            "subject": record.get("subject", ""),
+            "place": record.get("place", ""),
+            "supplies": ", ".join(record.get("supplies", [])),
+            "move_done": bool(record.get("move_done")),
+            "ready": bool(record.get("ready")),
+            "signed": signed,
+            "sign": record.get("sign") if signed else None,
+        })
+    tasks = {}
+    for kind, items in weekend.items():
+        timed = sorted(
+            ((parse_minutes(item.get("time")), item) for item in items if item.get("title")),
+            key=lambda entry: NO_TIME if entry[0] is None else entry[0],
+        )
+        tasks[kind] = [
+            (format_minutes(minutes), item.get("title", ""), item.get("place", ""), bool(item.get("done")))
+            for minutes, item in timed
+        ]
+    return {
+        "student": student, "class_name": class_name, "date": day,
+        "periods": periods, "lunch": lunch, "weekend": tasks, "comment": comment or "",
+    }
+
+
+def report_jobs(reports, fmt, unit="day"):
+    """보고서 dict -> (zip 안 파일 이름, 페이지 목록, 형식) 작업. 주간은 (학생, 월요일) 로 묶음"""
+    if unit == "day":
+        return [(_filename(r, r["date"], fmt), [r], fmt) for r in reports]
+    weeks = {}
+    for r in reports:
+        day = date_cls.fromisoformat(r["date"])
+        monday = (day - timedelta(days=day.weekday())).isoformat()
+        weeks.setdefault((r["student"], monday), []).append(r)
+    return [
+        (_filename(pages[0], f"{monday}_주간", fmt), pages, fmt)
+        for (_, monday), pages in sorted(weeks.items(), key=lambda item: (item[0][1], item[0][0]))
+    ]
+
+
+def _filename(report, stem, fmt):
+    return f"{report['class_name'] or '반없음'}/{report['student']}/{stem}.{fmt}"
+
+
+# 그리기 (작업 프로세스)
+
+_store = None
+_font_path = None
+
+
+def _init_worker(signature_root, font_path):
+    global _store, _font_path
+    _store = SignatureStore(signature_root)
+    _font_path = font_path
+    _signature_bitmap.cache_clear()
+    _font.cache_clear()
+    _char_width.cache_clear()
+
+
+def find_font():
+    path = os.environ.get("TIMETABLE_REPORT_FONT")
+    if path:
+        return path
+    return next((p for p in FONT_PATHS if os.path.exists(p)), None)
+
+
+@lru_cache(maxsize=8)
+def _font(size):
+    if _font_path:
+        return ImageFont.truetype(_font_path, size)
+    # 한글 글꼴이 없으면 기본 글꼴 (한글은 네모로 보일 수 있음)
+    return ImageFont.load_default(size)
+
+
+@lru_cache(maxsize=SIGNATURE_CACHE)
+def _signature_bitmap(digest):
+    """서명 해시 -> 표 칸에 맞춘 비트맵 (작업 프로세스 안에서 재사용)"""
+    img = _store.image(digest) if _store is not None else None
+    if img is None:
+        return None
+    img.thumbnail((110, 34))
+    return img
+
+
+def _check(draw, x, y, on):
+    if on:
+        draw.line([(x, y + 8), (x + 5, y + 14), (x + 15, y + 1)], fill="#2e7d32", width=3)
+    else:
+        draw.line([(x + 2, y + 8), (x + 13, y + 8)], fill="#bbb", width=2)
+
+
+@lru_cache(maxsize=4096)
+def _char_width(size, ch):
+    return _font(size).getlength(ch)
+
+
+def _wrap(text, size, width):
+    """글자 단위 줄바꿈 (한글은 띄어쓰기 없이도 길 수 있음). 글자 폭은 캐시해 더해 감"""
+    lines = []
+    for paragraph in text.splitlines() or [""]:
+        line, line_width = "", 0
+        for ch in paragraph:
+            w = _char_width(size, ch)
+            if line_width + w > width:
+                lines.append(line)
+                line, line_width = ch, w
+            else:
+                line += ch
+                line_width += w
+        lines.append(line)
+    return lines
+
+
+def render_page(report):
+    """하루 보고서 한 장 (RGB A4)"""
+    page = Image.new("RGB", (PAGE_W, PAGE_H), "white")
+    draw = ImageDraw.Draw(page)
+    title, text, small = _font(TITLE_SIZE), _font(TEXT_SIZE), _font(SMALL_SIZE)
+    day = date_cls.fromisoformat(report["date"])
+    y = MARGIN
+
+    draw.text((MARGIN, y), f"{report['student']}  {report['class_name']}", font=title, fill="#222")
+    y += 38
+    draw.text(
+        (MARGIN, y), f"{day.year}년 {day.month}월 {day.day}일({WEEKDAY_LABELS[day.weekday()]}) 하루 보고서",
+        font=text, fill="#555",
+    )
+    y += 36
+
+    if report["periods"]:
+        x = MARGIN
+        for label, _, w in PERIOD_COLUMNS:
+            draw.text((x, y), label, font=small, fill="#555")
+            x += w
+        y += 24
+        draw.line([(MARGIN, y), (PAGE_W - MARGIN, y)], fill="#ddd")
+        for period in report["periods"]:
+            x = MARGIN
+            for _, key, w in PERIOD_COLUMNS:
+                sign = _signature_bitmap(period["sign"]) if key == "signed" and period["sign"] else None
+                if sign is not None:
+                    page.paste(sign, (x, y + 3), sign)
+                elif isinstance(period[key], bool):
+                    _check(draw, x + 12, y + 12, period[key])
+                else:
+                    draw.text((x, y + 10), period[key], font=text, fill="#222")
+                x += w
+            y += ROW_H
+            draw.line([(MARGIN, y), (PAGE_W - MARGIN, y)], fill="#eee")
+        y += 12
+
+    if report["lunch"] is not None:
+        lunch = report["lunch"]
+        x = MARGIN
+        draw.text((x, y), LUNCH_NAME, font=text, fill="#222")
+        for label, key in (("식사", "eat"), ("양치", "brush"), ("완료", "done")):
+            x += 110
+            draw.text((x, y), label, font=small, fill="#555")
+            _check(draw, x + 40, y + 2, lunch[key])
+        y += 36
+
+    for kind, label in WEEKEND_KINDS:
+        tasks = report["weekend"].get(kind) or []
+        if not tasks:
+            continue
+        draw.text((MARGIN, y), label, font=text, fill="#222")
+        y += 28
+        for time_label, task_title, place, done in tasks:
+            draw.text((MARGIN + 10, y), time_label or "--:--", font=small, fill="#555")
+            draw.text((MARGIN + 80, y), task_title, font=small, fill="#999" if done else "#222")
+            draw.text((MARGIN + 380, y), place, font=small, fill="#555")
+            _check(draw, MARGIN + 560, y + 1, done)
+            y += 24
+        y += 12
+
+    if report["comment"]:
+        draw.text((MARGIN, y), "오늘 하루는 어땠나요?", font=text, fill="#222")
+        y += 28
+        for line in _wrap(report["comment"], SMALL_SIZE, PAGE_W - 2 * MARGIN):
+            if y > PAGE_H - MARGIN:
+                break
+            draw.text((MARGIN, y), line, font=small, fill="#333")
+            y += 22
+    return page
+
+
+def render_job(job):
+    """(이름, 페이지 목록, 형식) -> (이름, 파일 바이트)"""
+    name, reports, fmt = job
+    pages = [render_page(r) for r in reports]
+    buf = BytesIO()
+    if fmt == "pdf":
+        pages[0].save(buf, "PDF", resolution=DPI, save_all=True, append_images=pages[1:])
+    else:
+        # PNG 는 주간 보고서도 한 파일: 날짜별 페이지를 세로로 이어 붙임
+        sheet = pages[0] if len(pages) == 1 else Image.new("RGB", (PAGE_W, PAGE_H * len(pages)), "white")
+        if len(pages) > 1:
+            for i, p in enumerate(pages):
+                sheet.paste(p, (0, PAGE_H * i))
+        sheet.save(buf, "PNG", optimize=False, compress_level=6)
+    return name, buf.getvalue()
+
+
+# 내보내기
+
+def export_reports(out, jobs, workers=None, signature_root=None, font_path=None):
+    """작업을 프로세스 풀에서 그려 out(파일 객체)에 zip 으로 씀. 쓴 파일 수를 반환
+
+    workers 기본값은 CPU 수. 0 이나 1 이면 풀 없이 이 프로세스에서 차례로 그림
+    (프로세스를 띄우는 비용이 그리기보다 큰 경우).
+    """
+    font_path = font_path if font_path is not None else find_font()
+    if font_path is None:
+        logger.warning("한글 글꼴을 찾지 못했습니다. TIMETABLE_REPORT_FONT 로 지정하세요.")
+    signature_root = signature_root or SignatureStore().root
+    count = 0
+    # PDF/PNG 는 이미 압축돼 있으므로 zip 에서는 다시 압축하지 않음
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_STORED) as zf:
+        workers = (os.cpu_count() or 1) if workers is None else workers
+        if workers <= 1 or len(jobs) <= 1:
+            _init_worker(signature_root, font_path)
+            for name, data in map(render_job, jobs):
+                zf.writestr(name, data)
+                count += 1
+        else:
+            # 스레드가 도는 서버 프로세스에서 fork 하지 않도록 spawn 사용
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=mp.get_context("spawn"),
+                initializer=_init_worker, initargs=(signature_root, font_path),
+            ) as pool:
+                chunksize = max(1, len(jobs) // (workers * 4))
+                for name, data in pool.map(render_job, jobs, chunksize=chunksize):
+                    zf.writestr(name, data)
+                    count += 1
+    return count
@@ -0,0 +1,131 @@
+"""교시 시간표 모델.
+
+교시 시간은 "09:00 ~ 09:45" 형태의 문자열로 편집되므로, 편집될 때 한 번만
+해석/검증해 분 단위(자정 기준) 정수 구간을 가진 Schedule 로 만들고 캐시합니다.
+시작 시각으로 정렬한 구간 인덱스를 두어 "t 시각의 교시" 를 O(log n) 에 찾습니다.
+"""
+import bisect
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+
+LUNCH_NAME = "점심시간"
+
+
+class PeriodKind(Enum):
+    LESSON = "lesson"
+    LUNCH = "lunch"
+
+
+@dataclass(frozen=True, slots=True)
+class Period:
+    index: int
+    name: str
+    time: str
+    start: int | None
+    end: int | None
+    kind: PeriodKind
+
+    @property
+    def is_lunch(self):
+        return self.kind is PeriodKind.LUNCH
+
+    @property
+    def has_time(self):
+        return self.start is not None
+
+
+def parse_hhmm(text):
+    """"09:05" -> 545. 잘못된 형식이면 None"""
+    try:
+        h, m = text.strip().split(":")
+        h, m = int(h), int(m)
+    except (AttributeError, ValueError):
+        return None
+    if not (0 <= h < 24 and 0 <= m < 60):
+        return None
+    return h * 60 + m
+
+
+def parse_time_range(text):
+    """"09:00 ~ 09:45" -> (540, 585). 해석할 수 없으면 None"""
+    parts = str(text).replace("-", "~").split("~")
+    if len(parts) != 2:
+        return None
+    start, end = parse_hhmm(parts[0]), parse_hhmm(parts[1])
+    if start is None or end is None or end <= start:
+        return None
+    return start, end
+
+
+class Schedule:
+    """검증된 교시 목록과 시작 시각 정렬 구간 인덱스"""
+
+    __slots__ = ("periods", "errors", "_starts", "_intervals")
+
+    def __init__(self, periods, errors=()):
+        self.periods = tuple(periods)
+        self.errors = tuple(errors)
+        self._intervals = sorted((p.start, p.end, p.index) for p in self.periods if p.has_time)
+        self._starts = [start for start, _, _ in self._intervals]
+
+    def __getitem__(self, idx):
+        return self.periods[idx]
+
+    def __iter__(self):
+        return iter(self.periods)
+
+    def __len__(self):
+        return len(self.periods)
+
+    @property
+    def lesson_count(self):
+        return sum(1 for p in self.periods if not p.is_lunch)
+
+    def period_at(self, minute):
+        """minute 시각에 진행 중인 교시 인덱스 (없으면 None)"""
+        i = bisect.bisect_right(self._starts, minute) - 1
+        if i >= 0:
+            start, end, idx = self._intervals[i]
+            if minute < end:
+                return idx
+        return None
+
+    def next_after(self, minute):
+        """minute 이후에 시작하는 첫 교시 인덱스 (없으면 None)"""
+        i = bisect.bisect_right(self._starts, minute)
+        return self._intervals[i][2] if i < len(self._intervals) else None
+
+    def active_indexes(self, on_date, now):
+        """지금 진행 중인 교시(없으면 다음 교시)의 인덱스 집합. 오늘이 아니면 빈 집합"""
+        if on_date != now.date():
+            return set()
+        minute = now.hour * 60 + now.minute
+        idx = self.period_at(minute)
+        if idx is None:
+            idx = self.next_after(minute)
+        return set() if idx is None else {idx}
+
+
+@lru_cache(maxsize=64)
+def _build_schedule(entries):
+    periods = []
+    errors = []
+    for idx, (name, time_text) in enumerate(entries):
+        rng = parse_time_range(time_text)
+        if rng is None:
+            errors.append(f"{name}: 시간 형식이 올바르지 않습니다 (예: 09:00 ~ 09:45)")
+        start, end = rng if rng else (None, None)
+        kind = PeriodKind.LUNCH if name == LUNCH_NAME else PeriodKind.LESSON
+        periods.append(Period(idx, name, time_text, start, end, kind))
+
+    timed = sorted((p for p in periods if p.has_time), key=lambda p: p.start)
+    for prev, cur in zip(timed, timed[1:]):
+        if cur.start < prev.end:
+            errors.append(f"{prev.name}와(과) {cur.name}의 시간이 겹칩니다")
+    return Schedule(periods, errors)
+
+
+def build_schedule(period_dicts):
+    """[{"name", "time"}] -> Schedule. 같은 내용이면 캐시된 객체를 돌려줌"""
+    return _build_schedule(tuple((p["name"], p["time"]) for p in period_dicts))
@@ -0,0 +1,396 @@
+"""코멘트/주말 일과 전문 검색 색인.
+
+"오늘 하루는 어땠나요?" 코멘트와 주말 일과(일과명·장소명)를 (student, date, kind)
+하나를 문서 하나로 보고 글자 bigram 역색인을 만듭니다. 한글은 띄어쓰기로 나누면
+조사가 붙어 찾을 수 없으므로("체육관에서") 어절 안의 두 글자씩을 색인어로 쓰고,
+어절 끝 글자에는 END 를 붙여 한 글자 검색도 접두 범위 조회로 찾습니다.
+
+색인은 별도의 SQLite 파일에 두며, TIMETABLE_SEARCH 에 경로를 주면 켜집니다 (기본은 꺼짐).
+
+- (student, date, kind) 하나는 처음 색인할 때 받은 문서 번호를 계속 씁니다. 글이
+  바뀌면 빠진 색인어에서 그 번호를 지우고 새로 생긴 색인어에만 더하므로, 고친
+  횟수만큼 색인이 커지거나 질의가 느려지지 않습니다. 글을 지운 문서도 빈 글로
+  남겨 두어 다시 쓸 때 같은 번호를 씁니다.
+- postings 는 (색인어, 문서 번호 // 4096) 블록마다 하나의 압축 컨테이너입니다.
+  문서가 ARRAY_MAX 개 이하면 블록 안 위치(uint16) 배열, 넘으면 512바이트
+  비트맵으로 바꿉니다 (roaring bitmap 과 같은 방식). 두 형식 모두 C 로 풀 수
+  있어(array/int.from_bytes) 질의 때 파이썬 루프로 varint 를 풀지 않습니다.
+- 질의는 가장 드문 색인어부터 블록 단위로 교집합을 구하고, 남은 후보만
+  docs 의 원문에서 실제로 포함하는지 확인합니다.
+
+날짜별로 저장한 값만 색인하므로, 요일 템플릿을 그대로 쓴 주말은 찾지 않습니다.
+"""
+import os
+import sys
+import threading
+import unicodedata
+from array import array
+from html import escape
+
+from timetable.sqlite_db import connect, transaction
+from timetable.storage import ForwardingStorage
+
+DEFAULT_PATH = "timetable_search.db"
+# 색인 형식이 바뀌면 올림 (색인은 저장소에서 다시 만들 수 있으므로 지우고 다시 만듦)
+SCHEMA_VERSION = 2
+SEARCH_KINDS = ("comment", "weekend_m", "weekend_a")
+KIND_LABELS = {"comment": "코멘트", "weekend_m": "오전일과", "weekend_a": "오후일과"}
+
+BLOCK_BITS = 12
+BLOCK_DOCS = 1 << BLOCK_BITS
+BITMAP_BYTES = BLOCK_DOCS // 8
+# 배열 컨테이너 최대 길이 (2바이트씩이므로 비트맵 512바이트보다 작게)
+ARRAY_MAX = BITMAP_BYTES // 2 - 1
+
+# 어절 끝 표시 (한 글자 검색용)
+END = "\x00"
+
+# 훑기로 바꾸는 기준: 후보 수^2 > limit * 문서 수 * SCAN_RATIO
+SCAN_RATIO = 1
+
+SNIPPET_CHARS = 30
+MAX_RESULTS = 200
+
+
+def normalize(text):
+    """NFC, 소문자, 공백 하나로"""
+    return " ".join(unicodedata.normalize("NFC", text or "").lower().split())
+
+
+def document_text(kind, value):
+    """저장된 하루 항목 값 -> 검색할 글 (주말 일과는 한 줄에 "일과명 장소명")"""
+    if kind == "comment":
+        return normalize(value if isinstance(value, str) else "")
+    return "\n".join(
+        normalize(f"{item.get('title', '')} {item.get('place', '')}") for item in value or () if isinstance(item, dict)
+    ).strip()
+
+
+def text_grams(text):
+    """글 -> 색인어 집합 (어절 안 bigram + 어절 끝 글자 + END)"""
+    grams = set()
+    for token in text.split():
+        token += END
+        grams.update(token[i:i + 2] for i in range(len(token) - 1))
+    return grams
+
+
+def term_grams(term):
+    """검색어 한 어절 -> 반드시 있어야 하는 색인어 (한 글자면 None: 접두 조회)"""
+    if len(term) < 2:
+        return None
+    return {term[i:i + 2] for i in range(len(term) - 1)}
+
+
+# 컨테이너: 블록 안 위치 배열(uint16, little endian) 또는 비트맵
+def _offsets(data):
+    arr = array("H")
+    arr.frombytes(data)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr
+
+
+def _pack(offsets):
+    arr = array("H", offsets)
+    if sys.byteorder == "big":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _to_bitmap(offsets):
+    bits = 0
+    for offset in offsets:
+        bits |= 1 << offset
+    return bits.to_bytes(BITMAP_BYTES, "little")
+
+
+def _members(data):
+    """컨테이너 -> 비트 집합(int)"""
+    if len(data) == BITMAP_BYTES:
+        return int.from_bytes(data, "little")
+    return int.from_bytes(_to_bitmap(_offsets(data)), "little")
+
+
+# 바이트 값 -> 켜진 비트 위치
+_BYTE_BITS = tuple(tuple(i for i in range(8) if value >> i & 1) for value in range(256))
+
+
+def _bit_offsets(bits):
+    for i, byte in enumerate(bits.to_bytes(BITMAP_BYTES, "little")):
+        if byte:
+            for bit in _BYTE_BITS[byte]:
+                yield i * 8 + bit
+
+
+class SearchIndex:
+    """bigram 역색인 (SQLite)"""
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS docs (
+        doc INTEGER PRIMARY KEY AUTOINCREMENT,
+        student TEXT NOT NULL,
+        date TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        text TEXT NOT NULL
+    );
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_docs_key ON docs (student, date, kind);
+    CREATE INDEX IF NOT EXISTS idx_docs_date ON docs (date);
+    CREATE TABLE IF NOT EXISTS postings (
+        gram TEXT NOT NULL,
+        block INTEGER NOT NULL,
+        count INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        PRIMARY KEY (gram, block)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path, self.SCHEMA, version=SCHEMA_VERSION, tables=("docs", "postings", "meta"))
+
+    def _transaction(self):
+        return transaction(self._conn, self._lock)
+
+    # 쓰기
+    def update(self, student, date, entries):
+        """저장된 하루 항목 {kind: value} 중 검색 대상만 색인에 반영"""
+        self.update_rows((student, date, kind, value) for kind, value in entries.items())
+
+    def update_rows(self, rows):
+        """[(student, date, kind, value)] 를 한 트랜잭션으로 반영. 글이 그대로면 건너뜀"""
+        docs = [
+            (student, str(date), kind, document_text(kind, value))
+            for student, date, kind, value in rows
+            if kind in SEARCH_KINDS
+        ]
+        if not docs:
+            return
+        with self._transaction() as conn:
+            added, removed = {}, {}
+            for student, date, kind, text in docs:
+                row = conn.execute(
+                    "SELECT doc, text FROM docs WHERE student = ? AND date = ? AND kind = ?", (student, date, kind)
+                ).fetchone()
+                if row is None:
+                    if not text:
+                        continue
+                    doc = conn.execute(
+                        "INSERT INTO docs (student, date, kind, text) VALUES (?, ?, ?, ?)", (student, date, kind, text)
+                    ).lastrowid
+                    grams, gone = text_grams(text), ()
+                else:
+                    doc, old = row
+                    if old == text:
+                        continue
+                    conn.execute("UPDATE docs SET text = ? WHERE doc = ?", (text, doc))
+                    old_grams, new_grams = text_grams(old), text_grams(text)
+                    grams, gone = new_grams - old_grams, old_grams - new_grams
+                for gram in grams:
+                    added.setdefault((gram, doc >> BLOCK_BITS), set()).add(doc & (BLOCK_DOCS - 1))
+                for gram in gone:
+                    removed.setdefault((gram, doc >> BLOCK_BITS), set()).add(doc & (BLOCK_DOCS - 1))
+            for key in added.keys() | removed.keys():
+                self._update_posting(conn, *key, added.get(key, ()), removed.get(key, ()))
+
+    def _update_posting(self, conn, gram, block, added, removed):
+        """(gram, block) 컨테이너에 블록 안 위치를 더하고 지움. 비면 행을 지움"""
+        row = conn.execute("SELECT data FROM postings WHERE gram = ? AND block = ?", (gram, block)).fetchone()
+        if row is not None and len(row[0]) == BITMAP_BYTES:
+            bits = int.from_bytes(row[0], "little")
+            for offset in added:
+                bits |= 1 << offset
+            for offset in removed:
+                bits &= ~(1 << offset)
+            count = bits.bit_count()
+            data = _pack(_bit_offsets(bits)) if count <= ARRAY_MAX else bits.to_bytes(BITMAP_BYTES, "little")
+        else:
+            offsets = set(_offsets(row[0])) if row is not None else set()
+            offsets = (offsets | set(added)) - set(removed)
+            count = len(offsets)
+            data = _pack(sorted(offsets)) if count <= ARRAY_MAX else _to_bitmap(offsets)
+        if count:
+            conn.execute(
+                "INSERT OR REPLACE INTO postings (gram, block, count, data) VALUES (?, ?, ?, ?)",
+                (gram, block, count, data),
+            )
+        elif row is not None:
+            conn.execute("DELETE FROM postings WHERE gram = ? AND block = ?", (gram, block))
+
+    def needs_rebuild(self):
+        with self._lock:
+            return self._conn.execute("SELECT 1 FROM meta WHERE key = 'built'").fetchone() is None
+
+    def rebuild(self, storage, batch_size=5000):
+        """저장소의 코멘트/주말 일과 전체를 다시 색인 (처음 켤 때 한 번)"""
+        count = 0
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM docs")
+            conn.execute("DELETE FROM postings")
+        for batch in storage.iter_entry_rows(SEARCH_KINDS, batch_size=batch_size):
+            self.update_rows(batch)
+            count += len(batch)
+        with self._transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('built', ?)", (str(count),))
+        return count
+
+    # 읽기
+    def _term_blocks(self, conn, term, blocks):
+        """검색어 한 어절 -> {block: 비트 집합}. blocks 가 있으면 그 블록만"""
+        grams = term_grams(term)
+        if grams is None:
+            # 한 글자: 그 글자로 시작하는 색인어 전부의 합집합
+            rows = conn.execute(
+                "SELECT block, data FROM postings WHERE gram >= ? AND gram < ?", (term, term + "\U0010ffff")
+            ).fetchall()
+            found = {}
+            for block, data in rows:
+                if blocks is None or block in blocks:
+                    found[block] = found.get(block, 0) | _members(data)
+            return found
+        # 드문 색인어부터 교집합 (후보 블록이 빨리 줄어듦)
+        totals = {
+            gram: conn.execute("SELECT COALESCE(SUM(count), 0) FROM postings WHERE gram = ?", (gram,)).fetchone()[0]
+            for gram in grams
+        }
+        found = None
+        for gram in sorted(grams, key=totals.get):
+            if not totals[gram]:
+                return {}
+            current = {}
+            for block, data in conn.execute("SELECT block, data FROM postings WHERE gram = ?", (gram,)):
+                if found is None:
+                    if blocks is None or block in blocks:
+                        current[block] = _members(data)
+                elif block in found:
+                    bits = found[block] & _members(data)
+                    if bits:
+                        current[block] = bits
+            found = current
+            if not found:
+                return {}
+        return found
+
+    def search(self, query, students=None, kinds=SEARCH_KINDS, limit=MAX_RESULTS):
+        """query 의 모든 어절을 포함하는 문서 -> [(date, student, kind, text)] (최근 날짜 순)
+
+        후보가 아주 많은 흔한 검색어는 후보를 하나씩 확인하는 것보다 날짜 역순으로
+        원문을 훑다가 limit 개에서 멈추는 편이 빠르므로 그렇게 합니다.
+        """
+        terms = normalize(query).split()
+        if not terms:
+            return []
+        # 긴 어절일수록 드무므로 먼저 (뒤 어절은 남은 블록만 봄)
+        terms.sort(key=len, reverse=True)
+        filters, args = self._filters(students, kinds)
+        with self._lock:
+            blocks = None
+            for term in terms:
+                found = self._term_blocks(self._conn, term, blocks)
+                if blocks is not None:
+                    found = {block: bits & blocks[block] for block, bits in found.items() if bits & blocks[block]}
+                blocks = found
+                if not blocks:
+                    return []
+            candidates = sum(bits.bit_count() for bits in blocks.values())
+            total = self._conn.execute("SELECT COALESCE(MAX(doc), 0) FROM docs").fetchone()[0]
+            # 훑기: 약 limit * total / candidates 행, 후보 확인: candidates 행
+            if candidates * candidates > limit * total * SCAN_RATIO:
+                matches = " AND ".join("instr(text, ?) > 0" for _ in terms)
+                return self._conn.execute(
+                    f"SELECT date, student, kind, text FROM docs WHERE {matches}{filters}"
+                    " ORDER BY date DESC, student DESC LIMIT ?",
+                    [*terms, *args, limit],
+                ).fetchall()
+            docs = [(block << BLOCK_BITS) + offset for block, bits in blocks.items() for offset in _bit_offsets(bits)]
+            hits = []
+            for start in range(0, len(docs), 500):
+                chunk = docs[start:start + 500]
+                hits.extend(self._conn.execute(
+                    f"SELECT date, student, kind, text FROM docs WHERE doc IN ({', '.join('?' * len(chunk))}){filters}",
+                    [*chunk, *args],
+                ))
+        # 후보는 원문으로 확인 (bigram 이 모두 있어도 붙어 있지 않을 수 있음)
+        hits = [hit for hit in hits if all(term in hit[3] for term in terms)]
+        hits.sort(key=lambda hit: (hit[0], hit[1]), reverse=True)
+        return hits[:limit]
+
+    @staticmethod
+    def _filters(students, kinds):
+        sql, args = "", []
+        if tuple(kinds) != SEARCH_KINDS:
+            sql += f" AND kind IN ({', '.join('?' * len(kinds))})"
+            args += list(kinds)
+        if students is not None:
+            students = list(students)
+            sql += f" AND student IN ({', '.join('?' * len(students))})"
+            args += students
+        return sql, args
+
+    def stats(self):
+        with self._lock:
+            docs = self._conn.execute("SELECT COUNT(*) FROM docs WHERE text != ''").fetchone()[0]
+            grams, size = self._conn.execute("SELECT COUNT(DISTINCT gram), COALESCE(SUM(LENGTH(data)), 0) FROM postings").fetchone()
+        return {"docs": docs, "grams": grams, "postings_bytes": size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def snippet_html(text, query, width=SNIPPET_CHARS):
+    """첫 일치 위치 주변만 잘라 검색어를 <mark> 로 강조"""
+    terms = sorted(set(normalize(query).split()), key=len, reverse=True)
+    line = text.replace("\n", " / ")
+    first = min((line.find(term) for term in terms if term in line), default=0)
+    start, end = max(first - width, 0), min(first + width * 2, len(line))
+    part = line[start:end]
+    out, i = [], 0
+    while i < len(part):
+        term = next((term for term in terms if part.startswith(term, i)), None)
+        if term:
+            out.append(f"<mark>{escape(term)}</mark>")
+            i += len(term)
+        else:
+            out.append(escape(part[i]))
+            i += 1
+    return ("…" if start else "") + "".join(out) + ("…" if end < len(line) else "")
+
+
+class IndexedStorage(ForwardingStorage):
+    """inner 에 하루 항목을 저장한 뒤 검색 색인도 갱신하는 래퍼 (나머지는 그대로 넘김)"""
+
+    def __init__(self, inner, index):
+        super().__init__(inner)
+        self.index = index
+
+    def save_entries(self, student, date, entries):
+        self.inner.save_entries(student, date, entries)
+        self.index.update(student, date, entries)
+
+    def save_entry_rows(self, rows):
+        rows = list(rows)
+        self.inner.save_entry_rows(rows)
+        self.index.update_rows(rows)
+
+    def save_rows(self, period_rows, entry_rows):
+        entry_rows = list(entry_rows)
+        self.inner.save_rows(period_rows, entry_rows)
+        self.index.update_rows(entry_rows)
+
+    def close(self):
+        try:
+            self.inner.close()
+        finally:
+            self.index.close()
+
+
+def search_index_from_env():
+    """TIMETABLE_SEARCH 경로의 색인 (설정하지 않으면 None)"""
+    path = os.environ.get("TIMETABLE_SEARCH", "")
+    return SearchIndex(path) if path else None
@@ -0,0 +1,91 @@
+"""Streamlit 페이지와 저장소를 잇는 도우미."""
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from timetable.journal import journal_from_env
+from timetable.metrics import MetricsStorage, metrics_from_env
+from timetable.search import IndexedStorage, search_index_from_env
+from timetable.signatures import SignatureStore
+from timetable.storage import open_storage
+from timetable.write_behind import write_behind_from_env
+
+DEFAULT_STUDENT = "학생"
+
+
+@st.cache_resource
+def get_storage():
+    """서버 프로세스 전체에서 하나의 저장소 연결을 공유
+
+    TIMETABLE_WRITE_BEHIND_MS 로 지연 쓰기, TIMETABLE_JOURNAL 로 변경 기록 파일,
+    TIMETABLE_SEARCH 로 검색 색인 파일, TIMETABLE_METRICS 로 학생별 추이 파일을 정합니다.
+    """
+    storage = write_behind_from_env(open_storage())
+    index = get_search_index()
+    if index is not None:
+        storage = IndexedStorage(storage, index)
+    metrics = get_metrics()
+    if metrics is not None:
+        storage = MetricsStorage(storage, metrics)
+    return journal_from_env(storage, actor=current_actor)
+
+
+@st.cache_resource
+def get_metrics():
+    """학생별 하루 카운터/연속 일수 (꺼져 있으면 None)"""
+    return metrics_from_env()
+
+
+@st.cache_resource
+def get_search_index():
+    """코멘트/주말 일과 검색 색인 (꺼져 있으면 None)"""
+    return search_index_from_env()
+
+
+def current_actor():
+    """변경 기록에 남길 사람: 사이드바 학생 이름 + 세션 앞 8자리"""
+    ctx = get_script_run_ctx()
+    if ctx is None:
+        return ""
+    return f"{st.session_state.get('student', '')}#{ctx.session_id[:8]}"
+
+
+@st.cache_resource
+def get_signature_store():
+    """서명 blob 저장소와 data URI 캐시도 프로세스 단위로 공유"""
+    return SignatureStore()
+
+
+def current_student():
+    """사이드바의 학생 이름 (?student= 쿼리로 미리 채울 수 있음)
+
+    위젯 키는 페이지를 옮기면 정리되므로, 값은 별도의 "student" 키에 보관했다가
+    위젯을 다시 만들 때 채워 넣습니다.
+    """
+    if "_student_name" not in st.session_state:
+        st.session_state["_student_name"] = st.session_state.get(
+            "student", st.query_params.get("student", DEFAULT_STUDENT)
+        )
+    name = st.sidebar.text_input("학생 이름", key="_student_name").strip() or DEFAULT_STUDENT
+    st.session_state["student"] = name
+    _student_class_input(name)
+    return name
+
+
+def _student_class_input(name):
+    """사이드바의 반 입력. 학생이 바뀔 때만 명부에서 읽고, 바뀐 경우에만 저장"""
+    storage = get_storage()
+    if st.session_state.get("_class_owner") != name:
+        class_name = storage.load_student_class(name)
+        if class_name is None:
+            # 처음 보는 학생은 반 없이 명부에 등록
+            storage.save_student(name, "")
+        st.session_state["student_class"] = class_name or ""
+        st.session_state["_class_owner"] = name
+        st.session_state.pop("_student_class", None)
+    if "_student_class" not in st.session_state:
+        st.session_state["_student_class"] = st.session_state["student_class"]
+    class_name = st.sidebar.text_input("반", key="_student_class", placeholder="예) 2-5").strip()
+    if class_name != st.session_state["student_class"]:
+        storage.save_student(name, class_name)
+        st.session_state["student_class"] = class_name
+    return class_name
@@ -0,0 +1,90 @@
+"""교사 서명 저장소.
+
+서명은 캔버스 획 좌표(zlib 압축 JSON)로 한 번만 저장하고 내용 해시(sha256)를 키로 씁니다.
+예전에 저장한 서명은 잉크 영역만 잘라 압축(PNG/WebP)한 바이트로, 읽기만 합니다. 세션에는
+해시 문자열만 남기며, 화면에 보여 줄 data URI(획은 SVG) 는 크기 제한이 있는
+LRU 캐시에서 꺼내므로 rerun 마다 다시 만들지 않습니다. 비트맵은 image() 로
+필요할 때만 획에서 그립니다. PIL 은 비트맵을 다룰 때만 불러옵니다.
+"""
+import base64
+import hashlib
+import os
+import threading
+from io import BytesIO
+
+from cachetools import LRUCache
+
+from timetable.canvas import decode_strokes, encode_strokes, is_strokes_blob, rasterize_strokes, strokes_svg
+
+DEFAULT_DIR = "signatures"
+
+# data URI 캐시 상한 (바이트)
+URI_CACHE_BYTES = 32 * 1024 * 1024
+
+
+class SignatureStore:
+    """내용 해시로 주소를 정하는 서명 blob 저장소 (한 번 쓰면 바뀌지 않음)"""
+
+    def __init__(self, root=None, cache_bytes=URI_CACHE_BYTES):
+        self.root = root or os.environ.get("TIMETABLE_SIGNATURE_DIR", DEFAULT_DIR)
+        self._uri_cache = LRUCache(maxsize=cache_bytes, getsizeof=len)
+        self._lock = threading.Lock()
+
+    def _path(self, digest):
+        # 한 디렉터리에 파일이 너무 많아지지 않도록 앞 두 글자로 나눔
+        return os.path.join(self.root, digest[:2], digest)
+
+    def put_strokes(self, strokes):
+        """strokes_from_json 결과를 저장하고 해시를 반환 (비트맵으로 바꾸지 않음)"""
+        return self.put_bytes(encode_strokes(strokes))
+
+    def put_bytes(self, data):
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        return digest
+
+    def get_bytes(self, digest):
+        try:
+            with open(self._path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def data_uri(self, digest):
+        """<img src=...> 에 바로 쓸 data URI (LRU 캐시). 저장된 blob 이 없으면 None"""
+        with self._lock:
+            uri = self._uri_cache.get(digest)
+        if uri is not None:
+            return uri
+        data = self.get_bytes(digest)
+        if data is None:
+            return None
+        if is_strokes_blob(data):
+            data, mime = strokes_svg(decode_strokes(data)).encode(), "image/svg+xml"
+        else:
+            mime = "image/webp" if data[8:12] == b"WEBP" else "image/png"
+        uri = f"data:{mime};base64,{base64.b64encode(data).decode()}"
+        with self._lock:
+            try:
+                self._uri_cache[digest] = uri
+            except ValueError:
+                # 캐시 전체보다 큰 항목은 캐시하지 않음
+                pass
+        return uri
+
+    def image(self, digest, scale=1):
+        """서명 비트맵 (RGBA PIL). 획으로 저장된 서명은 이때만 그림. 없으면 None"""
+        data = self.get_bytes(digest)
+        if data is None:
+            return None
+        if is_strokes_blob(data):
+            return rasterize_strokes(decode_strokes(data), scale=scale)
+        from PIL import Image
+
+        return Image.open(BytesIO(data)).convert("RGBA")
@@ -0,0 +1,39 @@
+"""저장소/색인/추이/변경 기록이 함께 쓰는 SQLite 연결 도우미.
+
+연결은 모두 autocommit(isolation_level=None) 으로 열고, 여러 문장을 묶을 때는
+transaction() 으로 락을 잡고 BEGIN IMMEDIATE ... COMMIT 을 직접 씁니다.
+파생 데이터(검색 색인, 추이)처럼 처음부터 다시 만들 수 있는 파일은 version 을
+주면 PRAGMA user_version 이 다를 때 tables 를 지우고 새 스키마로 만듭니다.
+"""
+import contextlib
+import sqlite3
+
+
+def connect(path, schema, synchronous="NORMAL", busy_timeout_ms=None, version=None, tables=()):
+    """스레드 사이에 나눠 쓰는 autocommit 연결 (파일이면 WAL) 을 열고 schema 를 적용"""
+    conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+    if path != ":memory:":
+        conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(f"PRAGMA synchronous={synchronous}")
+    if busy_timeout_ms is not None:
+        # 여러 서버 프로세스가 같은 파일에 쓸 때 잠금을 바로 실패시키지 않고 기다림
+        conn.execute(f"PRAGMA busy_timeout={busy_timeout_ms}")
+    if version is not None and conn.execute("PRAGMA user_version").fetchone()[0] != version:
+        conn.executescript("".join(f"DROP TABLE IF EXISTS {table};" for table in tables))
+        conn.execute(f"PRAGMA user_version = {version}")
+    conn.executescript(schema)
+    return conn
+
+
+@contextlib.contextmanager
+def transaction(conn, lock):
+    """락을 잡고 명시적 트랜잭션으로 묶음 (autocommit 연결이라 BEGIN 이 필요)"""
+    with lock:
+        # 다른 프로세스와 쓰기 잠금을 다툴 때 busy_timeout 이 적용되도록 처음부터 쓰기 잠금을 잡음
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
@@ -0,0 +1,131 @@
+"""날짜별 session_state 키 정리.
+
+두 페이지의 위젯 키는 모두 날짜(YYYY-MM-DD)를 이름에 넣어 만들기 때문에
+(subject_0_2025-03-02, lunch_eat_2025-03-02_4, title_m_<id>_2025-03-02 ...)
+키 이름의 날짜를 네임스페이스로 보고 묶어 관리합니다. 최근에 본 날짜만
+TIMETABLE_HOT_DATES 개(기본 5)까지 세션에 남기고, 그보다 오래된 날짜의
+키는 지웁니다. 모든 값은 rerun 마다 저장소에 저장되므로 지운 날짜를 다시
+열면 저장소에서 다시 채워집니다.
+
+여러 서버 프로세스가 같은 저장소를 쓰는 배포에서는 다른 워커나 탭이 같은
+학생·날짜를 바꿀 수 있으므로, rerun 끝에 세션이 알고 있는 저장 내용의
+지문을 남겨 두고 다음 rerun 에서 저장소 내용과 다르면 그 날짜 키를 지워
+저장소 값으로 다시 채웁니다 (sync_date / mark_synced).
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import sys
+
+import streamlit as st
+
+DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+HOT_DATES_KEY = "_hot_dates"
+
+# 값이 dict 이고 그 안의 키에 날짜가 들어가는 세션 항목
+NESTED_KEYS = ("supplies_state", "timetable")
+
+
+def max_hot_dates():
+    return max(int(os.environ.get("TIMETABLE_HOT_DATES", "5")), 1)
+
+
+def key_date(key):
+    """키 이름에 들어 있는 날짜 (없으면 None)"""
+    match = DATE_RE.search(str(key))
+    return match.group(0) if match else None
+
+
+def _size(value):
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+class DateStateManager:
+    """최근 날짜 LRU 를 유지하며 오래된 날짜의 세션 키를 정리"""
+
+    def __init__(self, state=None, max_hot=None):
+        self.state = st.session_state if state is None else state
+        self.max_hot = max_hot or max_hot_dates()
+
+    @property
+    def hot_dates(self):
+        return list(self.state.get(HOT_DATES_KEY, []))
+
+    def touch(self, date):
+        """date 를 가장 최근 날짜로 올리고, 넘친 날짜를 정리해 그 목록을 반환"""
+        date = str(date)
+        hot = [d for d in self.state.get(HOT_DATES_KEY, []) if d != date]
+        hot.append(date)
+        evicted = hot[:-self.max_hot]
+        self.state[HOT_DATES_KEY] = hot[-self.max_hot:]
+        if evicted:
+            self.evict(evicted)
+        return evicted
+
+    def evict(self, dates):
+        """dates 에 속한 세션 키와 중첩 dict 항목을 한 번에 지움"""
+        dates = set(dates)
+        for key in list(self.state.keys()):
+            if key_date(key) in dates:
+                del self.state[key]
+        for name in NESTED_KEYS:
+            nested = self.state.get(name)
+            if isinstance(nested, dict):
+                for key in [k for k in nested if key_date(k) in dates]:
+                    del nested[key]
+
+    def memory_usage(self):
+        """{"total", "other", "dates": {날짜: 바이트}} — pickle 크기 기준"""
+        usage = {"total": 0, "other": 0, "dates": {}}
+        for key in list(self.state.keys()):
+            value = self.state[key]
+            if key in NESTED_KEYS and isinstance(value, dict):
+                for k, v in value.items():
+                    size = _size(v) + len(str(k))
+                    d = key_date(k)
+                    if d:
+                        usage["dates"][d] = usage["dates"].get(d, 0) + size
+                    else:
+                        usage["other"] += size
+                    usage["total"] += size
+                continue
+            size = _size(value) + len(str(key))
+            d = key_date(key)
+            if d:
+                usage["dates"][d] = usage["dates"].get(d, 0) + size
+            else:
+                usage["other"] += size
+            usage["total"] += size
+        return usage
+
+
+def manage_date_state(date):
+    """페이지 시작 시 호출: 선택한 날짜를 최근 날짜로 올리고 오래된 날짜를 정리"""
+    return DateStateManager().touch(date)
+
+
+def fingerprint(*parts):
+    """저장 내용 비교용 지문 (JSON 으로 직렬화한 값의 해시)"""
+    data = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.blake2b(data.encode(), digest_size=16).hexdigest()
+
+
+def sync_date(page, date, snapshot):
+    """저장소의 지문이 지난 rerun 끝의 지문과 다르면 (다른 워커가 저장했거나 학생이 바뀜)
+    그 날짜의 세션 키를 지우고 True 를 반환"""
+    seen = st.session_state.get(f"_synced_{page}_{date}")
+    if seen is not None and seen != snapshot:
+        DateStateManager().evict([str(date)])
+        return True
+    return False
+
+
+def mark_synced(page, date, snapshot):
+    """이번 rerun 에서 저장을 마친 뒤 세션이 알고 있는 저장 내용의 지문을 기록"""
+    st.session_state[f"_synced_{page}_{date}"] = snapshot
@@ -0,0 +1,581 @@
+"""시간표/주말 일과 저장소.
+
+st.session_state 는 브라우저 세션에만 남기 때문에 서버 재시작이나 새 탭에서
+하루치 기록이 사라집니다. 두 페이지는 이 모듈의 Storage 를 통해서만
+기록을 읽고 씁니다. 기본 백엔드는 SQLite(WAL) 이며, 한 번의 rerun 에서는
+선택한 날짜의 행만 (student, date) 인덱스로 읽어 옵니다.
+"""
+import json
+import os
+import threading
+
+from timetable.sqlite_db import connect, transaction
+
+DEFAULT_URL = "sqlite:///timetable.db"
+BUSY_TIMEOUT_MS = 5000
+
+
+def _dumps(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+
+class Storage:
+    """저장소 인터페이스.
+
+    - 교시 기록: (student, date, period) -> dict
+    - 하루 항목: (student, date, kind) -> 임의의 JSON 값 (코멘트, 주말 일과 등)
+    - 학생 명부: student -> 반
+    - 요일별 템플릿: (student, kind) -> JSON (날짜별 교시 기록은 템플릿과 다른 값만 보관)
+    - 날짜별 리비전: 교시 기록이 저장될 때마다 1씩 증가 (집계 캐시 무효화용)
+    """
+
+    def load_day(self, student, date):
+        """해당 날짜의 교시 기록을 {period: dict} 로 반환"""
+        raise NotImplementedError
+
+    def save_periods(self, student, date, records):
+        """{period: dict} 를 한 번에 저장(upsert)"""
+        raise NotImplementedError
+
+    def load_entries(self, student, date):
+        """해당 날짜의 하루 항목을 {kind: value} 로 반환"""
+        raise NotImplementedError
+
+    def save_entries(self, student, date, entries):
+        """{kind: value} 를 한 번에 저장(upsert)"""
+        raise NotImplementedError
+
+    def load_date(self, date, class_name=None):
+        """해당 날짜의 모든 학생 교시 기록을 [(student, period, dict)] 로 반환 (반 지정 가능)"""
+        raise NotImplementedError
+
+    def date_revision(self, date):
+        raise NotImplementedError
+
+    def load_period_range(self, date_from, date_to, student=None, class_name=None):
+        """기간의 교시 기록을 한 번에 [(student, date, period, dict)] 로 반환 (날짜순)"""
+        raise NotImplementedError
+
+    def load_entry_range(self, kinds, date_from, date_to, student=None):
+        """기간의 하루 항목을 한 번에 [(student, date, kind, value)] 로 반환 (날짜순)"""
+        raise NotImplementedError
+
+    def range_revision(self, date_from, date_to):
+        """기간 안 날짜 리비전의 합 (기간 집계 캐시 무효화용)"""
+        raise NotImplementedError
+
+    def load_template(self, student, kind):
+        """학생의 요일별 템플릿 (없으면 None). kind: timetable / weekend"""
+        raise NotImplementedError
+
+    def save_template(self, student, kind, value):
+        raise NotImplementedError
+
+    def save_student(self, student, class_name):
+        raise NotImplementedError
+
+    def load_student_class(self, student):
+        raise NotImplementedError
+
+    def list_students(self, class_name=None):
+        raise NotImplementedError
+
+    def list_classes(self):
+        raise NotImplementedError
+
+    def save_period_rows(self, rows):
+        """[(student, date, period, dict)] 를 한 트랜잭션으로 저장 (일괄 가져오기용)"""
+        raise NotImplementedError
+
+    def iter_period_rows(self, date_from=None, date_to=None, batch_size=1000):
+        """(date, student, period) 순으로 교시 기록을 batch_size 개씩 묶어 내보냄"""
+        raise NotImplementedError
+
+    def save_entry_rows(self, rows):
+        """[(student, date, kind, value)] 를 한 트랜잭션으로 저장"""
+        raise NotImplementedError
+
+    def iter_entry_rows(self, kinds, date_from=None, date_to=None, batch_size=1000):
+        """(date, student, kind) 순으로 하루 항목을 batch_size 개씩 묶어 내보냄"""
+        raise NotImplementedError
+
+    def save_rows(self, period_rows, entry_rows):
+        """교시 기록 행과 하루 항목 행을 한 트랜잭션으로 저장 (둘 다 반영되거나 둘 다 안 됨)"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class ForwardingStorage(Storage):
+    """inner 저장소에 모든 호출을 그대로 넘기는 래퍼의 바탕.
+
+    지연 쓰기/변경 기록/검색 색인/추이 래퍼는 이 클래스를 상속해 가로챌 메서드만
+    다시 정의합니다. 넘기기 전에 할 일이 있으면 _forward 를 다시 정의합니다.
+    """
+
+    def __init__(self, inner):
+        self.inner = inner
+
+    def _forward(self, name, *args, **kwargs):
+        return getattr(self.inner, name)(*args, **kwargs)
+
+    def close(self):
+        self.inner.close()
+
+
+def _forwarding(name):
+    def method(self, *args, **kwargs):
+        return self._forward(name, *args, **kwargs)
+
+    method.__name__ = name
+    method.__doc__ = getattr(Storage, name).__doc__
+    return method
+
+
+for _name, _method in list(vars(Storage).items()):
+    if callable(_method) and not _name.startswith("_") and _name != "close":
+        setattr(ForwardingStorage, _name, _forwarding(_name))
+
+
+def _in_range(date, date_from, date_to):
+    return (date_from is None or date >= str(date_from)) and (date_to is None or date <= str(date_to))
+
+
+def _batched(rows, batch_size):
+    for i in range(0, len(rows), batch_size):
+        yield rows[i:i + batch_size]
+
+
+class MemoryStorage(Storage):
+    """프로세스 메모리에만 보관하는 저장소 (테스트/임시 실행용)"""
+
+    def __init__(self, url=None):
+        self._periods = {}
+        self._entries = {}
+        self._students = {}
+        self._revisions = {}
+        self._templates = {}
+        self._lock = threading.Lock()
+
+    def load_day(self, student, date):
+        with self._lock:
+            return {p: json.loads(v) for p, v in self._periods.get((student, str(date)), {}).items()}
+
+    def save_periods(self, student, date, records):
+        with self._lock:
+            day = self._periods.setdefault((student, str(date)), {})
+            for period, data in records.items():
+                day[int(period)] = _dumps(data)
+            if records:
+                self._revisions[str(date)] = self._revisions.get(str(date), 0) + 1
+
+    def load_entries(self, student, date):
+        with self._lock:
+            return {k: json.loads(v) for k, v in self._entries.get((student, str(date)), {}).items()}
+
+    def save_entries(self, student, date, entries):
+        with self._lock:
+            day = self._entries.setdefault((student, str(date)), {})
+            for kind, value in entries.items():
+                day[kind] = _dumps(value)
+
+    def load_date(self, date, class_name=None):
+        with self._lock:
+            return [
+                (student, period, json.loads(data))
+                for (student, day), periods in self._periods.items()
+                if day == str(date) and (class_name is None or self._students.get(student) == class_name)
+                for period, data in periods.items()
+            ]
+
+    def date_revision(self, date):
+        with self._lock:
+            return self._revisions.get(str(date), 0)
+
+    def load_period_range(self, date_from, date_to, student=None, class_name=None):
+        with self._lock:
+            rows = sorted(
+                (date, s, period, data)
+                for (s, date), periods in self._periods.items()
+                if _in_range(date, date_from, date_to)
+                and (student is None or s == student)
+                and (class_name is None or self._students.get(s) == class_name)
+                for period, data in periods.items()
+            )
+        return [(s, date, period, json.loads(data)) for date, s, period, data in rows]
+
+    def load_entry_range(self, kinds, date_from, date_to, student=None):
+        with self._lock:
+            rows = sorted(
+                (date, s, kind, data)
+                for (s, date), entries in self._entries.items()
+                if _in_range(date, date_from, date_to) and (student is None or s == student)
+                for kind, data in entries.items()
+                if kind in kinds
+            )
+        return [(s, date, kind, json.loads(data)) for date, s, kind, data in rows]
+
+    def range_revision(self, date_from, date_to):
+        with self._lock:
+            return sum(rev for date, rev in self._revisions.items() if _in_range(date, date_from, date_to))
+
+    def load_template(self, student, kind):
+        with self._lock:
+            data = self._templates.get((student, kind))
+        return None if data is None else json.loads(data)
+
+    def save_template(self, student, kind, value):
+        with self._lock:
+            self._templates[(student, kind)] = _dumps(value)
+
+    def save_student(self, student, class_name):
+        with self._lock:
+            self._students[student] = class_name
+
+    def load_student_class(self, student):
+        with self._lock:
+            return self._students.get(student)
+
+    def list_students(self, class_name=None):
+        with self._lock:
+            return sorted(s for s, c in self._students.items() if class_name is None or c == class_name)
+
+    def list_classes(self):
+        with self._lock:
+            return sorted({c for c in self._students.values() if c})
+
+    def save_period_rows(self, rows):
+        self.save_rows(rows, ())
+
+    def iter_period_rows(self, date_from=None, date_to=None, batch_size=1000):
+        with self._lock:
+            rows = sorted(
+                (date, student, period, data)
+                for (student, date), periods in self._periods.items()
+                if _in_range(date, date_from, date_to)
+                for period, data in periods.items()
+            )
+        for batch in _batched(rows, batch_size):
+            yield [(student, date, period, json.loads(data)) for date, student, period, data in batch]
+
+    def save_entry_rows(self, rows):
+        self.save_rows((), rows)
+
+    def save_rows(self, period_rows, entry_rows):
+        period_rows = [(student, str(date), int(period), _dumps(data)) for student, date, period, data in period_rows]
+        entry_rows = [(student, str(date), kind, _dumps(value)) for student, date, kind, value in entry_rows]
+        with self._lock:
+            for student, date, period, data in period_rows:
+                self._periods.setdefault((student, date), {})[period] = data
+                self._revisions[date] = self._revisions.get(date, 0) + 1
+            for student, date, kind, data in entry_rows:
+                self._entries.setdefault((student, date), {})[kind] = data
+
+    def iter_entry_rows(self, kinds, date_from=None, date_to=None, batch_size=1000):
+        with self._lock:
+            rows = sorted(
+                (date, student, kind, data)
+                for (student, date), entries in self._entries.items()
+                if _in_range(date, date_from, date_to)
+                for kind, data in entries.items()
+                if kind in kinds
+            )
+        for batch in _batched(rows, batch_size):
+            yield [(student, date, kind, json.loads(data)) for date, student, kind, data in batch]
+
+
+class SQLiteStorage(Storage):
+    """SQLite 저장소.
+
+    WAL 모드로 열어 읽기와 쓰기가 서로 막지 않도록 하고, 기본키
+    (student, date, period) 가 그대로 조회 인덱스가 되도록 WITHOUT ROWID
+    테이블을 사용합니다. Streamlit 은 세션마다 다른 스레드에서 스크립트를
+    실행하므로 연결 하나를 락으로 보호해 공유합니다.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS period_records (
+        student TEXT NOT NULL,
+        date TEXT NOT NULL,
+        period INTEGER NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (student, date, period)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS day_entries (
+        student TEXT NOT NULL,
+        date TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (student, date, kind)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_period_records_date ON period_records (date, student);
+    CREATE TABLE IF NOT EXISTS students (
+        student TEXT PRIMARY KEY,
+        class_name TEXT NOT NULL DEFAULT ''
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_students_class ON students (class_name);
+    CREATE TABLE IF NOT EXISTS templates (
+        student TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY (student, kind)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS date_revisions (
+        date TEXT PRIMARY KEY,
+        rev INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = connect(path, self.SCHEMA, busy_timeout_ms=BUSY_TIMEOUT_MS)
+
+    def _transaction(self):
+        return transaction(self._conn, self._lock)
+
+    def load_day(self, student, date):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT period, data FROM period_records WHERE student = ? AND date = ?",
+                (student, str(date)),
+            ).fetchall()
+        return {period: json.loads(data) for period, data in rows}
+
+    def save_periods(self, student, date, records):
+        if not records:
+            return
+        rows = [(student, str(date), int(p), _dumps(d)) for p, d in records.items()]
+        with self._transaction():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO period_records (student, date, period, data) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT INTO date_revisions (date, rev) VALUES (?, 1)"
+                " ON CONFLICT (date) DO UPDATE SET rev = rev + 1",
+                (str(date),),
+            )
+
+    def load_entries(self, student, date):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT kind, data FROM day_entries WHERE student = ? AND date = ?",
+                (student, str(date)),
+            ).fetchall()
+        return {kind: json.loads(data) for kind, data in rows}
+
+    def save_entries(self, student, date, entries):
+        if not entries:
+            return
+        rows = [(student, str(date), k, _dumps(v)) for k, v in entries.items()]
+        with self._transaction():
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO day_entries (student, date, kind, data) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def load_date(self, date, class_name=None):
+        if class_name is None:
+            sql = "SELECT student, period, data FROM period_records WHERE date = ?"
+            args = (str(date),)
+        else:
+            sql = (
+                "SELECT p.student, p.period, p.data FROM students s"
+                " JOIN period_records p ON p.student = s.student AND p.date = ?"
+                " WHERE s.class_name = ?"
+            )
+            args = (str(date), class_name)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [(student, period, json.loads(data)) for student, period, data in rows]
+
+    def date_revision(self, date):
+        with self._lock:
+            row = self._conn.execute("SELECT rev FROM date_revisions WHERE date = ?", (str(date),)).fetchone()
+        return row[0] if row else 0
+
+    def load_period_range(self, date_from, date_to, student=None, class_name=None):
+        # 학생을 지정하면 기본키 (student, date, period) 범위 검색, 아니면 (date, student) 인덱스 범위 검색
+        if student is not None:
+            sql = (
+                "SELECT student, date, period, data FROM period_records"
+                " WHERE student = ? AND date BETWEEN ? AND ? ORDER BY date, period"
+            )
+            args = (student, str(date_from), str(date_to))
+        elif class_name is not None:
+            sql = (
+                "SELECT p.student, p.date, p.period, p.data FROM students s"
+                " JOIN period_records p ON p.student = s.student AND p.date BETWEEN ? AND ?"
+                " WHERE s.class_name = ? ORDER BY p.date, p.student, p.period"
+            )
+            args = (str(date_from), str(date_to), class_name)
+        else:
+            sql = (
+                "SELECT student, date, period, data FROM period_records"
+                " WHERE date BETWEEN ? AND ? ORDER BY date, student, period"
+            )
+            args = (str(date_from), str(date_to))
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [(s, date, period, json.loads(data)) for s, date, period, data in rows]
+
+    def load_entry_range(self, kinds, date_from, date_to, student=None):
+        kinds = list(kinds)
+        placeholders = ", ".join("?" for _ in kinds)
+        sql = f"SELECT student, date, kind, data FROM day_entries WHERE kind IN ({placeholders}) AND date BETWEEN ? AND ?"
+        args = [*kinds, str(date_from), str(date_to)]
+        if student is not None:
+            sql += " AND student = ?"
+            args.append(student)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY date, student, kind", args).fetchall()
+        return [(s, date, kind, json.loads(data)) for s, date, kind, data in rows]
+
+    def range_revision(self, date_from, date_to):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COALESCE(SUM(rev), 0) FROM date_revisions WHERE date BETWEEN ? AND ?",
+                (str(date_from), str(date_to)),
+            ).fetchone()
+        return row[0]
+
+    def load_template(self, student, kind):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM templates WHERE student = ? AND kind = ?", (student, kind)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save_template(self, student, kind, value):
+        with self._transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO templates (student, kind, data) VALUES (?, ?, ?)",
+                (student, kind, _dumps(value)),
+            )
+
+    def save_student(self, student, class_name):
+        with self._transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO students (student, class_name) VALUES (?, ?)",
+                (student, class_name),
+            )
+
+    def load_student_class(self, student):
+        with self._lock:
+            row = self._conn.execute("SELECT class_name FROM students WHERE student = ?", (student,)).fetchone()
+        return row[0] if row else None
+
+    def list_students(self, class_name=None):
+        with self._lock:
+            if class_name is None:
+                rows = self._conn.execute("SELECT student FROM students ORDER BY student").fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT student FROM students WHERE class_name = ? ORDER BY student", (class_name,)
+                ).fetchall()
+        return [r[0] for r in rows]
+
+    def list_classes(self):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT class_name FROM students WHERE class_name != '' ORDER BY class_name"
+            ).fetchall()
+        return [r[0] for r in rows]
+
+    def save_period_rows(self, rows):
+        self.save_rows(rows, ())
+
+    def _iter_keyset(self, select, key, args, batch_size):
+        """(date, student, key) 기준 keyset 페이지네이션. 배치마다 락을 놓아 다른 세션을 막지 않음
+
+        select 는 date, student, key, data 순으로 고르는 WHERE 절까지의 SQL.
+        """
+        last = ()
+        while True:
+            where = f" AND (date, student, {key}) > (?, ?, ?)" if last else ""
+            query = f"{select}{where} ORDER BY date, student, {key} LIMIT ?"
+            with self._lock:
+                rows = self._conn.execute(query, (*args, *last, batch_size)).fetchall()
+            if not rows:
+                return
+            yield [(student, date, k, json.loads(data)) for date, student, k, data in rows]
+            if len(rows) < batch_size:
+                return
+            last = rows[-1][:3]
+
+    @staticmethod
+    def _range_clause(date_from, date_to):
+        clause, args = "", []
+        if date_from is not None:
+            clause += " AND date >= ?"
+            args.append(str(date_from))
+        if date_to is not None:
+            clause += " AND date <= ?"
+            args.append(str(date_to))
+        return clause, args
+
+    def iter_period_rows(self, date_from=None, date_to=None, batch_size=1000):
+        clause, args = self._range_clause(date_from, date_to)
+        select = "SELECT date, student, period, data FROM period_records WHERE 1 = 1" + clause
+        yield from self._iter_keyset(select, "period", args, batch_size)
+
+    def save_entry_rows(self, rows):
+        self.save_rows((), rows)
+
+    def save_rows(self, period_rows, entry_rows):
+        period_rows = [(student, str(date), int(period), _dumps(data)) for student, date, period, data in period_rows]
+        entry_rows = [(student, str(date), kind, _dumps(value)) for student, date, kind, value in entry_rows]
+        if not period_rows and not entry_rows:
+            return
+        with self._transaction():
+            if period_rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO period_records (student, date, period, data) VALUES (?, ?, ?, ?)",
+                    period_rows,
+                )
+                self._conn.executemany(
+                    "INSERT INTO date_revisions (date, rev) VALUES (?, 1)"
+                    " ON CONFLICT (date) DO UPDATE SET rev = rev + 1",
+                    [(date,) for date in sorted({row[1] for row in period_rows})],
+                )
+            if entry_rows:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO day_entries (student, date, kind, data) VALUES (?, ?, ?, ?)",
+                    entry_rows,
+                )
+
+    def iter_entry_rows(self, kinds, date_from=None, date_to=None, batch_size=1000):
+        kinds = list(kinds)
+        clause, args = self._range_clause(date_from, date_to)
+        placeholders = ", ".join("?" for _ in kinds)
+        select = f"SELECT date, student, kind, data FROM day_entries WHERE kind IN ({placeholders})" + clause
+        yield from self._iter_keyset(select, "kind", [*kinds, *args], batch_size)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _open_sqlite(url):
+    path = url[len("sqlite://"):]
+    if path.startswith("/"):
+        path = path[1:] or ":memory:"
+    return SQLiteStorage(path)
+
+
+# 백엔드 등록표: URL 스킴 -> 생성 함수
+BACKENDS = {
+    "sqlite": _open_sqlite,
+    "memory": MemoryStorage,
+}
+
+
+def open_storage(url=None):
+    """URL 로 저장소 열기. 예) sqlite:///timetable.db, sqlite:////abs/path.db, memory://"""
+    url = url or os.environ.get("TIMETABLE_STORAGE", DEFAULT_URL)
+    scheme = url.split("://", 1)[0]
+    if scheme not in BACKENDS:
+        raise ValueError(f"지원하지 않는 저장소입니다: {url}")
+    return BACKENDS[scheme](url)
@@ -0,0 +1,72 @@
+"""과목 정보 등록부.
+
+과목 -> 장소/준비물/종류를 subjects.toml(TIMETABLE_SUBJECTS 로 경로 변경 가능)
+에서 한 번만 읽어 읽기 전용 dict 로 고정합니다. 학교마다 과목이나 교실을
+코드 수정 없이 추가할 수 있고, rerun 마다의 조회는 dict 한 번이면 됩니다.
+"""
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
+
+import toml
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "subjects.toml")
+
+FALLBACK_SUPPLIES = ("교과서", "필기도구")
+
+
+@dataclass(frozen=True, slots=True)
+class SubjectInfo:
+    name: str
+    place: str
+    supplies: tuple
+    kind: str = "general"
+
+
+class SubjectRegistry:
+    """과목 이름 순서와 읽기 전용 과목 정보 dict"""
+
+    __slots__ = ("names", "_info", "_default_supplies")
+
+    def __init__(self, subjects, default_supplies=FALLBACK_SUPPLIES):
+        self._default_supplies = tuple(default_supplies)
+        self._info = MappingProxyType({info.name: info for info in subjects})
+        self.names = tuple(self._info)
+
+    def __contains__(self, name):
+        return name in self._info
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def get(self, name):
+        """과목 정보. 등록되지 않은 과목이면 장소 없이 기본 준비물만 채운 정보"""
+        info = self._info.get(name)
+        if info is None:
+            return SubjectInfo(name, "", self._default_supplies)
+        return info
+
+
+def parse_registry(config):
+    default_supplies = tuple(config.get("default_supplies", FALLBACK_SUPPLIES))
+    subjects = [
+        SubjectInfo(
+            name=name,
+            place=str(spec.get("place", "")),
+            supplies=tuple(spec.get("supplies", default_supplies)),
+            kind=str(spec.get("kind", "general")),
+        )
+        for name, spec in config.get("subjects", {}).items()
+    ]
+    if not subjects:
+        raise ValueError("과목 설정에 [subjects] 항목이 없습니다")
+    return SubjectRegistry(subjects, default_supplies)
+
+
+@lru_cache(maxsize=4)
+def load_registry(path=None):
+    """설정 파일을 한 번만 읽어 등록부로 고정 (경로별 캐시)"""
+    path = path or os.environ.get("TIMETABLE_SUBJECTS", DEFAULT_PATH)
+    with open(path, encoding="utf-8") as f:
+        return parse_registry(toml.load(f))
@@ -0,0 +1,82 @@
+"""주말 일과 목록.
+
+항목을 id -> dict 로 보관해 위젯마다 O(1) 로 찾고, 시간 순서는 정렬된
+(시간, 순번, id) 목록을 bisect 로 유지합니다. 시간이 바뀐 항목만 다시
+끼워 넣으므로 rerun 마다 전체를 다시 정렬하지 않습니다.
+
+항목의 "time" 은 자정 기준 분(int, 없으면 None)입니다. 예전 "HH:MM" 문자열은
+목록에 넣을 때 한 번만 분으로 바꿉니다.
+"""
+import bisect
+
+from timetable.timeslots import NO_TIME, parse_minutes
+
+
+class TaskList:
+    """id 로 바로 찾을 수 있고 시간순으로 정렬된 상태를 유지하는 일과 목록"""
+
+    def __init__(self, items=()):
+        self._items = {}
+        self._order = []
+        self._next_seq = 0
+        for item in items:
+            self.add(item)
+
+    def _take_seq(self):
+        seq = self._next_seq
+        self._next_seq += 1
+        return seq
+
+    def _entry(self, item_id):
+        item = self._items[item_id]
+        minutes = item.get("time")
+        return (NO_TIME if minutes is None else minutes, item["_seq"], item_id)
+
+    def add(self, item):
+        """항목 추가. 같은 시간끼리는 추가한 순서를 유지"""
+        item = dict(item)
+        item["time"] = parse_minutes(item.get("time"))
+        item["_seq"] = self._take_seq()
+        self._items[item["id"]] = item
+        bisect.insort(self._order, self._entry(item["id"]))
+        return item
+
+    def remove(self, item_id):
+        if item_id not in self._items:
+            return
+        entry = self._entry(item_id)
+        del self._order[bisect.bisect_left(self._order, entry)]
+        del self._items[item_id]
+
+    def get(self, item_id):
+        return self._items.get(item_id)
+
+    def update(self, item_id, **fields):
+        """필드 갱신. 시간이 바뀐 경우에만 정렬 위치를 다시 잡음"""
+        item = self._items.get(item_id)
+        if item is None:
+            return
+        if "time" in fields:
+            fields["time"] = parse_minutes(fields["time"])
+        if "time" in fields and fields["time"] != item.get("time"):
+            self.remove(item_id)
+            item.update(fields)
+            item["_seq"] = self._take_seq()
+            self._items[item_id] = item
+            bisect.insort(self._order, self._entry(item_id))
+        else:
+            item.update(fields)
+
+    def __iter__(self):
+        for _, _, item_id in self._order:
+            yield self._items[item_id]
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    def to_list(self):
+        """저장용: 내부 순번을 뺀 시간순 dict 목록"""
+        return [{k: v for k, v in item.items() if k != "_seq"} for item in self]
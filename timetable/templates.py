@@ -0,0 +1,68 @@
+"""요일별 기본 시간표/주말 일과 (copy-on-write).
+
+학생마다 요일 -> 기본값 템플릿을 하나 두고, 날짜별 기록에는 템플릿과 다른
+값만 남깁니다. 하루를 읽을 때는 템플릿 조회 + 작은 덮어쓰기 한 번이면 되고,
+아무것도 바꾸지 않은 날짜는 저장소에 행이 생기지 않습니다.
+
+- 시간표 템플릿: {"0": {"0": {"subject", "place", "supplies"}, ...}, ...}  (요일 -> 교시 -> 값)
+- 주말 템플릿: {"5": {"weekend_m": [항목], "weekend_a": [항목]}, "6": {...}}
+
+한 날짜에 처음 저장할 때는 그날 교시 전체를 (템플릿과 다른 값만) 함께 저장합니다.
+요약/대시보드/추이는 저장된 행으로 교시 수를 세므로, 바꾼 교시만 남기면 교시 수가
+줄어 진행률이 부풀려집니다.
+"""
+from timetable.schedule import LUNCH_NAME
+
+TIMETABLE = "timetable"
+WEEKEND = "weekend"
+
+# 시간표 템플릿에 들어가는 필드 (나머지는 날짜마다 새로 체크하는 값)
+TEMPLATE_FIELDS = ("subject", "place", "supplies")
+
+
+def day_template(template, weekday):
+    """템플릿에서 한 요일 값. 시간표 템플릿이면 교시 키를 int 로 돌려줌"""
+    day = (template or {}).get(str(weekday)) or {}
+    return {int(k) if k.isdigit() else k: v for k, v in day.items()}
+
+
+def with_day(template, weekday, day):
+    """요일 하나만 바꾼 새 템플릿 (다른 요일 값은 그대로 공유)"""
+    return {**(template or {}), str(weekday): {str(k): v for k, v in day.items()}}
+
+
+def resolve_periods(day_tpl, overrides):
+    """{교시: 템플릿 값} 위에 {교시: 저장된 덮어쓰기} 를 얹은 하루 기록"""
+    if not day_tpl:
+        return overrides
+    return {idx: {**day_tpl.get(idx, {}), **overrides.get(idx, {})} for idx in day_tpl.keys() | overrides.keys()}
+
+
+def sparse_record(base, record):
+    """템플릿 값(base)과 같은 템플릿 필드를 뺀 기록 (저장용)"""
+    return {k: v for k, v in record.items() if k not in TEMPLATE_FIELDS or base.get(k) != v}
+
+
+def is_blank_override(record):
+    """교시 이름 외에 체크/입력한 값이 하나도 없는 덮어쓰기 (새로 저장할 필요 없음)"""
+    return not any(v for k, v in record.items() if k != "name")
+
+
+def blank_record(name):
+    """체크/입력하지 않은 교시 기록 (화면에서 아무것도 누르지 않은 교시와 같은 모양)"""
+    if name == LUNCH_NAME:
+        return {"name": name, "eat": False, "brush": False, "done": False}
+    return {"name": name, "move_done": False, "ready": False, "done": False, "sign_locked": False, "sign": None}
+
+
+def day_overrides(names, day_tpl, records):
+    """하루 교시 전체의 덮어쓰기 {교시: 템플릿과 다른 값}. records 에 없는 교시는 빈 기록으로 채움"""
+    return {
+        idx: sparse_record(day_tpl.get(idx, {}), {**blank_record(name), **records.get(idx, {})})
+        for idx, name in enumerate(names)
+    }
+
+
+def template_fields(record):
+    """기본 시간표로 남길 값 (교시 이름은 저장된 행이 없는 교시를 보여 줄 때 씀)"""
+    return {k: record[k] for k in ("name", *TEMPLATE_FIELDS) if k in record}
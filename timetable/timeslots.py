@@ -0,0 +1,111 @@
+"""주말 일과 시간 칸(slot).
+
+일과 시간은 자정 기준 분(int)으로 저장합니다. 구간(시작/끝)과 간격(5/10/15/30분)
+마다 선택지 문자열 튜플과 분 -> 위치, 문자열 -> 분 dict 를 한 번만 만들어 캐시하므로
+rerun 마다 목록을 다시 만들거나 문자열을 해석하지 않습니다.
+간격은 TIMETABLE_TIME_STEP 으로 바꿀 수 있습니다 (기본 15분). 오전/오후 구간은
+TIMETABLE_MORNING / TIMETABLE_AFTERNOON 에 "06:00 ~ 12:00" 형식으로 주며,
+값마다 한 번만 해석해 캐시합니다.
+"""
+import bisect
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+from timetable.schedule import parse_hhmm, parse_time_range
+
+GRANULARITIES = (5, 10, 15, 30)
+DEFAULT_STEP = 15
+
+# 시간이 비었거나 잘못된 항목은 정렬할 때 맨 뒤로
+NO_TIME = 10**9
+
+# 구간 끝은 포함하지 않음: 오전 06:00 ~ 11:45, 오후 12:00 ~ 21:45 (15분 간격일 때)
+SECTIONS = {"m": (6 * 60, 12 * 60), "a": (12 * 60, 22 * 60)}
+SECTION_ENV = {"m": "TIMETABLE_MORNING", "a": "TIMETABLE_AFTERNOON"}
+
+
+@dataclass(frozen=True, slots=True)
+class TimeSlots:
+    minutes: tuple
+    labels: tuple
+    index: dict
+    by_label: dict
+
+    def index_of(self, minutes):
+        """선택지 위치. 간격이 바뀌어 칸에 없는 시간은 바로 앞 칸으로 맞춤 (없으면 0)"""
+        if minutes is None:
+            return 0
+        found = self.index.get(minutes)
+        if found is not None:
+            return found
+        return max(bisect.bisect_right(self.minutes, minutes) - 1, 0)
+
+
+def step_from_env():
+    step = int(os.environ.get("TIMETABLE_TIME_STEP", DEFAULT_STEP))
+    if step not in GRANULARITIES:
+        raise ValueError(f"TIMETABLE_TIME_STEP 은 {GRANULARITIES} 중 하나여야 합니다: {step}")
+    return step
+
+
+def sections_from_env(step):
+    """{"m": (시작, 끝), "a": (시작, 끝)}. 환경 변수가 없으면 SECTIONS 기본값"""
+    return dict(parse_sections(step, *(os.environ.get(var, "") for var in SECTION_ENV.values())))
+
+
+@lru_cache(maxsize=32)
+def parse_sections(step, morning="", afternoon=""):
+    """오전/오후 구간 문자열 -> {"m": (시작, 끝), "a": (시작, 끝)}
+
+    환경 변수 값 자체를 캐시 키로 쓰므로 rerun 마다 다시 해석하지 않고, 값이 바뀌면 새로 해석합니다.
+    """
+    sections = {}
+    for (section, var), text in zip(SECTION_ENV.items(), (morning, afternoon)):
+        if not text:
+            sections[section] = SECTIONS[section]
+            continue
+        bounds = parse_time_range(text)
+        if bounds is None:
+            raise ValueError(f"{var} 은 \"HH:MM ~ HH:MM\" 형식이어야 합니다: {text}")
+        if bounds[0] % step or bounds[1] % step:
+            raise ValueError(f"{var} 의 시작/끝은 {step}분 간격에 맞아야 합니다: {text}")
+        sections[section] = bounds
+    if sections["m"][1] > sections["a"][0]:
+        raise ValueError("오전 구간이 오후 구간과 겹칩니다 (TIMETABLE_MORNING / TIMETABLE_AFTERNOON)")
+    return sections
+
+
+@lru_cache(maxsize=32)
+def time_slots(start, end, step):
+    """[start, end) 를 step 분 간격으로 나눈 칸"""
+    minutes = tuple(range(start, end, step))
+    labels = tuple(format_minutes(m) for m in minutes)
+    return TimeSlots(
+        minutes=minutes,
+        labels=labels,
+        index={m: i for i, m in enumerate(minutes)},
+        by_label=dict(zip(labels, minutes)),
+    )
+
+
+def section_slots(section, step=None):
+    """오전("m")/오후("a") 칸"""
+    step = step or step_from_env()
+    start, end = sections_from_env(step)[section]  # 구간 해석은 parse_sections 캐시가 한 번만 함
+    return time_slots(start, end, step)
+
+
+@lru_cache(maxsize=2048)
+def format_minutes(minutes):
+    """545 -> "09:05". 시간이 없으면 "" """
+    if minutes is None:
+        return ""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def parse_minutes(value):
+    """저장된 시간 -> 분. 예전 "HH:MM" 문자열도 받음. 비었거나 잘못된 값이면 None"""
+    if value is None or isinstance(value, int):
+        return value
+    return parse_hhmm(value) if value else None
@@ -0,0 +1,176 @@
+"""지연 쓰기(write-behind) 저장소 래퍼.
+
+여러 Streamlit 서버 프로세스가 같은 SQLite(WAL) 파일을 공유할 때, 체크박스를
+누를 때마다 동기 디스크 쓰기와 쓰기 잠금 경쟁이 생기지 않도록 교시 기록과
+하루 항목 저장을 메모리에 모았다가 interval 마다 한 트랜잭션으로 내려씁니다.
+같은 (student, date, period/kind) 에 대한 여러 번의 저장은 마지막 값 하나로
+합쳐집니다.
+
+같은 프로세스 안에서는 아직 내려쓰지 않은 값도 load_day/load_entries 에
+겹쳐 보이므로 자기 쓰기를 바로 읽을 수 있습니다. 날짜 단위 집계나 기간 조회,
+내보내기처럼 저장소 전체를 보는 메서드는 먼저 내려쓰고 실행합니다.
+프로세스가 비정상 종료하면 마지막 interval 동안의 쓰기는 잃을 수 있습니다.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+
+from timetable.storage import ForwardingStorage
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL_MS = 200
+# 이만큼 쌓이면 interval 을 기다리지 않고 바로 내려씀
+MAX_PENDING = 500
+
+
+class WriteBehindStorage(ForwardingStorage):
+    """inner 저장소 앞에서 save_periods/save_entries 를 모아 묶음으로 반영"""
+
+    # 교시 기록/하루 항목을 보는 나머지 메서드는 먼저 내려쓰고 inner 에 넘김
+    # (템플릿/명부는 모아 두는 쓰기와 상관없으므로 그대로 넘김)
+    FLUSH_FIRST = frozenset({
+        "load_date", "date_revision", "load_period_range", "load_entry_range", "range_revision",
+        "save_period_rows", "iter_period_rows", "save_entry_rows", "iter_entry_rows", "save_rows",
+    })
+
+    def __init__(self, inner, interval_ms=DEFAULT_INTERVAL_MS, max_pending=MAX_PENDING):
+        super().__init__(inner)
+        self.interval = interval_ms / 1000
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        # 한 번에 하나의 flush 만 inner 에 쓰도록 (쓰는 순서 보장)
+        self._flush_lock = threading.Lock()
+        self._pending_periods = {}
+        self._pending_entries = {}
+        # inner 에 쓰는 중인 값도 읽기에 겹쳐 보여야 하므로 따로 보관
+        self._inflight_periods = {}
+        self._inflight_entries = {}
+        self._pending_count = 0
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="timetable-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # 쓰기: 메모리에 합쳐 두기
+    def save_periods(self, student, date, records):
+        if not records:
+            return
+        with self._lock:
+            day = self._pending_periods.setdefault((student, str(date)), {})
+            for period, data in records.items():
+                day[int(period)] = data
+            self._pending_count += len(records)
+            full = self._pending_count >= self.max_pending
+        self._notify(full)
+
+    def save_entries(self, student, date, entries):
+        if not entries:
+            return
+        with self._lock:
+            day = self._pending_entries.setdefault((student, str(date)), {})
+            day.update(entries)
+            self._pending_count += len(entries)
+            full = self._pending_count >= self.max_pending
+        self._notify(full)
+
+    def _forward(self, name, *args, **kwargs):
+        if name in self.FLUSH_FIRST:
+            self.flush()
+        return super()._forward(name, *args, **kwargs)
+
+    def _notify(self, full):
+        if full:
+            self.flush()
+        else:
+            self._wakeup.set()
+
+    # 읽기: 저장된 값 위에 쓰는 중인 값, 아직 안 쓴 값 순으로 겹침.
+    # 겹칠 값을 inner 를 읽기 전에 떠 둠: 먼저 읽으면 그 사이 flush 가 커밋하고 쓰는 중인 값을
+    # 비웠을 때 어느 쪽에서도 못 보고 예전 값을 돌려줌
+    def _overlay(self, layers, key):
+        overlay = {}
+        with self._lock:
+            for layer in layers:
+                overlay.update(layer.get(key, {}))
+        return overlay
+
+    def load_day(self, student, date):
+        overlay = self._overlay((self._inflight_periods, self._pending_periods), (student, str(date)))
+        return {**self.inner.load_day(student, date), **overlay}
+
+    def load_entries(self, student, date):
+        overlay = self._overlay((self._inflight_entries, self._pending_entries), (student, str(date)))
+        return {**self.inner.load_entries(student, date), **overlay}
+
+    def flush(self):
+        """모아 둔 쓰기를 inner 에 반영. 실패하면 더 새 값이 없는 항목만 다시 대기열에 넣고 예외를 올림"""
+        with self._flush_lock:
+            with self._lock:
+                if not self._pending_count:
+                    return
+                self._inflight_periods, self._pending_periods = self._pending_periods, {}
+                self._inflight_entries, self._pending_entries = self._pending_entries, {}
+                self._pending_count = 0
+            try:
+                # 교시 기록과 하루 항목을 한 트랜잭션으로 (중간에 죽어도 묶음의 절반만 반영되지 않음)
+                self.inner.save_rows(
+                    [
+                        (student, date, period, data)
+                        for (student, date), day in self._inflight_periods.items()
+                        for period, data in day.items()
+                    ],
+                    [
+                        (student, date, kind, value)
+                        for (student, date), day in self._inflight_entries.items()
+                        for kind, value in day.items()
+                    ],
+                )
+            except BaseException:
+                with self._lock:
+                    for inflight, pending in (
+                        (self._inflight_periods, self._pending_periods),
+                        (self._inflight_entries, self._pending_entries),
+                    ):
+                        for key, day in inflight.items():
+                            merged = {**day, **pending.get(key, {})}
+                            pending[key] = merged
+                            self._pending_count += len(day)
+                raise
+            finally:
+                with self._lock:
+                    self._inflight_periods, self._inflight_entries = {}, {}
+
+    def _run(self):
+        while not self._closed:
+            self._wakeup.wait()
+            if self._closed:
+                break
+            # interval 동안 더 들어오는 쓰기를 모아서 한 번에 씀
+            self._wakeup.clear()
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("지연 쓰기 반영 실패 (다음 주기에 다시 시도)")
+                self._wakeup.set()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join(timeout=5)
+        try:
+            self.flush()
+        finally:
+            self.inner.close()
+
+
+def write_behind_from_env(storage):
+    """TIMETABLE_WRITE_BEHIND_MS 가 0보다 크면 지연 쓰기로 감싼 저장소, 아니면 그대로"""
+    interval_ms = int(os.environ.get("TIMETABLE_WRITE_BEHIND_MS", "0"))
+    return WriteBehindStorage(storage, interval_ms) if interval_ms > 0 else storage